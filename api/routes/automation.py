@@ -8,7 +8,9 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from core.database import get_db
+from core.task_attributes import field_filter, tag_filter
 from models.automation import Automation
+from models.task import Task
 from api.schemas.automation import (
     AutomationCreate, 
     AutomationUpdate, 
@@ -18,6 +20,24 @@ from api.schemas.automation import (
 
 router = APIRouter()
 
+
+def _matching_tasks(db: Session, automation: Automation):
+    """Tareas abiertas del workspace que cumplen las condiciones del trigger.
+
+    Condiciones soportadas: status, priority, assignee_id, list_id, tags y
+    custom_field/custom_value (tags y campos se resuelven en SQL).
+    """
+    conditions = automation.trigger_conditions or {}
+    query = db.query(Task).filter(Task.workspace_id == automation.workspace_id, Task.status != "complete")
+    for name in ("status", "priority", "assignee_id", "list_id"):
+        if conditions.get(name) is not None:
+            query = query.filter(getattr(Task, name) == conditions[name])
+    if conditions.get("tags"):
+        query = query.filter(tag_filter(Task, conditions["tags"]))
+    if conditions.get("custom_field"):
+        query = query.filter(field_filter(Task, conditions["custom_field"], conditions.get("custom_value")))
+    return query
+
 @router.post("/", response_model=AutomationResponse, status_code=status.HTTP_201_CREATED)
 async def create_automation(
     automation_data: AutomationCreate,
@@ -192,6 +212,9 @@ async def execute_automation(
                 detail="La automatización no está activa o habilitada"
             )
         
+        # Tareas a las que aplicarían las acciones
+        matched_tasks = _matching_tasks(db, db_automation).count()
+        
         # Aquí se ejecutaría la lógica de la automatización
         # Por ahora solo actualizamos las estadísticas
         db_automation.execution_count += 1
@@ -202,7 +225,8 @@ async def execute_automation(
         return {
             "message": "Automatización ejecutada exitosamente",
             "automation_id": automation_id,
-            "execution_count": db_automation.execution_count
+            "execution_count": db_automation.execution_count,
+            "matched_tasks": matched_tasks
         }
         
     except HTTPException:
@@ -6,17 +6,25 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import logging
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi import status as http_status
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, and_
 
 from core.database import get_db
 from models.notification_log import NotificationLog
-from models.task import Task
 from models.user import User
 from utils.advanced_notifications import notification_service
 from core.advanced_sync import sync_service
+from core.task_archive import task_source
+from core.data_version import (
+    NOTIFICATIONS_SCOPE,
+    build_etag,
+    etag_matches,
+    not_modified,
+    query_params_key,
+    task_scopes
+)
 
 dashboard_logger = logging.getLogger("dashboard")
 
@@ -25,13 +33,29 @@ router = APIRouter()
 
 @router.get("/stats", status_code=http_status.HTTP_200_OK)
 async def get_dashboard_stats(
+    request: Request,
+    response: Response,
     period: str = Query("24h", description="Período de tiempo: 1h, 24h, 7d, 30d"),
+    include_closed: bool = Query(False, description="Incluir tareas archivadas"),
     db: Session = Depends(get_db)
 ):
     """
     Obtener estadísticas del dashboard
     """
     try:
+        # GET condicional: versión de tareas, usuarios y notificaciones, más el minuto
+        # actual (las ventanas "recientes" y "vencidas" dependen de la hora)
+        etag = build_etag(
+            db,
+            [*task_scopes(), NOTIFICATIONS_SCOPE],
+            query_params_key(request),
+            datetime.now().strftime("%Y%m%d%H%M"),
+            len(sync_service.sync_history)
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+        
         # Calcular período
         now = datetime.now()
         period_delta = {
@@ -47,7 +71,7 @@ async def get_dashboard_stats(
         notification_stats = await _get_notification_stats(db, since)
         
         # Estadísticas de tareas
-        task_stats = await _get_task_stats(db, since)
+        task_stats = await _get_task_stats(db, since, include_closed)
         
         # Estadísticas de sincronización (con fallback)
         try:
@@ -397,32 +421,33 @@ async def _get_notification_stats(db: Session, since: datetime) -> Dict[str, Any
     }
 
 
-async def _get_task_stats(db: Session, since: datetime) -> Dict[str, Any]:
-    """Obtener estadísticas de tareas"""
+async def _get_task_stats(db: Session, since: datetime, include_closed: bool = False) -> Dict[str, Any]:
+    """Obtener estadísticas de tareas (solo tier caliente salvo include_closed)"""
+    source = task_source(include_closed)
     
     # Total de tareas
-    total = db.query(Task).count()
+    total = db.query(source).count()
     
     # Tareas recientes
-    recent = db.query(Task).filter(Task.last_sync >= since).count()
+    recent = db.query(source).filter(source.last_sync >= since).count()
     
     # Por estado
     by_status = db.query(
-        Task.status,
+        source.status,
         func.count().label('count')
-    ).group_by(Task.status).all()
+    ).group_by(source.status).all()
     
     # Por prioridad
     by_priority = db.query(
-        Task.priority,
+        source.priority,
         func.count().label('count')
-    ).group_by(Task.priority).all()
+    ).group_by(source.priority).all()
     
     # Tareas vencidas
-    overdue = db.query(Task).filter(
+    overdue = db.query(source).filter(
         and_(
-            Task.due_date < datetime.now(),
-            Task.status != 'complete'
+            source.due_date < datetime.now(),
+            source.status != 'complete'
         )
     ).count()
     
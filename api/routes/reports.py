@@ -4,6 +4,7 @@ Rutas para gestión de reportes
 
 from typing import List, Optional
 import io
+import logging
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
@@ -13,6 +14,7 @@ import os
 
 from core.database import get_db
 from core.config import settings
+from core.task_attributes import field_filter, field_value_counts, tag_counts, tag_filter
 from models.report import Report
 from models.task import Task
 from models.user import User
@@ -24,6 +26,7 @@ from api.schemas.report import (
 )
 
 router = APIRouter()
+reports_logger = logging.getLogger("reports")
 
 @router.post("/", response_model=ReportResponse, status_code=status.HTTP_201_CREATED)
 async def create_report(
@@ -452,7 +455,7 @@ async def _generate_task_summary(report: Report, db: Session) -> dict:
     
     tasks = query.all()
     
-    print(f"Generando reporte para {len(tasks)} tareas")
+    reports_logger.info(f"📊 Generando reporte para {len(tasks)} tareas")
     
     # Estadísticas por estado
     status_stats = {}
@@ -560,12 +563,17 @@ async def _generate_workspace_overview(report: Report, db: Session) -> dict:
         Task.workspace_id == report.workspace_id
     ).group_by(Task.priority).all()
     
+    # Tareas por tag (tabla task_tags)
+    workspace_task_ids = db.query(Task.clickup_id).filter(Task.workspace_id == report.workspace_id).scalar_subquery()
+    tag_distribution = tag_counts(db, workspace_task_ids)
+    
     return {
         "workspace_id": report.workspace_id,
         "total_tasks": total_tasks,
         "total_users": total_users,
         "status_distribution": dict(status_counts),
         "priority_distribution": dict(priority_counts),
+        "tag_distribution": tag_distribution,
         "generated_at": datetime.utcnow().isoformat()
     }
 
@@ -581,15 +589,30 @@ async def _generate_custom_analysis(report: Report, db: Session) -> dict:
             query = query.filter(Task.priority == report.filters["priority"])
         if report.filters.get("assignee_id"):
             query = query.filter(Task.assignee_id == report.filters["assignee_id"])
+        if report.filters.get("tags"):
+            query = query.filter(tag_filter(Task, report.filters["tags"]))
+        if report.filters.get("custom_field"):
+            query = query.filter(field_filter(Task, report.filters["custom_field"], report.filters.get("custom_value")))
     
     tasks = query.all()
     
-    return {
+    result = {
         "filtered_tasks": len(tasks),
         "tasks": [task.to_dict() for task in tasks],
         "filters_applied": report.filters,
         "generated_at": datetime.utcnow().isoformat()
     }
+    
+    # Agrupación opcional por tag o por valor de un campo, sobre las tareas filtradas
+    group_by = (report.filters or {}).get("group_by")
+    if group_by:
+        task_ids = query.with_entities(Task.clickup_id).scalar_subquery()
+        if group_by == "tag":
+            result["groups"] = tag_counts(db, task_ids)
+        else:
+            result["groups"] = field_value_counts(db, group_by, task_ids)
+    
+    return result
 
 def _generate_summary(data: dict, report_type: str) -> dict:
     """Generar resumen del reporte"""
@@ -13,6 +13,21 @@ import logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+
+def _hydrate_results(db: Session, search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Tareas de los resultados en una sola consulta (mismo camino que POST /tasks/batch-get)"""
+    from api.routes.tasks import _load_tasks_by_ids
+
+    found = _load_tasks_by_ids(db, list(dict.fromkeys(str(result['task_id']) for result in search_results)))
+    tasks = []
+    for result in search_results:
+        task = found.get(str(result['task_id']))
+        if task is None:
+            logger.warning(f"⚠️ Tarea {result['task_id']} del índice no encontrada en la BD local")
+            continue
+        tasks.append({**task, 'search_score': result['score'], 'search_text': result['text']})
+    return tasks
+
 @router.get("/search")
 async def search_tasks(
     query: str = Query(..., description="Consulta de búsqueda"),
@@ -30,22 +45,7 @@ async def search_tasks(
         search_results = search_engine.search_tasks(query, top_k=top_k, threshold=threshold)
         
         # Obtener tareas completas desde la base de datos
-        from api.routes.tasks import get_task
-        
-        tasks = []
-        for result in search_results:
-            try:
-                task_response = await get_task(result['task_id'], db)
-                if task_response and 'task' in task_response:
-                    task = task_response['task']
-                    # Agregar información de búsqueda
-                    task_dict = task.__dict__
-                    task_dict['search_score'] = result['score']
-                    task_dict['search_text'] = result['text']
-                    tasks.append(task_dict)
-            except Exception as e:
-                logger.warning(f"⚠️ No se pudo obtener tarea {result['task_id']}: {e}")
-                continue
+        tasks = _hydrate_results(db, search_results)
         
         return {
             "query": query,
@@ -99,21 +99,7 @@ async def advanced_search(
         )
         
         # Obtener tareas completas
-        from api.routes.tasks import get_task
-        
-        tasks = []
-        for result in search_results:
-            try:
-                task_response = await get_task(result['task_id'], db)
-                if task_response and 'task' in task_response:
-                    task = task_response['task']
-                    task_dict = task.__dict__
-                    task_dict['search_score'] = result['score']
-                    task_dict['search_text'] = result['text']
-                    tasks.append(task_dict)
-            except Exception as e:
-                logger.warning(f"⚠️ No se pudo obtener tarea {result['task_id']}: {e}")
-                continue
+        tasks = _hydrate_results(db, search_results)
         
         return {
             "criteria": {
@@ -218,22 +204,7 @@ async def search_by_user(
         search_results = search_engine.search_by_user(user, top_k=top_k)
         
         # Obtener tareas completas desde la base de datos
-        from api.routes.tasks import get_task
-        
-        tasks = []
-        for result in search_results:
-            try:
-                task_response = await get_task(result['task_id'], db)
-                if task_response and 'task' in task_response:
-                    task = task_response['task']
-                    # Agregar información de búsqueda
-                    task_dict = task.__dict__
-                    task_dict['search_score'] = result['score']
-                    task_dict['search_text'] = result['text']
-                    tasks.append(task_dict)
-            except Exception as e:
-                logger.warning(f"⚠️ No se pudo obtener tarea {result['task_id']}: {e}")
-                continue
+        tasks = _hydrate_results(db, search_results)
         
         return {
             "user_query": user,
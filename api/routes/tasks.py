@@ -2,15 +2,42 @@
 Rutas para gestión de tareas
 """
 
+import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status as http_status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status as http_status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from core.database import get_db
 from core.clickup_client import ClickUpClient
 from models.task import Task
+from models.task_archive import TaskArchive
 from models.user import User
+from core.task_archive import task_source, archive_closed_tasks
+from core.task_ingest import (
+    HASHED_FIELDS,
+    normalize_clickup_task,
+    normalize_id,
+    priority_to_int as _priority_to_int,
+    task_content_hash,
+    _timestamp_ms,
+    _timestamp_to_datetime,
+)
+from core.task_enrichment import task_enricher
+from core.pagination import COUNT_MODES, apply_keyset, encode_cursor, estimate_row_count, null_tail_cursor
+from core.task_fieldsets import item_to_dict, parse_fields, rows_to_items, select_columns
+from core.task_serialization import FastJSONResponse, response_columns, task_row_to_dict
+from core.task_export import EXPORT_FORMATS, iter_csv, iter_ndjson
+from core.task_search_index import attach_highlights, is_available as search_index_available, match_subquery
+from core.task_attributes import field_filter, tag_filter
+from core.task_events import task_event_broker
+from core.task_freshness import MISS, TaskNotFound, task_refresher
+from core.custom_field_registry import custom_field_registry, empty_schema
+from core.data_version import build_etag, etag_matches, not_modified, query_params_key, task_scopes
 from api.schemas.task import (
     TaskCreate, 
     TaskUpdate, 
@@ -18,471 +45,79 @@ from api.schemas.task import (
     TaskList, 
     TaskFilter,
     TaskBulkUpdate,
+    TaskBulkUpdateItem,
+    TaskBulkUpdateResponse,
+    TaskBatchCreate,
+    TaskBatchCreateItem,
+    TaskBatchCreateResponse,
+    TaskBatchGet,
+    TaskBatchGetResponse,
     TaskBulkDelete
 )
 
 router = APIRouter()
 clickup_client = ClickUpClient()
+tasks_logger = logging.getLogger("tasks")
+
 
+def _task_response(task) -> Optional[TaskResponse]:
+    """Construir TaskResponse sin modificar la fila.
 
-def _priority_to_int(priority_value) -> int:
-    """Convertir diferentes representaciones de prioridad a entero (1-4).
-    1=Urgente, 2=Alta, 3=Normal, 4=Baja. Cualquier valor inesperado -> 3.
+    Las filas anteriores a la normalización en ingesta se normalizan sobre
+    una copia; la migración `migrate_normalize_tasks.py` las corrige en la BD.
     """
-    # Si es dict con id
-    if isinstance(priority_value, dict):
-        try:
-            return int(priority_value.get("id", 3))
-        except (ValueError, TypeError):
-            return 3
-    # Si es entero
-    if isinstance(priority_value, int):
-        return priority_value if priority_value in {1, 2, 3, 4} else 3
-    # Si es string (id numérico o nombre)
-    if isinstance(priority_value, str):
-        # Intentar parsear como número primero
-        try:
-            num = int(priority_value)
-            return num if num in {1, 2, 3, 4} else 3
-        except (ValueError, TypeError):
-            normalized = priority_value.strip().lower()
-            name_to_id = {
-                "urgent": 1,
-                "alta": 2,
-                "high": 2,
-                "normal": 3,
-                "media": 3,
-                "low": 4,
-                "baja": 4,
-            }
-            return name_to_id.get(normalized, 3)
-    # Cualquier otro caso
-    return 3
+    try:
+        return TaskResponse.model_validate(task)
+    except Exception as e:
+        tasks_logger.warning(f"⚠️ Error validando tarea {task.clickup_id}: {e}")
+    values = {column.name: getattr(task, column.name) for column in Task.__table__.columns}
+    values["priority"] = _priority_to_int(values.get("priority"))
+    values["assignee_id"] = normalize_id(values.get("assignee_id"))
+    values["creator_id"] = normalize_id(values.get("creator_id"))
+    try:
+        return TaskResponse.model_validate(values)
+    except Exception as e:
+        tasks_logger.warning(f"⚠️ Error persistente validando tarea {task.clickup_id}: {e}")
+        return None
+
 
 @router.post("/", response_model=TaskResponse, status_code=http_status.HTTP_201_CREATED)
 async def create_task(
     task_data: TaskCreate,
     db: Session = Depends(get_db)
 ):
-    """Crear una nueva tarea"""
+    """Crear una nueva tarea.
+
+    Camino común: un único POST a ClickUp con los custom fields ya resueltos
+    (registro de esquemas por lista). La fila local y las notificaciones se
+    construyen a partir de la respuesta del POST; el GET de verificación solo
+    se hace con TASK_CREATE_VERIFY activado.
+    """
+    from core.config import settings
+    
     try:
-        # Crear tarea en ClickUp - solo campos esenciales
-        clickup_task_data = {
-            "name": task_data.name,
-            "description": task_data.description or ""
-        }
-        
-        # Agregar prioridad si existe (normalizada). ClickUp acepta 1-4
-        if task_data.priority is not None:
-            clickup_task_data["priority"] = _priority_to_int(task_data.priority)
-        
-        # Agregar estado si existe
-        if task_data.status:
-            clickup_task_data["status"] = task_data.status
-        
-        # Agregar asignatario si existe
-        if task_data.assignee_id:
-            # ClickUp espera IDs numéricos; convertir si es posible
-            try:
-                clickup_task_data["assignees"] = [int(str(task_data.assignee_id))]
-            except ValueError:
-                clickup_task_data["assignees"] = [str(task_data.assignee_id)]
-
-        # Agregar fechas si existen
-        if task_data.due_date:
-            # Debug: verificar formato de fecha antes de enviar
-            print(f"🔍 Debug fecha límite antes de enviar a ClickUp:")
-            print(f"  📅 task_data.due_date: {task_data.due_date} (tipo: {type(task_data.due_date)})")
-            
-            # SOLUCIÓN TEMPORAL: Manejar manualmente la conversión de tipos
-            if isinstance(task_data.due_date, datetime):
-                # Convertir datetime a timestamp en milisegundos
-                timestamp_ms = int(task_data.due_date.timestamp() * 1000)
-                clickup_task_data["due_date"] = timestamp_ms
-                print(f"  📅 DateTime convertido a timestamp: {task_data.due_date} -> {timestamp_ms}")
-            elif isinstance(task_data.due_date, (int, float)):
-                # Ya es timestamp en milisegundos
-                clickup_task_data["due_date"] = int(task_data.due_date)
-                print(f"  📅 Timestamp directo: {task_data.due_date}")
-            elif isinstance(task_data.due_date, str):
-                # Intentar convertir string a timestamp
-                try:
-                    timestamp = int(task_data.due_date)
-                    clickup_task_data["due_date"] = timestamp
-                    print(f"  📅 String convertido a timestamp: {task_data.due_date} -> {timestamp}")
-                except (ValueError, TypeError):
-                    print(f"  ❌ No se pudo convertir string a timestamp: {task_data.due_date}")
-                    # No incluir due_date si no se puede convertir
-            else:
-                print(f"  ⚠️ Tipo de due_date no reconocido: {type(task_data.due_date)}")
-                # No incluir due_date si no se puede convertir
-            
-            print(f"📅 Fecha límite enviada a ClickUp: {clickup_task_data['due_date']}")
-        
-        if task_data.start_date:
-            if isinstance(task_data.start_date, (int, float)):
-                clickup_task_data["start_date"] = int(task_data.start_date)
-            else:
-                clickup_task_data["start_date"] = int(task_data.start_date.timestamp() * 1000)
-            
-        # Manejar custom_fields de forma simplificada
+        clickup_task_data = _clickup_create_payload(task_data)
+        custom_fields_data = []
         if task_data.custom_fields:
-            print(f"📝 Custom fields recibidos: {task_data.custom_fields}")
-            print(f"📅 Due date recibido: {task_data.due_date} (tipo: {type(task_data.due_date)})")
-            print(f"📅 Due date raw: {repr(task_data.due_date)}")
-            # Por ahora, crear la tarea sin custom fields para evitar errores 400
-            # Los custom fields se agregarán después de la creación
-            print("⚠️ Custom fields se agregarán después de crear la tarea para evitar errores 400")
-        
-        print(f"🚀 Enviando tarea a ClickUp con datos: {clickup_task_data}")
-        print(f"📅 Due date que se envía: {clickup_task_data.get('due_date')}")
-        print(f"📅 Due date original: {task_data.due_date}")
-        print(f"📅 Due date original raw: {repr(task_data.due_date)}")
-        print(f"📅 Due date en clickup_task_data: {clickup_task_data.get('due_date')}")
-        print(f"📅 Tipo de due_date en clickup_task_data: {type(clickup_task_data.get('due_date'))}")
-        
-        clickup_response = await clickup_client.create_task(
-            task_data.list_id, 
-            clickup_task_data
-        )
-        print(f"✅ Respuesta de ClickUp: {clickup_response}")
-        
-        # Verificar si la fecha límite se guardó correctamente en ClickUp
-        if clickup_response.get("due_date"):
-            print(f"✅ ClickUp recibió la fecha límite: {clickup_response['due_date']}")
-            # Convertir el timestamp de ClickUp a datetime para comparar
-            clickup_due_date = safe_timestamp_to_datetime()
-            print(f"✅ ClickUp fecha límite convertida: {clickup_due_date}")
-        else:
-            print(f"⚠️ ClickUp NO recibió la fecha límite")
+            schema = await custom_field_registry.get_schema(task_data.list_id, clickup_client)
+            custom_fields_data = schema.to_clickup_payload(task_data.custom_fields)
         
-        # Agregar custom fields después de crear la tarea
-        if task_data.custom_fields and clickup_response.get("id"):
-            task_id = clickup_response["id"]
-            print(f"📝 Agregando custom fields a tarea {task_id}")
-            
-            try:
-                # Obtener los campos personalizados de la LISTA (no de la tarea recién creada)
-                # porque la tarea nueva no tiene valores en los campos personalizados
-                available_fields = await clickup_client.get_list_custom_fields(task_data.list_id)
-                
-                # Mapear nombres a IDs
-                field_name_to_id = {}
-                for field in available_fields:
-                    field_name_to_id[field["name"]] = field["id"]
-                
-                print(f"🔍 Custom fields disponibles en la lista: {list(field_name_to_id.keys())}")
-                
-                # Actualizar custom fields uno por uno
-                custom_fields_data = []
-                print(f"🔍 Procesando custom fields: {task_data.custom_fields}")
-                for field_name, field_value in task_data.custom_fields.items():
-                    print(f"  📝 Campo: {field_name} = {field_value} (tipo: {type(field_value)})")
-                    if field_value and field_name in field_name_to_id:
-                        field_id = field_name_to_id[field_name]
-                        custom_fields_data.append({
-                            "id": field_id,
-                            "value": str(field_value)
-                        })
-                        print(f"✅ Campo {field_name} preparado: {field_value} -> ID: {field_id}")
-                    elif field_name not in field_name_to_id:
-                        print(f"⚠️ Campo '{field_name}' no encontrado en la lista")
-                    else:
-                        print(f"⚠️ Campo '{field_name}' sin valor: {field_value}")
-                
-                # Actualizar la tarea con custom fields
-                if custom_fields_data:
-                    update_data = {"custom_fields": custom_fields_data}
-                    print(f"🔄 Actualizando tarea {task_id} con custom fields: {update_data}")
-                    
-                    # Verificar formato de custom fields antes de enviar
-                    for field in custom_fields_data:
-                        print(f"  🔍 Campo a enviar: ID={field['id']}, valor={field['value']}")
-                    
-                    print(f"🔄 Enviando update_data a ClickUp: {update_data}")
-                    await clickup_client.update_task(task_id, update_data)
-                    print(f"✅ Custom fields actualizados en tarea {task_id}")
-                    
-                    # Verificar que se hayan guardado correctamente
-                    try:
-                        verification_task = await clickup_client.get_task(task_id)
-                        if verification_task and "custom_fields" in verification_task:
-                            print(f"🔍 Verificación: custom fields en ClickUp después de actualizar:")
-                            for field in verification_task["custom_fields"]:
-                                print(f"  📋 {field['name']}: {field.get('value', 'SIN VALOR')}")
-                        else:
-                            print(f"⚠️ No se pudieron verificar los custom fields en ClickUp")
-                    except Exception as verify_error:
-                        print(f"⚠️ Error verificando custom fields: {verify_error}")
-                    
-                    # Sincronización bidireccional: obtener los campos actualizados desde ClickUp
-                    print("🔄 Iniciando sincronización bidireccional...")
-                    try:
-                        updated_task = await clickup_client.get_task(task_id)
-                        if updated_task and "custom_fields" in updated_task:
-                            print(f"📋 Tarea actualizada desde ClickUp: {updated_task['custom_fields']}")
-                            # La sincronización se hará después de crear db_task
-                    except Exception as sync_error:
-                        print(f"⚠️ Error obteniendo tarea actualizada: {sync_error}")
-                else:
-                    print("⚠️ No se pudieron preparar campos personalizados válidos")
-                
-            except Exception as cf_error:
-                print(f"⚠️ Error agregando custom fields: {cf_error}")
-                # No fallar si los custom fields no se pueden agregar
-        
-        # Guardar en base de datos local; si ClickUp no devolvió priority, usar lo enviado
-        print(f"💾 Guardando tarea en BD con due_date: {task_data.due_date}")
-        print(f"💾 Tipo de due_date: {type(task_data.due_date)}")
-        print(f"💾 Custom fields que se guardarán: {task_data.custom_fields}")
-        
-        # Convertir timestamp a datetime para la base de datos
-        due_date_datetime = None
-        # SOLUCIÓN TEMPORAL: Simplificar el manejo de due_date
-        print(f"🔍 Debug due_date: valor={task_data.due_date}, tipo={type(task_data.due_date)}")
-        
-        # Convertir due_date a datetime de manera segura
-        due_date_datetime = None
-        if task_data.due_date:
-            try:
-                if isinstance(task_data.due_date, datetime):
-                    due_date_datetime = task_data.due_date
-                    print(f"📅 Due date ya es datetime: {due_date_datetime}")
-                elif isinstance(task_data.due_date, (int, float)):
-                    # Es timestamp en milisegundos
-                    due_date_datetime = safe_timestamp_to_datetime()
-                    print(f"📅 Timestamp convertido (UTC): {task_data.due_date} -> {due_date_datetime}")
-                elif isinstance(task_data.due_date, str):
-                    # Es string, intentar convertir a timestamp
-                    timestamp = int(task_data.due_date)
-                    due_date_datetime = safe_timestamp_to_datetime()
-                    print(f"📅 String convertido a timestamp (UTC): {task_data.due_date} -> {due_date_datetime}")
-                else:
-                    print(f"⚠️ Tipo de due_date no reconocido: {type(task_data.due_date)}")
-            except Exception as e:
-                print(f"❌ Error procesando due_date: {e}")
-                due_date_datetime = None
-        else:
-            print(f"⚠️ No se proporcionó fecha límite")
-        
-        print(f"🔍 Debug antes de crear Task: due_date_datetime={due_date_datetime}, tipo={type(due_date_datetime)}")
-        
-        print(f"🔍 Debug antes de crear Task: due_date_datetime={due_date_datetime}, tipo={type(due_date_datetime)}")
-        
-        db_task = Task(
-            clickup_id=clickup_response["id"],
-            name=task_data.name,
-            description=task_data.description,
-            status=task_data.status,
-            priority=_priority_to_int(clickup_task_data.get("priority", task_data.priority)) if task_data.priority is not None else 3,
-            due_date=due_date_datetime,
-            start_date=task_data.start_date,
-            workspace_id=task_data.workspace_id,
-            list_id=task_data.list_id,
-            assignee_id=str(task_data.assignee_id) if task_data.assignee_id is not None else None,
-            creator_id=str(clickup_response.get("creator", {}).get("id", "")),
-            tags=task_data.tags,
-            custom_fields=task_data.custom_fields,
-            is_synced=True,
-            last_sync=datetime.utcnow()
-        )
-        
-        print(f"💾 Tarea creada en BD con ID: {db_task.id}")
-        print(f"💾 Due date en BD: {db_task.due_date}")
-        print(f"💾 Custom fields en BD: {db_task.custom_fields}")
+        tasks_logger.debug(f"🚀 Enviando tarea a ClickUp con datos: {clickup_task_data}")
+        clickup_response = await _create_clickup_task(task_data.list_id, clickup_task_data, custom_fields_data)
+        tasks_logger.info(f"✅ Tarea creada en ClickUp: {clickup_response.get('id')}")
+        if settings.TASK_CREATE_VERIFY:
+            await _verify_created_task(clickup_response["id"], clickup_task_data, custom_fields_data)
         
+        # Guardar en base de datos local con los datos de la respuesta de ClickUp
+        db_task = Task(**_created_task_values(task_data, clickup_response, datetime.utcnow()))
         db.add(db_task)
         db.commit()
         db.refresh(db_task)
+        tasks_logger.debug(f"💾 Tarea guardada en BD: ID={db_task.id}, ClickUp ID={db_task.clickup_id}")
+        # Notificaciones (best-effort): destinatarios desde los custom fields enviados
+        _notify_task_update(db, [db_task], action="created")
         
-        print(f"💾 Tarea guardada en BD con ID: {db_task.id}")
-        print(f"💾 Due date en BD después del commit: {db_task.due_date}")
-        print(f"💾 Tipo de due_date en BD: {type(db_task.due_date)}")
-        print(f"💾 Due date en BD (raw): {repr(db_task.due_date)}")
-        print(f"💾 Due date en BD (timestamp): {int(db_task.due_date.timestamp() * 1000) if db_task.due_date else 'None'}")
-        
-        print(f"✅ TAREA CREADA EXITOSAMENTE EN BD: ID={db_task.id}, ClickUp ID={db_task.clickup_id}")
-        print(f"✅ Due date guardado: {db_task.due_date}")
-        print(f"✅ Custom fields guardados: {db_task.custom_fields}")
-        
-        # Sincronización bidireccional: actualizar custom_fields desde ClickUp
-        print("🔄 Completando sincronización bidireccional...")
-        try:
-            updated_task = await clickup_client.get_task(clickup_response["id"])
-            if updated_task and "custom_fields" in updated_task:
-                # Actualizar la base de datos con los campos sincronizados
-                db_task.custom_fields = updated_task["custom_fields"]
-                db.commit()
-                print(f"✅ Sincronización bidireccional completada: {updated_task['custom_fields']}")
-        except Exception as sync_error:
-            print(f"⚠️ Error en sincronización bidireccional: {sync_error}")
-            # No fallar si la sincronización falla
-        
-        # Notificaciones (best-effort, no bloqueantes graves)
-        try:
-            print(f"🔔 Iniciando notificaciones para tarea: {db_task.name}")
-            
-            # OBTENER LOS CUSTOM FIELDS DESDE CLICKUP (después de crear la tarea)
-            clickup_custom_fields = {}
-            try:
-                # Obtener la tarea desde ClickUp para leer sus custom fields reales
-                clickup_task_details = await clickup_client.get_task(db_task.clickup_id)
-                if clickup_task_details and "custom_fields" in clickup_task_details:
-                    raw_custom_fields = clickup_task_details["custom_fields"]
-                    print(f"🔍 Custom fields desde ClickUp: {raw_custom_fields}")
-                    
-                    # Convertir lista de custom fields a diccionario name:value
-                    if isinstance(raw_custom_fields, list):
-                        for field in raw_custom_fields:
-                            if isinstance(field, dict) and "name" in field:
-                                field_name = field["name"]
-                                field_value = field.get("value")
-                                # Incluir todos los campos, incluso si están vacíos, para logs
-                                clickup_custom_fields[field_name] = field_value
-                                if field_value:
-                                    print(f"✅ Campo extraído con valor: {field_name} = {field_value}")
-                                else:
-                                    print(f"⚠️ Campo sin valor: {field_name} = {field_value}")
-                    
-                    # Si no hay custom fields con valores, usar los enviados desde el frontend
-                    if not any(v for v in clickup_custom_fields.values()):
-                        print("💡 Usando custom fields del frontend como fallback")
-                        clickup_custom_fields = task_data.custom_fields or {}
-                    
-                    # Actualizar la base de datos con los custom fields reales
-                    db_task.custom_fields = clickup_custom_fields
-                    db.commit()
-                    print(f"📝 Custom fields finales: {clickup_custom_fields}")
-            except Exception as e:
-                print(f"⚠️  Error obteniendo custom fields desde ClickUp: {e}")
-                # Usar los custom fields locales como fallback
-                clickup_custom_fields = task_data.custom_fields or {}
-            
-            # Obtener participantes del workspace (filtro básico)
-            participants = (
-                db.query(User).all()
-                if not task_data.workspace_id
-                else db.query(User).filter(User.workspaces.isnot(None)).all()
-            )
-            recipient_emails: List[str] = []
-            recipient_telegrams: List[str] = []
-            
-            print(f"👥 Participantes encontrados: {len(participants)}")
-            
-            for u in participants:
-                if u and getattr(u, "email", None):
-                    recipient_emails.append(u.email)
-                    print(f"📧 Email agregado (usuario): {u.email}")
-                try:
-                    telegram = None
-                    if u.preferences and isinstance(u.preferences, dict):
-                        telegram = u.preferences.get("telegram") or u.preferences.get("telegram_chat_id")
-                    if telegram:
-                        recipient_telegrams.append(str(telegram))
-                        print(f"🤖 Telegram agregado (usuario): {telegram}")
-                        
-                    
-                except Exception:
-                    pass
-
-            # Agregar destinatarios desde campos personalizados de ClickUp
-            try:
-                from utils.notifications import (
-                    send_email_async,
-                    send_telegram_async,
-                    build_task_email_content,
-                    build_task_telegram_message,
-                    extract_contacts_from_custom_fields,
-                )
-                
-                print(f"🔍 Campos personalizados de ClickUp: {clickup_custom_fields}")
-                extra_emails, extra_telegrams, _ = extract_contacts_from_custom_fields(clickup_custom_fields)
-                recipient_emails.extend(extra_emails)
-                recipient_telegrams.extend(extra_telegrams)
-                
-                print(f"📧 Emails desde ClickUp: {extra_emails}")
-                print(f"🤖 Telegrams desde ClickUp: {extra_telegrams}")
-                print(f"📧 Emails totales: {recipient_emails}")
-                print(f"🤖 Telegrams totales: {recipient_telegrams}")
-
-                if recipient_emails or recipient_telegrams:
-                    subject, text_body, html_body = build_task_email_content(
-                        action="created",
-                        task_id=db_task.clickup_id,
-                        name=db_task.name,
-                        status=db_task.status,
-                        priority=db_task.priority,
-                        assignee_name=None,
-                        due_date_iso=db_task.due_date.isoformat() if db_task.due_date else None,
-                    )
-                    telegram_msg = build_task_telegram_message(
-                        action="created",
-                        task_id=db_task.clickup_id,
-                        name=db_task.name,
-                        status=db_task.status,
-                        priority=db_task.priority,
-                        assignee_name=None,
-                        due_date_iso=db_task.due_date.isoformat() if db_task.due_date else None,
-                    )
-
-                    print(f"📨 Enviando notificaciones...")
-
-                    import asyncio
-
-                    async def _notify():
-                        await asyncio.gather(
-                            send_email_async(list(dict.fromkeys(recipient_emails)), subject, text_body, html_body)
-                            if recipient_emails
-                            else asyncio.sleep(0),
-                            send_telegram_async(list(dict.fromkeys(recipient_telegrams)), telegram_msg)
-                            if recipient_telegrams
-                            else asyncio.sleep(0),
-                        )
-
-                    try:
-                        loop = asyncio.get_event_loop()
-                        if loop.is_running():
-                            asyncio.create_task(_notify())
-                        else:
-                            loop.run_until_complete(_notify())
-                        print(f"✅ Notificaciones enviadas correctamente")
-                    except Exception as e:
-                        print(f"❌ Error enviando notificaciones: {e}")
-                else:
-                    print(f"⚠️  No hay destinatarios para notificaciones")
-            except Exception as e:
-                print(f"⚠️ Error en sistema de notificaciones (no crítico): {e}")
-                # No fallar si las notificaciones fallan
-        except Exception as e:
-            print(f"⚠️ Error en sistema de notificaciones (no crítico): {e}")
-            # No fallar si las notificaciones fallan
-        
-        print(f"🚀 Retornando tarea creada exitosamente: {db_task.id}")
-        
-        # SOLUCIÓN TEMPORAL: Manejo robusto de errores
-        try:
-            response = TaskResponse.model_validate(db_task)
-            print(f"✅ Respuesta validada exitosamente")
-            return response
-        except Exception as validation_error:
-            print(f"⚠️ Error validando respuesta: {validation_error}")
-            # Crear respuesta manual si falla la validación
-            return TaskResponse(
-                id=db_task.id,
-                clickup_id=db_task.clickup_id,
-                name=db_task.name,
-                description=db_task.description,
-                status=db_task.status,
-                priority=db_task.priority,
-                due_date=db_task.due_date,
-                start_date=db_task.start_date,
-                assignee_id=db_task.assignee_id,
-                workspace_id=db_task.workspace_id,
-                list_id=db_task.list_id,
-                custom_fields=db_task.custom_fields,
-                is_synced=db_task.is_synced,
-                last_sync=db_task.last_sync
-            )
+        return _task_response(db_task)
         
     except Exception as e:
         raise HTTPException(
@@ -491,9 +126,49 @@ async def create_task(
         )
 
 
+async def _create_clickup_task(list_id: str, payload: dict, custom_fields: list) -> dict:
+    """POST de creación con los custom fields incluidos.
 
+    Si ClickUp rechaza el payload con un 400, se crea la tarea sin custom
+    fields (un único POST más, sin el reintento mínimo del cliente, que
+    conservaría los mismos campos) y se envían campo por campo.
+    """
+    if not custom_fields:
+        return await clickup_client.create_task(list_id, dict(payload))
+    try:
+        return await clickup_client.create_task(
+            list_id, {**payload, "custom_fields": list(custom_fields)}, retry_minimal=False
+        )
+    except Exception as e:
+        if getattr(e, "status", None) != 400:
+            raise
+        tasks_logger.warning(f"⚠️ ClickUp rechazó los custom fields en la creación ({e}); se envían campo por campo")
+    clickup_response = await clickup_client.create_task(list_id, dict(payload))
+    for field in custom_fields:
+        try:
+            await clickup_client.update_custom_field_value(clickup_response["id"], field["id"], field["value"])
+        except Exception as e:
+            tasks_logger.warning(f"⚠️ Error guardando custom field {field['id']} en tarea {clickup_response['id']}: {e}")
+    return clickup_response
+
+
+async def _verify_created_task(task_id: str, payload: dict, custom_fields: list):
+    """Modo depuración: releer la tarea creada y comparar con lo enviado"""
+    try:
+        remote = await clickup_client.get_task(task_id)
+    except Exception as e:
+        tasks_logger.warning(f"⚠️ Error verificando tarea {task_id}: {e}")
+        return
+    if payload.get("due_date") is not None and str(remote.get("due_date")) != str(payload["due_date"]):
+        tasks_logger.warning(f"⚠️ Verificación: due_date enviado {payload['due_date']}, en ClickUp {remote.get('due_date')}")
+    remote_values = {f.get("id"): f.get("value") for f in remote.get("custom_fields") or [] if isinstance(f, dict)}
+    for field in custom_fields:
+        if remote_values.get(field["id"]) in (None, ""):
+            tasks_logger.warning(f"⚠️ Verificación: custom field {field['id']} sin valor en ClickUp")
+    tasks_logger.debug(f"🔍 Verificación de tarea {task_id} completada")
 @router.get("/", response_model=TaskList)
 async def get_tasks(
+    request: Request,
     workspace_id: Optional[str] = Query(None, description="ID del workspace"),
     list_id: Optional[str] = Query(None, description="ID de la lista"),
     status: Optional[str] = Query(None, description="Estado de las tareas"),
@@ -503,132 +178,303 @@ async def get_tasks(
     include_closed: bool = Query(False, description="Incluir tareas cerradas"),
     page: int = Query(0, ge=0, description="Número de página"),
     limit: int = Query(50, ge=1, le=100, description="Límite de resultados"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página anterior (paginación keyset)"),
+    sort_by: Optional[str] = Query(None, description="Orden del cursor: id, due_date, priority o last_sync"),
+    count: Optional[str] = Query(None, description="Conteo total: exact, estimated (nulo con filtros) o none"),
+    fields: Optional[str] = Query(None, description="Campos a devolver (coma-separados) o preset: summary, full"),
+    tag: Optional[str] = Query(None, description="Tags separados por coma (alguno de ellos)"),
+    custom_field: Optional[str] = Query(None, description="Nombre o ID de un campo personalizado"),
+    custom_value: Optional[str] = Query(None, description="Valor del campo personalizado"),
     db: Session = Depends(get_db)
 ):
-    """Obtener lista de tareas con filtros"""
+    """Obtener lista de tareas con filtros.
+
+    Con `cursor` o `sort_by` se usa paginación keyset sobre (sort_key, id) y
+    el total no se calcula salvo que se pida con `count`; sin ellos se mantiene
+    el modo page/limit con conteo exacto. Con `fields` solo se consultan y
+    serializan los campos pedidos. Responde 304 si `If-None-Match` coincide
+    con la versión de datos actual, sin consultar la tabla de tareas.
+    `search` usa el índice de texto completo (nombre, descripción, tags y
+    custom fields): resultados por relevancia y con `highlight`. `tag` y
+    `custom_field`/`custom_value` filtran con las tablas `task_tags` y
+    `task_field_values`.
+    """
     try:
-        query = db.query(Task)
+        # GET condicional: ETag según la versión de datos del workspace y de los nombres
+        etag = build_etag(db, task_scopes(workspace_id), query_params_key(request))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        # Tier caliente por defecto; con include_closed se une tasks_archive
+        source = task_source(include_closed)
+        query = db.query(source)
         
         # Aplicar filtros
         if workspace_id:
-            query = query.filter(Task.workspace_id == workspace_id)
+            query = query.filter(source.workspace_id == workspace_id)
         if list_id:
-            query = query.filter(Task.list_id == list_id)
+            query = query.filter(source.list_id == list_id)
         if status:
-            query = query.filter(Task.status == status)
+            query = query.filter(source.status == status)
         if assignee_id:
-            query = query.filter(Task.assignee_id == assignee_id)
+            query = query.filter(source.assignee_id == assignee_id)
         if priority:
-            query = query.filter(Task.priority == priority)
+            query = query.filter(source.priority == priority)
+        if tag:
+            query = query.filter(tag_filter(source, tag))
+        if custom_field:
+            query = query.filter(field_filter(source, custom_field, custom_value))
+        matches = None
         if search:
-            query = query.filter(Task.name.contains(search))
+            # Índice de texto completo (FTS5 / tsvector) con ranking; LIKE si no está
+            # disponible o si la búsqueda no tiene palabras indexables (p. ej. "!!!")
+            if search_index_available(db):
+                matches = match_subquery(db, search, include_closed)
+            if matches is not None:
+                query = query.join(matches, matches.c.id == source.id)
+            else:
+                query = query.filter(or_(source.name.contains(search), source.description.contains(search)))
         if not include_closed:
-            query = query.filter(Task.status != "complete")
+            query = query.filter(source.status != "complete")
+        
+        keyset = cursor is not None or sort_by is not None
+        count = count or ("none" if keyset else "exact")
+        if count not in COUNT_MODES:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail=f"Modo de conteo no soportado: {count}. Opciones: {', '.join(COUNT_MODES)}"
+            )
         
         # Contar total
-        total = query.count()
+        if count == "exact":
+            total = query.count()
+        elif count == "estimated":
+            # Tamaño de las tablas: sin sentido para un subconjunto filtrado
+            filtered = any((workspace_id, list_id, status, assignee_id, priority, tag, custom_field, search))
+            if filtered:
+                total = None
+            else:
+                total = estimate_row_count(db, "tasks")
+                if include_closed:
+                    total += estimate_row_count(db, "tasks_archive")
+        else:
+            total = None
+        
+        # Fieldset disperso: seleccionar solo las columnas necesarias
+        selected = parse_fields(fields)
+        if keyset:
+            sort_by = sort_by or "id"
+        if selected:
+            query = query.with_entities(*select_columns(source, selected, (sort_by,) if keyset else ()))
+        else:
+            query = query.with_entities(*response_columns(source))
         
         # Paginar
-        tasks = query.offset(page * limit).limit(limit).all()
-
-        # Normalizar prioridad y construir respuesta de forma segura
-        responses: List[TaskResponse] = []
-        dirty = False
-        for t in tasks:
-            # Debug: verificar due_date antes de procesar
-            print(f"🔍 Debug tarea {t.id}: due_date={t.due_date}, tipo={type(t.due_date)}")
-            if t.due_date:
-                print(f"  📅 Due date timestamp: {int(t.due_date.timestamp() * 1000)}")
-                print(f"  📅 Due date raw: {repr(t.due_date)}")
+        next_cursor = None
+        if keyset:
+            tasks = apply_keyset(query, source, sort_by, cursor).limit(limit + 1).all()
+            has_more = len(tasks) > limit
+            tasks = tasks[:limit]
+            if has_more:
+                last = tasks[-1]
+                next_cursor = encode_cursor(sort_by, getattr(last, sort_by), last.id)
             else:
-                print(f"  ⚠️ Due date es None")
-            
-            # Asegurar que siempre haya una prioridad válida
-            if t.priority is None or isinstance(t.priority, (str, dict)):
-                t.priority = _priority_to_int(t.priority)
-                dirty = True
-            
-            # Normalizar IDs a string si vinieron como enteros
-            if getattr(t, "assignee_id", None) is not None and not isinstance(t.assignee_id, str):
-                t.assignee_id = str(t.assignee_id)
-                dirty = True
-            if getattr(t, "creator_id", None) is not None and not isinstance(t.creator_id, str):
-                t.creator_id = str(t.creator_id)
-                dirty = True
-            try:
-                response = TaskResponse.model_validate(t)
-                print(f"✅ Tarea {t.id} validada: due_date={response.due_date}, tipo={type(response.due_date)}")
-                responses.append(response)
-            except Exception as e:
-                print(f"Error validando tarea {t.clickup_id}: {e}")
-                # Intento adicional: forzar conversión y revalidar
-                t.priority = _priority_to_int(getattr(t, "priority", 3))
-                if getattr(t, "assignee_id", None) is not None and not isinstance(t.assignee_id, str):
-                    t.assignee_id = str(t.assignee_id)
-                    dirty = True
-                if getattr(t, "creator_id", None) is not None and not isinstance(t.creator_id, str):
-                    t.creator_id = str(t.creator_id)
-                    dirty = True
-                try:
-                    response = TaskResponse.model_validate(t)
-                    print(f"✅ Tarea {t.id} revalidada: due_date={response.due_date}, tipo={type(response.due_date)}")
-                    responses.append(response)
-                except Exception as e2:
-                    print(f"Error persistente validando tarea {t.clickup_id}: {e2}")
-        if dirty:
-            db.commit()
+                # Filas con valor agotadas: seguir con las que no tienen sort_key
+                next_cursor = null_tail_cursor(query, source, sort_by, cursor)
+                has_more = next_cursor is not None
+        else:
+            if matches is not None:
+                # Más relevantes primero
+                query = query.order_by(matches.c.rank, source.id)
+            tasks = query.offset(page * limit).limit(limit).all()
+            has_more = (page + 1) * limit < total if total is not None else len(tasks) == limit
 
-        # Enriquecer con nombre de asignado, lista y workspace
-        for r in responses:
-            # Enriquecer nombre de asignado
-            if getattr(r, "assignee_id", None) and not getattr(r, "assignee_name", None):
-                try:
-                    # Intentar obtener el nombre del usuario desde la base de datos local
-                    from models.user import User
-                    user = db.query(User).filter(User.clickup_id == str(r.assignee_id)).first()
-                    if user:
-                        # Usar el nombre completo si está disponible
-                        if user.first_name and user.last_name:
-                            assignee_name = f"{user.first_name} {user.last_name}"
-                        elif user.first_name:
-                            assignee_name = user.first_name
-                        elif user.username:
-                            assignee_name = user.username
-                        else:
-                            assignee_name = user.email
-                        object.__setattr__(r, "assignee_name", assignee_name)
-                    else:
-                        # Si no se encuentra en la BD local, usar el ID como fallback
-                        object.__setattr__(r, "assignee_name", f"Usuario {str(r.assignee_id)}")
-                except Exception as e:
-                    print(f"Error obteniendo nombre de usuario {r.assignee_id}: {e}")
-                    # Fallback: usar el ID
-                    object.__setattr__(r, "assignee_name", str(r.assignee_id))
-            
-            # Enriquecer nombre de lista (usar ID como fallback por ahora)
-            if getattr(r, "list_id", None) and not getattr(r, "list_name", None):
-                object.__setattr__(r, "list_name", f"Lista {str(r.list_id)}")
-            
-            # Enriquecer nombre de workspace
-            if getattr(r, "workspace_id", None) and not getattr(r, "workspace_name", None):
+        if selected:
+            enriched = task_enricher.enrich(db, rows_to_items(tasks))
+            if matches is not None:
+                attach_highlights(db, enriched, search, include_closed)
+                selected = selected + ("highlight",)
+            items = [item_to_dict(item, selected) for item in enriched]
+        else:
+            # Fast path: filas de nuestra BD -> dicts sin validación Pydantic por fila
+            items = [item for item in (task_row_to_dict(row) for row in tasks) if item is not None]
+            task_enricher.enrich(db, items)
+            if matches is not None:
+                attach_highlights(db, items, search, include_closed)
+
+        return FastJSONResponse(content={
+            "tasks": items,
+            "total": total,
+            "page": 0 if keyset else page,
+            "limit": limit,
+            "has_more": has_more,
+            "next_cursor": next_cursor
+        }, headers={"ETag": etag})
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener las tareas: {str(e)}"
+        )
+
+@router.get("/export")
+async def export_tasks(
+    format: str = Query("ndjson", description="Formato: ndjson o csv"),
+    workspace_id: Optional[str] = Query(None, description="ID del workspace"),
+    list_id: Optional[str] = Query(None, description="ID de la lista"),
+    status: Optional[str] = Query(None, description="Estado de las tareas"),
+    assignee_id: Optional[str] = Query(None, description="ID del usuario asignado"),
+    include_closed: bool = Query(False, description="Incluir tareas cerradas y archivadas")
+):
+    """Exportar todas las tareas en streaming (memoria constante para cualquier tamaño)"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=f"Formato no soportado: {format}. Opciones: {', '.join(EXPORT_FORMATS)}"
+        )
+    
+    filters = {
+        "workspace_id": workspace_id,
+        "list_id": list_id,
+        "status": status,
+        "assignee_id": assignee_id
+    }
+    media_type, filename = EXPORT_FORMATS[format]
+    rows = iter_csv(filters, include_closed) if format == "csv" else iter_ndjson(filters, include_closed)
+    return StreamingResponse(
+        rows,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/stream")
+async def stream_task_changes(
+    request: Request,
+    workspace_id: Optional[str] = Query(None, description="IDs de workspace separados por comas (todos si se omite)"),
+    last_event_id: Optional[str] = Query(None, description="Reanudar después de este evento (alternativa a la cabecera Last-Event-ID)")
+):
+    """Cambios de tareas en vivo (Server-Sent Events).
+
+    Eventos `created`, `updated` y `deleted` con los campos modificados,
+    publicados tras el commit por webhooks, sincronización y mutaciones
+    locales. Con `Last-Event-ID` se reenvían los eventos perdidos del
+    historial; si no es posible se envía `reset` y el cliente debe recargar.
+    """
+    import asyncio
+    from core.config import settings
+    
+    workspace_ids = [w.strip() for w in (workspace_id or "").split(",") if w.strip()]
+    subscription, backlog, reset_id = task_event_broker.subscribe(
+        workspace_ids, request.headers.get("last-event-id") or last_event_id
+    )
+    
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            if reset_id:
+                yield task_event_broker.reset_message(reset_id, "Eventos no disponibles en el historial")
+            for task_event in backlog:
+                yield task_event.to_sse()
+            while True:
                 try:
-                    from models.workspace import Workspace
-                    workspace = db.query(Workspace).filter(Workspace.clickup_id == str(r.workspace_id)).first()
-                    if workspace:
-                        object.__setattr__(r, "workspace_name", workspace.name)
-                    else:
-                        object.__setattr__(r, "workspace_name", f"Workspace {str(r.workspace_id)}")
-                except Exception as e:
-                    print(f"Error obteniendo nombre de workspace {r.workspace_id}: {e}")
-                    object.__setattr__(r, "workspace_name", str(r.workspace_id))
-
-        return TaskList(
-            tasks=responses,
-            total=total,
-            page=page,
-            limit=limit,
-            has_more=(page + 1) * limit < total
+                    task_event = await asyncio.wait_for(subscription.queue.get(), timeout=settings.TASK_STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if task_event is None:
+                    yield task_event_broker.reset_message(reason="Buffer del cliente desbordado")
+                else:
+                    yield task_event.to_sse()
+        finally:
+            task_event_broker.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/changes")
+async def get_task_changes(
+    since: Optional[str] = Query(None, description="Cursor de la respuesta anterior (sin cursor: cursor actual)"),
+    workspace_id: Optional[str] = Query(None, description="IDs de workspace separados por comas"),
+    limit: int = Query(500, ge=1, le=5000, description="Máximo de cambios por respuesta"),
+    db: Session = Depends(get_db)
+):
+    """Tareas creadas, modificadas o eliminadas después del cursor.
+
+    Lee el registro `task_changes` por rango de ID; con `has_more` se vuelve
+    a pedir de inmediato con el cursor nuevo y con `retry_after` tras esos
+    segundos (hay cambios recientes aún sin asentar). Un 410 indica que la
+    compactación ya eliminó cambios posteriores al cursor y hay que recargar
+    las tareas.
+    """
+    from core.task_change_log import changes_since
+    
+    try:
+        workspace_ids = [w.strip() for w in (workspace_id or "").split(",") if w.strip()]
+        return FastJSONResponse(changes_since(db, since, workspace_ids, limit))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener los cambios de tareas: {str(e)}"
+        )
+
+@router.post("/changes/compact")
+async def compact_task_changes(
+    compact_after_hours: Optional[int] = Query(None, ge=0, description="Horas (por defecto TASK_CHANGE_LOG_COMPACT_AFTER_HOURS)"),
+    retention_days: Optional[int] = Query(None, ge=1, description="Días (por defecto TASK_CHANGE_LOG_RETENTION_DAYS)"),
+    db: Session = Depends(get_db)
+):
+    """Compactar el registro de cambios de tareas"""
+    from core.task_change_log import compact_change_log
+    
+    try:
+        return compact_change_log(db, compact_after_hours=compact_after_hours, retention_days=retention_days)
+        
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al compactar el registro de cambios: {str(e)}"
         )
+
+@router.post("/batch-get", response_model=TaskBatchGetResponse)
+async def batch_get_tasks(
+    batch_data: TaskBatchGet,
+    db: Session = Depends(get_db)
+):
+    """Obtener varias tareas por ID de ClickUp con una sola consulta.
+
+    Las tareas se devuelven en el orden de `task_ids` (tier caliente y
+    archivo). Las que no están en la BD local se piden a ClickUp en paralelo
+    solo con `fetch_missing`, sin escribirlas en la BD; el resto se informa
+    en `missing`.
+    """
+    from core.config import settings
+    
+    if len(batch_data.task_ids) > settings.TASK_BATCH_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=f"Demasiados IDs: {len(batch_data.task_ids)} (máximo {settings.TASK_BATCH_GET_MAX_IDS})"
+        )
+    try:
+        task_ids = list(dict.fromkeys(str(task_id) for task_id in batch_data.task_ids))
+        found = _load_tasks_by_ids(db, task_ids)
+        missing = [task_id for task_id in task_ids if task_id not in found]
+        if missing and batch_data.fetch_missing:
+            found.update(await _fetch_remote_tasks(db, missing))
+            missing = [task_id for task_id in missing if task_id not in found]
+        
+        return FastJSONResponse(content={
+            "tasks": [found[task_id] for task_id in task_ids if task_id in found],
+            "missing": missing
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -636,71 +482,496 @@ async def get_tasks(
             detail=f"Error al obtener las tareas: {str(e)}"
         )
 
+
+def _load_tasks_by_ids(db: Session, task_ids: List[str]) -> dict:
+    """Tareas locales (tier caliente y archivo) por ID de ClickUp, en una consulta"""
+    if not task_ids:
+        return {}
+    source = task_source(include_closed=True)
+    rows = db.query(*response_columns(source)).filter(source.clickup_id.in_(task_ids)).all()
+    items = [item for item in (task_row_to_dict(row) for row in rows) if item is not None]
+    task_enricher.enrich(db, items)
+    found = {}
+    for item in items:
+        found.setdefault(item["clickup_id"], item)
+    return found
+
+
+async def _fetch_remote_tasks(db: Session, task_ids: List[str]) -> dict:
+    """Tareas de ClickUp en paralelo (límite BULK_UPDATE_CONCURRENCY); las que fallan se omiten"""
+    import asyncio
+    from core.advanced_sync import sync_service
+    from core.config import settings
+    
+    semaphore = asyncio.Semaphore(max(1, settings.BULK_UPDATE_CONCURRENCY))
+    
+    async def fetch(task_id: str):
+        async with semaphore:
+            try:
+                await sync_service.rate_limiter.acquire()
+                return await _fetch_remote_task(task_id)
+            except Exception as e:
+                tasks_logger.warning(f"⚠️ No se pudo obtener la tarea {task_id} de ClickUp: {e}")
+                return None
+    
+    remote = [task for task in await asyncio.gather(*[fetch(task_id) for task_id in task_ids]) if task is not None]
+    return {task["clickup_id"]: task for task in task_enricher.enrich(db, [jsonable_encoder(task) for task in remote])}
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Campos a devolver (coma-separados) o preset: summary, full"),
     db: Session = Depends(get_db)
 ):
-    """Obtener una tarea específica"""
+    """Obtener una tarea específica (stale-while-revalidate).
+
+    La cabecera X-Task-Freshness indica el camino: `fresh` (fila reciente),
+    `stale` (fila servida y refresco programado), `miss` (leída de ClickUp)
+    o `archive` (tarea archivada, sin refresco); `Age` da los segundos desde
+    la última sincronización. Una tarea ausente que ClickUp no tiene da 404;
+    otros errores de ClickUp, 502.
+    """
     try:
-        # Buscar en base de datos local
-        db_task = db.query(Task).filter(Task.clickup_id == task_id).first()
+        local = _local_sync_state(db, task_id)
         
-        if not db_task:
-            # Si no existe localmente, obtener de ClickUp
-            clickup_task = await clickup_client.get_task(task_id)
-            
-            # Crear registro local
-            db_task = Task(
-                clickup_id=clickup_task["id"],
-                name=clickup_task["name"],
-                description=clickup_task.get("description", ""),
-                status=clickup_task["status"]["status"],
-                priority=_priority_to_int(clickup_task.get("priority", 3)),
-                due_date=(
-                    (lambda _v: (
-                        safe_timestamp_to_datetime()
-                        if isinstance(_v, (int, float))
-                        else (safe_timestamp_to_datetime(int()) if isinstance(_v, str) and _v.isdigit() else None)
-                    ))(clickup_task.get("due_date"))
-                    if clickup_task.get("due_date") is not None
-                    else None
-                ),
-                start_date=(
-                    (lambda _v: (
-                        safe_timestamp_to_datetime()
-                        if isinstance(_v, (int, float))
-                        else (safe_timestamp_to_datetime(int()) if isinstance(_v, str) and _v.isdigit() else None)
-                    ))(clickup_task.get("start_date"))
-                    if clickup_task.get("start_date") is not None
-                    else None
-                ),
-                workspace_id=clickup_task["team_id"],
-                list_id=clickup_task["list"]["id"],
-                assignee_id=str(clickup_task["assignees"][0]["id"]) if clickup_task.get("assignees") else None,
-                creator_id=str(clickup_task["creator"]["id"]),
-                tags=[tag["name"] for tag in clickup_task.get("tags", [])],
-                custom_fields=clickup_task.get("custom_fields", {}),
-                is_synced=True,
-                last_sync=datetime.utcnow()
-            )
-            
-            db.add(db_task)
-            db.commit()
-            db.refresh(db_task)
-        else:
-            # Asegurar que priority sea entero en respuestas
-            db_task.priority = _priority_to_int(db_task.priority)
-            db.commit()
+        # GET condicional; el ETag solo se emite para tareas locales
+        etag = build_etag(db, task_scopes(), task_id, query_params_key(request))
+        if etag_matches(request, etag):
+            not_modified_response = not_modified(etag)
+            if local is not None:
+                not_modified_response.headers.update(_freshness_headers(task_id, *local))
+            return not_modified_response
         
-        return TaskResponse.model_validate(db_task)
+        selected = parse_fields(fields)
+        if local is None:
+            # Tarea ausente: una sola llamada a ClickUp por ID aunque lleguen varias peticiones
+            try:
+                values = await task_refresher.fetch_missing(task_id, clickup_client)
+            except TaskNotFound:
+                raise HTTPException(status_code=http_status.HTTP_404_NOT_FOUND, detail="Tarea no encontrada")
+            except Exception as e:
+                raise HTTPException(
+                    status_code=http_status.HTTP_502_BAD_GATEWAY,
+                    detail=f"Error obteniendo la tarea de ClickUp: {str(e)}"
+                )
+            remote = TaskResponse.model_validate({**values, "is_synced": True})
+            headers = {"X-Task-Freshness": MISS}
+            if selected:
+                remote = task_enricher.enrich(db, [remote])[0]
+                return FastJSONResponse(content=jsonable_encoder(item_to_dict(remote, selected)), headers=headers)
+            response.headers.update(headers)
+            return remote
         
+        headers = {"ETag": etag, **_freshness_headers(task_id, *local)}
+        model = TaskArchive if local[1] else Task
+        if selected:
+            sparse = _get_task_fields(task_id, selected, db, model)
+            if sparse is None:
+                raise ValueError(f"la tarea {task_id} ya no existe")
+            sparse.headers.update(headers)
+            return sparse
+        
+        db_task = db.query(model).filter(model.clickup_id == task_id).first()
+        task_response = _task_response(db_task) if db_task is not None else None
+        if task_response is None:
+            raise ValueError(f"datos inválidos para la tarea {task_id}")
+        response.headers.update(headers)
+        return task_response
+        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=http_status.HTTP_404_NOT_FOUND,
             detail=f"Tarea no encontrada: {str(e)}"
         )
 
+
+def _local_sync_state(db: Session, task_id: str) -> Optional[tuple]:
+    """(last_sync, archivada) de la tarea local, o None si no existe en ningún tier"""
+    row = db.query(Task.last_sync).filter(Task.clickup_id == task_id).first()
+    if row:
+        return row.last_sync, False
+    row = db.query(TaskArchive.last_sync).filter(TaskArchive.clickup_id == task_id).first()
+    if row:
+        return row.last_sync, True
+    return None
+
+
+def _freshness_headers(task_id: str, last_sync: Optional[datetime], archived: bool) -> dict:
+    """Cabeceras de frescura; si la fila está vencida se programa su refresco"""
+    state, age = task_refresher.classify(task_id, last_sync, archived, clickup_client)
+    headers = {"X-Task-Freshness": state}
+    if age is not None:
+        headers["Age"] = str(age)
+    return headers
+
+
+async def _fetch_remote_task(task_id: str) -> TaskResponse:
+    """Obtener una tarea de ClickUp sin escribir en la BD.
+
+    La ingesta corre a cargo de la sincronización y los webhooks.
+    """
+    clickup_task = await clickup_client.get_task(task_id)
+    values = normalize_clickup_task(clickup_task)
+    return TaskResponse.model_validate({**values, "is_synced": True, "last_sync": None})
+
+
+def _get_task_fields(task_id: str, selected, db: Session, model=Task) -> Optional[FastJSONResponse]:
+    """Detalle con fieldset disperso desde la BD local (tier de `model`)"""
+    row = db.query(*select_columns(model, selected)).filter(model.clickup_id == task_id).first()
+    if row is None:
+        return None
+    items = task_enricher.enrich(db, rows_to_items([row]))
+    return FastJSONResponse(content=item_to_dict(items[0], selected))
+
+def _clickup_update_payload(task_data: TaskUpdate) -> dict:
+    """Campos de TaskUpdate en el formato de la API de ClickUp (sin custom fields)"""
+    update_data = {}
+    if task_data.name is not None:
+        update_data["name"] = task_data.name
+    if task_data.description is not None:
+        update_data["description"] = task_data.description
+    if task_data.status is not None and task_data.status.strip():
+        # No enviar status en actualizaciones - puede causar error 400
+        tasks_logger.warning(f"⚠️ Status '{task_data.status}' omitido en actualización para evitar errores")
+    elif task_data.status == "":
+        tasks_logger.warning("⚠️ Estado vacío recibido, no se actualizará en ClickUp")
+    if task_data.priority is not None:
+        update_data["priority"] = _priority_to_int(task_data.priority)
+    if task_data.due_date is not None:
+        update_data["due_date"] = _timestamp_ms(_parse_date(task_data.due_date))
+    if task_data.start_date is not None:
+        update_data["start_date"] = _timestamp_ms(task_data.start_date)
+    if task_data.assignee_id is not None:
+        try:
+            update_data["assignees"] = [int(str(task_data.assignee_id))]
+        except ValueError:
+            update_data["assignees"] = [str(task_data.assignee_id)]
+    if task_data.tags is not None:
+        update_data["tags"] = task_data.tags
+    return update_data
+
+
+async def _clickup_custom_fields_payload(list_id: str, custom_fields: dict) -> list:
+    """Convertir custom fields {nombre: valor} a [{id, value}] con el esquema local de la lista"""
+    tasks_logger.debug(f"📝 Custom fields recibidos del frontend: {custom_fields}")
+    schema = await custom_field_registry.get_schema(list_id, clickup_client)
+    if schema.fields:
+        return schema.to_clickup_payload(custom_fields)
+    
+    tasks_logger.warning(f"⚠️ Sin esquema de custom fields para la lista {list_id}")
+    # Fallback: usar nombres como antes
+    return [
+        {"name": field_name, "value": str(field_value)}
+        for field_name, field_value in custom_fields.items()
+        if field_value
+    ]
+
+
+async def _push_clickup_update(task_id: str, update_data: dict, acquire=None):
+    """PUT en ClickUp con reintentos degradados (sin custom fields, solo nombre).
+
+    `acquire` (opcional) se espera antes de cada PUT, reintentos incluidos.
+    """
+    async def put(data: dict):
+        if acquire is not None:
+            await acquire()
+        await clickup_client.update_task(task_id, data)
+
+    tasks_logger.debug(f"🔧 Actualizando tarea {task_id} con datos: {update_data}")
+    try:
+        await put(update_data)
+        tasks_logger.info(f"✅ Tarea {task_id} actualizada exitosamente en ClickUp")
+    except Exception as clickup_error:
+        tasks_logger.error(f"❌ Error específico de ClickUp: {clickup_error}")
+        tasks_logger.debug(f"🔍 Task ID: {task_id}")
+        tasks_logger.debug(f"🔍 Update data: {update_data}")
+        # Verificar si es problema de permisos o tarea inexistente
+        if "400" in str(clickup_error):
+            tasks_logger.debug("💡 Error 400 sugiere datos inválidos o permisos insuficientes")
+        elif "404" in str(clickup_error):
+            tasks_logger.debug("💡 Error 404 sugiere que la tarea no existe en ClickUp")
+        elif "401" in str(clickup_error):
+            tasks_logger.debug("💡 Error 401 sugiere problema de autenticación")
+        # Si falla con custom_fields, intentar sin ellos
+        if "custom_fields" in update_data and update_data["custom_fields"]:
+            tasks_logger.debug("🔄 Reintentando sin custom_fields...")
+            update_data_no_cf = {k: v for k, v in update_data.items() if k != "custom_fields"}
+            tasks_logger.debug(f"🔧 Datos sin custom_fields: {update_data_no_cf}")
+            try:
+                await put(update_data_no_cf)
+                tasks_logger.debug("✅ Actualización exitosa sin custom_fields")
+            except Exception as retry_error:
+                tasks_logger.error(f"❌ Error aún sin custom_fields: {retry_error}")
+                # Último intento: actualizar solo nombre si es crítico
+                if "name" in update_data_no_cf:
+                    try:
+                        minimal_data = {"name": update_data_no_cf["name"]}
+                        await put(minimal_data)
+                        tasks_logger.debug("✅ Actualización mínima exitosa (solo nombre)")
+                    except Exception as final_error:
+                        tasks_logger.error(f"❌ Error en actualización mínima: {final_error}")
+                        raise clickup_error  # Lanzar el error original
+                else:
+                    raise clickup_error
+        else:
+            raise clickup_error
+
+
+def _clickup_create_payload(task_data: TaskCreate) -> dict:
+    """Campos de TaskCreate en el formato de la API de ClickUp (sin custom fields)"""
+    payload = {
+        "name": task_data.name,
+        "description": task_data.description or ""
+    }
+    if task_data.priority is not None:
+        payload["priority"] = _priority_to_int(task_data.priority)
+    if task_data.status:
+        payload["status"] = task_data.status
+    if task_data.assignee_id:
+        try:
+            payload["assignees"] = [int(str(task_data.assignee_id))]
+        except ValueError:
+            payload["assignees"] = [str(task_data.assignee_id)]
+    due_date_ms = _timestamp_ms(task_data.due_date)
+    if due_date_ms is not None:
+        payload["due_date"] = due_date_ms
+    start_date_ms = _timestamp_ms(task_data.start_date)
+    if start_date_ms is not None:
+        payload["start_date"] = start_date_ms
+    if task_data.tags:
+        payload["tags"] = task_data.tags
+    return payload
+
+
+def _created_task_values(task_data: TaskCreate, clickup_response: dict, now: datetime) -> dict:
+    """Valores de columnas de `tasks` para una tarea recién creada en ClickUp.
+
+    La respuesta de ClickUp manda; lo enviado cubre los campos que omita.
+    """
+    values = normalize_clickup_task(clickup_response, task_data.workspace_id)
+    # Hash de la respuesta tal como la normaliza la sincronización, antes de completar campos
+    content_hash = task_content_hash(values)
+    values["name"] = values["name"] or task_data.name
+    values["workspace_id"] = str(task_data.workspace_id)
+    values["list_id"] = values["list_id"] or str(task_data.list_id)
+    if not clickup_response.get("status") and task_data.status:
+        values["status"] = task_data.status
+    if clickup_response.get("priority") is None and task_data.priority is not None:
+        values["priority"] = _priority_to_int(task_data.priority)
+    if values["due_date"] is None:
+        values["due_date"] = _timestamp_to_datetime(_timestamp_ms(task_data.due_date))
+    if values["start_date"] is None:
+        values["start_date"] = task_data.start_date
+    if values["assignee_id"] is None:
+        values["assignee_id"] = normalize_id(task_data.assignee_id)
+    if not values["tags"] and task_data.tags:
+        values["tags"] = task_data.tags
+    # Localmente los custom fields se guardan como {nombre: valor}
+    values["custom_fields"] = task_data.custom_fields or {}
+    values["content_hash"] = content_hash
+    values["is_synced"] = 1
+    values["last_sync"] = now
+    return values
+
+
+def _parse_date(value) -> Optional[datetime]:
+    """Fecha recibida como datetime, timestamp en ms o string ISO"""
+    if value is None or value == "" or isinstance(value, datetime):
+        return value or None
+    parsed = _timestamp_to_datetime(value)
+    if parsed is None and isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            parsed = None
+    return parsed
+
+
+def _local_datetime(value) -> Optional[datetime]:
+    """Fecha tal como se guarda en la fila local (sin zona)"""
+    parsed = _parse_date(value)
+    return parsed.replace(tzinfo=None) if parsed else None
+
+
+def _apply_local_update(db_task: Task, task_data):
+    """Aplicar TaskUpdate (o un dict de campos) a la fila local (sin commit); el modelo normaliza tipos"""
+    values = task_data if isinstance(task_data, dict) else task_data.dict(exclude_unset=True)
+    for field, value in values.items():
+        if field in ("due_date", "start_date"):
+            value = _local_datetime(value)
+        setattr(db_task, field, value)
+    db_task.is_synced = True
+    db_task.last_sync = datetime.utcnow()
+
+
+def _apply_pushed_changes(db_task: Task, changes: dict):
+    """Aplicar a la fila local cambios ya aceptados por ClickUp (sin commit).
+
+    Los custom fields se fusionan con los guardados y el hash de contenido se
+    recalcula como lo hará la próxima sincronización.
+    """
+    changes = dict(changes)
+    if "custom_fields" in changes:
+        schema = custom_field_registry.cached(db_task.list_id) or empty_schema(db_task.list_id)
+        changes["custom_fields"] = {**schema.named_values(db_task.custom_fields), **(changes["custom_fields"] or {})}
+    _apply_local_update(db_task, changes)
+    db_task.content_hash = task_content_hash({field: getattr(db_task, field) for field in HASHED_FIELDS})
+
+
+def _same_value(current, new) -> bool:
+    """Igualdad tolerante a tipos (ClickUp guarda los custom fields como texto)"""
+    if current == new:
+        return True
+    return current is not None and new is not None and str(current) == str(new)
+
+
+def _task_update_diff(db_task: Task, task_data: TaskUpdate) -> dict:
+    """Campos de TaskUpdate que cambian respecto de la fila local: {campo: valor nuevo}.
+
+    Para custom fields solo se devuelven las claves cuyo valor cambia.
+    """
+    changes = {}
+    for field, value in task_data.dict(exclude_unset=True).items():
+        current = getattr(db_task, field, None)
+        if field == "priority":
+            same = value is None or _priority_to_int(value) == current
+        elif field == "assignee_id":
+            same = normalize_id(value) == current
+        elif field in ("due_date", "start_date"):
+            same = _local_datetime(value) == current
+        elif field == "description":
+            same = (value or "") == (current or "")
+        elif field == "status":
+            # El estado no se envía a ClickUp (ver _clickup_update_payload): cambiarlo
+            # solo en la fila local la desincronizaría
+            if (value or "").strip() and value != current:
+                tasks_logger.warning(f"⚠️ Status '{value}' omitido en actualización para evitar errores")
+            continue
+        elif field == "custom_fields":
+            schema = custom_field_registry.cached(db_task.list_id) or empty_schema(db_task.list_id)
+            stored = schema.named_values(current)
+            value = {
+                name: new_value
+                for name, new_value in schema.named_values(value).items()
+                if not _same_value(stored.get(name), new_value)
+            }
+            same = not value
+        else:
+            same = value == current
+        if not same:
+            changes[field] = value
+    return changes
+
+
+async def _push_custom_field_changes(task_id: str, list_id: str, custom_fields: dict):
+    """Custom fields modificados -> endpoint dedicado de ClickUp, uno por campo"""
+    schema = await custom_field_registry.get_schema(list_id, clickup_client)
+    if not schema.fields:
+        # Sin esquema: fallback al PUT de la tarea con nombres
+        await _push_clickup_update(task_id, {"custom_fields": await _clickup_custom_fields_payload(list_id, custom_fields)})
+        return
+    for field in schema.to_clickup_payload(custom_fields):
+        await clickup_client.update_custom_field_value(task_id, field["id"], field["value"])
+
+
+def _notification_recipients(db: Session, db_tasks: List[Task]) -> tuple:
+    """Emails y chats de Telegram de participantes y de los custom fields de las tareas"""
+    from utils.notifications import extract_contacts_from_custom_fields
+
+    recipient_emails = []
+    recipient_telegrams = []
+    try:
+        has_workspace = any(t.workspace_id for t in db_tasks)
+        participants = db.query(User).all() if not has_workspace else db.query(User).filter(User.workspaces.isnot(None)).all()
+    except Exception:
+        participants = []
+    for u in participants:
+        if u and u.email:
+            recipient_emails.append(u.email)
+        try:
+            telegram = None
+            if u.preferences and isinstance(u.preferences, dict):
+                telegram = u.preferences.get("telegram") or u.preferences.get("telegram_chat_id")
+            if telegram:
+                recipient_telegrams.append(str(telegram))
+        except Exception:
+            pass
+
+    # Agregar destinatarios desde campos personalizados de las tareas
+    for db_task in db_tasks:
+        extra_emails, extra_telegrams, _ = extract_contacts_from_custom_fields(db_task.custom_fields or {}, db_task.list_id)
+        recipient_emails.extend(extra_emails)
+        recipient_telegrams.extend(extra_telegrams)
+    return list(dict.fromkeys(recipient_emails)), list(dict.fromkeys(recipient_telegrams))
+
+
+def _notify_task_update(db: Session, db_tasks: List[Task], action: str = "updated"):
+    """Notificar cambios de tareas: mensaje individual o un único resumen para varias tareas"""
+    import asyncio
+    from utils.notifications import (
+        send_email_async,
+        send_telegram_async,
+        build_task_email_content,
+        build_task_telegram_message,
+        build_task_digest_email_content,
+        build_task_digest_telegram_message,
+    )
+
+    try:
+        if not db_tasks:
+            return
+        recipient_emails, recipient_telegrams = _notification_recipients(db, db_tasks)
+        if not (recipient_emails or recipient_telegrams):
+            return
+
+        if len(db_tasks) == 1:
+            db_task = db_tasks[0]
+            details = dict(
+                action=action,
+                task_id=db_task.clickup_id,
+                name=db_task.name,
+                status=db_task.status,
+                priority=db_task.priority,
+                assignee_name=None,
+                due_date_iso=db_task.due_date.isoformat() if db_task.due_date else None,
+            )
+            subject, text_body, html_body = build_task_email_content(**details)
+            telegram_msg = build_task_telegram_message(**details)
+        else:
+            summaries = [
+                {"task_id": t.clickup_id, "name": t.name, "status": t.status, "priority": t.priority}
+                for t in db_tasks
+            ]
+            subject, text_body, html_body = build_task_digest_email_content(action, summaries)
+            telegram_msg = build_task_digest_telegram_message(action, summaries)
+
+        async def _notify():
+            await asyncio.gather(
+                send_email_async(recipient_emails, subject, text_body, html_body)
+                if recipient_emails
+                else asyncio.sleep(0),
+                send_telegram_async(recipient_telegrams, telegram_msg)
+                if recipient_telegrams
+                else asyncio.sleep(0)
+            )
+
+        try:
+            loop = asyncio.get_event_loop()
+            if loop.is_running():
+                asyncio.create_task(_notify())
+            else:
+                loop.run_until_complete(_notify())
+        except Exception:
+            pass
+    except Exception:
+        pass
+
+
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: str,
@@ -718,216 +989,28 @@ async def update_task(
                 detail="Tarea no encontrada"
             )
         
-        # Preparar datos para ClickUp
-        update_data = {}
-        if task_data.name is not None:
-            update_data["name"] = task_data.name
-        if task_data.description is not None:
-            update_data["description"] = task_data.description
-        if task_data.status is not None and task_data.status.strip():
-            # No enviar status en actualizaciones - puede causar error 400
-            print(f"⚠️ Status '{task_data.status}' omitido en actualización para evitar errores")
-        elif task_data.status == "":
-            print("⚠️ Estado vacío recibido, no se actualizará en ClickUp")
-        if task_data.priority is not None:
-            update_data["priority"] = _priority_to_int(task_data.priority)
-        if task_data.due_date is not None:
-            update_data["due_date"] = int(task_data.due_date.timestamp() * 1000)
-        if task_data.start_date is not None:
-            update_data["start_date"] = int(task_data.start_date.timestamp() * 1000)
-        if task_data.assignee_id is not None:
-            try:
-                update_data["assignees"] = [int(str(task_data.assignee_id))]
-            except ValueError:
-                update_data["assignees"] = [str(task_data.assignee_id)]
-        if task_data.tags is not None:
-            update_data["tags"] = task_data.tags
-        if task_data.custom_fields is not None:
-            print(f"📝 Custom fields recibidos del frontend: {task_data.custom_fields}")
-            
-            # Obtener la tarea actual para ver su estructura de custom_fields
-            try:
-                current_task = await clickup_client.get_task(task_id)
-                current_custom_fields = current_task.get("custom_fields", [])
-                print(f"🔍 Custom fields actuales en ClickUp: {current_custom_fields}")
-                
-                # Convertir custom_fields al formato que espera ClickUp usando IDs
-                update_data["custom_fields"] = []
-                for field_name, field_value in task_data.custom_fields.items():
-                    if field_value:  # Solo agregar campos con valor
-                        # Buscar el ID del campo por nombre
-                        field_id = None
-                        for cf in current_custom_fields:
-                            if cf.get("name") == field_name:
-                                field_id = cf.get("id")
-                                break
-                        
-                        if field_id:
-                            update_data["custom_fields"].append({
-                                "id": field_id,
-                                "value": str(field_value)
-                            })
-                            print(f"✅ Campo {field_name} mapeado a ID {field_id}")
-                        else:
-                            print(f"⚠️ No se encontró ID para campo {field_name}")
-            except Exception as e:
-                print(f"❌ Error obteniendo custom_fields actuales: {e}")
-                # Fallback: usar nombres como antes
-                update_data["custom_fields"] = []
-                for field_name, field_value in task_data.custom_fields.items():
-                    if field_value:
-                        update_data["custom_fields"].append({
-                            "name": field_name,
-                            "value": str(field_value)
-                        })
-        
-        # Verificar que tenemos datos para actualizar
-        if not update_data:
-            print("⚠️ No hay datos para actualizar en ClickUp")
-            return TaskResponse.model_validate(db_task)
-        
-        # Actualizar en ClickUp
-        print(f"🔧 Actualizando tarea {task_id} con datos: {update_data}")
-        print(f"🔍 Tipo de task_id: {type(task_id)}, valor: {repr(task_id)}")
-        
-        try:
-            await clickup_client.update_task(task_id, update_data)
-            print(f"✅ Tarea {task_id} actualizada exitosamente en ClickUp")
-        except Exception as clickup_error:
-            print(f"❌ Error específico de ClickUp: {clickup_error}")
-            print(f"🔍 Task ID: {task_id}")
-            print(f"🔍 Update data: {update_data}")
-            
-            # Verificar si es problema de permisos o tarea inexistente
-            if "400" in str(clickup_error):
-                print("💡 Error 400 sugiere datos inválidos o permisos insuficientes")
-            elif "404" in str(clickup_error):
-                print("💡 Error 404 sugiere que la tarea no existe en ClickUp")
-            elif "401" in str(clickup_error):
-                print("💡 Error 401 sugiere problema de autenticación")
-            
-            # Si falla con custom_fields, intentar sin ellos
-            if "custom_fields" in update_data and update_data["custom_fields"]:
-                print("🔄 Reintentando sin custom_fields...")
-                update_data_no_cf = {k: v for k, v in update_data.items() if k != "custom_fields"}
-                print(f"🔧 Datos sin custom_fields: {update_data_no_cf}")
-                try:
-                    await clickup_client.update_task(task_id, update_data_no_cf)
-                    print("✅ Actualización exitosa sin custom_fields")
-                except Exception as retry_error:
-                    print(f"❌ Error aún sin custom_fields: {retry_error}")
-                    
-                    # Último intento: actualizar solo nombre si es crítico
-                    if "name" in update_data_no_cf:
-                        try:
-                            minimal_data = {"name": update_data_no_cf["name"]}
-                            await clickup_client.update_task(task_id, minimal_data)
-                            print("✅ Actualización mínima exitosa (solo nombre)")
-                        except Exception as final_error:
-                            print(f"❌ Error en actualización mínima: {final_error}")
-                            raise clickup_error  # Lanzar el error original
-                    else:
-                        raise clickup_error
-            else:
-                raise clickup_error
-        
-        # Actualizar en base de datos local con normalización
-        updates_dict = task_data.dict(exclude_unset=True)
-        if "priority" in updates_dict:
-            db_task.priority = _priority_to_int(updates_dict.pop("priority"))
-        if "assignee_id" in updates_dict:
-            db_task.assignee_id = str(updates_dict.pop("assignee_id")) if updates_dict.get("assignee_id") is not None else None
-        # Asignar resto de campos directamente
-        for field, value in updates_dict.items():
-            setattr(db_task, field, value)
-        
-        db_task.is_synced = True
-        db_task.last_sync = datetime.utcnow()
+        # Solo lo que cambia respecto de la fila local; sin cambios no se toca ClickUp ni la BD
+        changes = _task_update_diff(db_task, task_data)
+        if not changes:
+            tasks_logger.debug(f"⏭️ Tarea {task_id} sin cambios; se omite la actualización")
+            return _task_response(db_task)
+        tasks_logger.debug(f"🔧 Campos modificados en tarea {task_id}: {list(changes)}")
+        # Campos de la tarea por PUT; custom fields por su endpoint dedicado
+        changed_fields = TaskUpdate.model_construct(**{f: v for f, v in changes.items() if f != "custom_fields"})
+        update_data = _clickup_update_payload(changed_fields)
+        if update_data:
+            await _push_clickup_update(task_id, update_data)
+        if changes.get("custom_fields"):
+            await _push_custom_field_changes(task_id, db_task.list_id, changes["custom_fields"])
         
+        # Actualizar en base de datos local
+        _apply_pushed_changes(db_task, changes)
         db.commit()
         db.refresh(db_task)
-        # Asegurar tipos correctos antes de responder
-        db_task.priority = _priority_to_int(getattr(db_task, "priority", 3))
-        if getattr(db_task, "assignee_id", None) is not None and not isinstance(db_task.assignee_id, str):
-            db_task.assignee_id = str(db_task.assignee_id)
-        if getattr(db_task, "creator_id", None) is not None and not isinstance(db_task.creator_id, str):
-            db_task.creator_id = str(db_task.creator_id)
         response = TaskResponse.model_validate(db_task)
 
         # Notificaciones de actualización
-        try:
-            participants = db.query(User).all() if not db_task.workspace_id else db.query(User).filter(User.workspaces.isnot(None)).all()
-            recipient_emails = []
-            recipient_telegrams = []
-            for u in participants:
-                if u and u.email:
-                    recipient_emails.append(u.email)
-                try:
-                    telegram = None
-                    if u.preferences and isinstance(u.preferences, dict):
-                        telegram = u.preferences.get("telegram") or u.preferences.get("telegram_chat_id")
-                    if telegram:
-                        recipient_telegrams.append(str(telegram))
-                except Exception:
-                    pass
-
-            # Agregar destinatarios desde campos personalizados de la tarea
-            from utils.notifications import (
-                send_email_async,
-                send_telegram_async,
-                send_sms_async,
-                build_task_email_content,
-                build_task_telegram_message,
-                build_task_sms_message,
-                extract_contacts_from_custom_fields,
-            )
-
-            extra_emails, extra_telegrams, _ = extract_contacts_from_custom_fields(db_task.custom_fields or {})
-            recipient_emails.extend(extra_emails)
-            recipient_telegrams.extend(extra_telegrams)
-
-            if recipient_emails or recipient_telegrams:
-                subject, text_body, html_body = build_task_email_content(
-                    action="updated",
-                    task_id=db_task.clickup_id,
-                    name=db_task.name,
-                    status=db_task.status,
-                    priority=db_task.priority,
-                    assignee_name=None,
-                    due_date_iso=db_task.due_date.isoformat() if db_task.due_date else None,
-                )
-                telegram_msg = build_task_telegram_message(
-                    action="updated",
-                    task_id=db_task.clickup_id,
-                    name=db_task.name,
-                    status=db_task.status,
-                    priority=db_task.priority,
-                    assignee_name=None,
-                    due_date_iso=db_task.due_date.isoformat() if db_task.due_date else None,
-                )
-
-                import asyncio
-
-                async def _notify():
-                    await asyncio.gather(
-                        send_email_async(list(dict.fromkeys(recipient_emails)), subject, text_body, html_body)
-                        if recipient_emails
-                        else asyncio.sleep(0),
-                        send_telegram_async(list(dict.fromkeys(recipient_telegrams)), telegram_msg)
-                        if recipient_telegrams
-                        else asyncio.sleep(0)
-                    )
-
-                try:
-                    loop = asyncio.get_event_loop()
-                    if loop.is_running():
-                        asyncio.create_task(_notify())
-                    else:
-                        loop.run_until_complete(_notify())
-                except Exception:
-                    pass
-        except Exception:
-            pass
+        _notify_task_update(db, [db_task])
 
         return response
         
@@ -979,7 +1062,7 @@ async def delete_task(
                     extract_contacts_from_custom_fields,
                 )
 
-                extra_emails, extra_telegrams, extra_sms = extract_contacts_from_custom_fields(db_task.custom_fields or {})
+                extra_emails, extra_telegrams, extra_sms = extract_contacts_from_custom_fields(db_task.custom_fields or {}, db_task.list_id)
                 recipient_emails.extend(extra_emails)
                 recipient_telegrams.extend(extra_telegrams)
 
@@ -1043,32 +1126,200 @@ async def delete_task(
             detail=f"Error al eliminar la tarea: {str(e)}"
         )
 
-@router.post("/bulk-update", response_model=List[TaskResponse])
+@router.post("/bulk-update", response_model=TaskBulkUpdateResponse)
 async def bulk_update_tasks(
     bulk_data: TaskBulkUpdate,
     db: Session = Depends(get_db)
 ):
-    """Actualizar múltiples tareas"""
+    """Actualizar múltiples tareas.
+
+    Los PUT a ClickUp se lanzan en paralelo (límite BULK_UPDATE_CONCURRENCY)
+    y comparten el rate limiter del servicio de sincronización; las filas
+    locales se aplican en una sola transacción y se envía un único resumen.
+    """
+    import asyncio
+    from core.advanced_sync import sync_service
+    from core.config import settings
+    
     try:
-        updated_tasks = []
+        task_ids = list(dict.fromkeys(bulk_data.task_ids))
+        db_tasks = {
+            t.clickup_id: t for t in db.query(Task).filter(Task.clickup_id.in_(task_ids)).all()
+        }
+        base_update = _clickup_update_payload(bulk_data.updates)
+        semaphore = asyncio.Semaphore(max(1, settings.BULK_UPDATE_CONCURRENCY))
+        if bulk_data.updates.custom_fields is not None:
+            # Calentar el registro de esquemas: a lo sumo un GET por lista distinta
+            await custom_field_registry.get_schemas((t.list_id for t in db_tasks.values()), clickup_client)
         
-        for task_id in bulk_data.task_ids:
-            # Actualizar cada tarea
-            await update_task(task_id, bulk_data.updates, db)
-            
-            # Obtener tarea actualizada
-            db_task = db.query(Task).filter(Task.clickup_id == task_id).first()
-            if db_task:
-                updated_tasks.append(TaskResponse.model_validate(db_task))
+        async def push(task_id: str) -> Optional[str]:
+            """Devuelve None si ClickUp aceptó la actualización, o el error"""
+            if task_id not in db_tasks:
+                return "Tarea no encontrada"
+            async with semaphore:
+                try:
+                    update_data = dict(base_update)
+                    if bulk_data.updates.custom_fields is not None:
+                        update_data["custom_fields"] = await _clickup_custom_fields_payload(
+                            db_tasks[task_id].list_id, bulk_data.updates.custom_fields
+                        )
+                    if update_data:
+                        # Un permiso del rate limiter por PUT, también en los reintentos
+                        await _push_clickup_update(task_id, update_data, acquire=sync_service.rate_limiter.acquire)
+                    return None
+                except Exception as e:
+                    return str(e)
+        
+        errors = await asyncio.gather(*[push(task_id) for task_id in task_ids])
+        
+        # Aplicar las actualizaciones aceptadas en una sola transacción (el estado no se envía
+        # a ClickUp, así que tampoco se cambia localmente)
+        changes = {f: v for f, v in bulk_data.updates.dict(exclude_unset=True).items() if f != "status"}
+        updated = [db_tasks[task_id] for task_id, error in zip(task_ids, errors) if error is None]
+        for db_task in updated:
+            _apply_pushed_changes(db_task, changes)
+        db.commit()
+        
+        results = []
+        for task_id, error in zip(task_ids, errors):
+            if error is None:
+                results.append(TaskBulkUpdateItem(
+                    task_id=task_id,
+                    success=True,
+                    task=TaskResponse.model_validate(db_tasks[task_id])
+                ))
+            else:
+                results.append(TaskBulkUpdateItem(task_id=task_id, success=False, error=error))
         
-        return updated_tasks
+        # Un único resumen en lugar de una notificación por tarea
+        _notify_task_update(db, updated)
+        
+        return TaskBulkUpdateResponse(
+            updated=len(updated),
+            failed=len(task_ids) - len(updated),
+            results=results
+        )
         
     except Exception as e:
+        db.rollback()
         raise HTTPException(
             status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error en actualización masiva: {str(e)}"
         )
 
+@router.post("/batch", response_model=TaskBatchCreateResponse, status_code=http_status.HTTP_201_CREATED)
+async def create_tasks_batch(
+    batch_data: TaskBatchCreate,
+    db: Session = Depends(get_db)
+):
+    """Crear varias tareas en una sola petición.
+
+    Los IDs de custom fields salen del registro de esquemas por lista; los POST a ClickUp
+    se lanzan en paralelo (límite BULK_UPDATE_CONCURRENCY) con el rate limiter
+    del servicio de sincronización; las filas locales se insertan en bloque en
+    una sola transacción (las que ya guardó un webhook se informan con la fila
+    existente). El resultado se informa por tarea, en el orden de `items`.
+    """
+    import asyncio
+    from core.advanced_sync import sync_service
+    from core.config import settings
+    from core.data_version import mark_changed
+    from core.task_attributes import sync_task_attributes
+    from core.task_events import record_task_events
+    
+    try:
+        items = batch_data.items
+        semaphore = asyncio.Semaphore(max(1, settings.BULK_UPDATE_CONCURRENCY))
+        
+        # Esquemas de custom fields del registro local: a lo sumo un GET por lista distinta
+        schemas = await custom_field_registry.get_schemas(
+            (item.list_id for item in items if item.custom_fields), clickup_client
+        )
+        
+        async def push(task_data: TaskCreate) -> tuple:
+            """Devuelve (respuesta de ClickUp, None) o (None, error)"""
+            payload = _clickup_create_payload(task_data)
+            schema = schemas.get(str(task_data.list_id))
+            custom_fields = schema.to_clickup_payload(task_data.custom_fields) if schema else []
+            async with semaphore:
+                try:
+                    await sync_service.rate_limiter.acquire()
+                    clickup_response = await _create_clickup_task(task_data.list_id, payload, custom_fields)
+                except Exception as e:
+                    return None, str(e)
+            if not clickup_response or not clickup_response.get("id"):
+                return None, "Respuesta de ClickUp sin ID de tarea"
+            return clickup_response, None
+        
+        outcomes = await asyncio.gather(*[push(task_data) for task_data in items])
+        
+        # Insertar todas las filas creadas en una sola transacción
+        now = datetime.utcnow()
+        rows = {}
+        for task_data, (clickup_response, error) in zip(items, outcomes):
+            if error is None:
+                values = _created_task_values(task_data, clickup_response, now)
+                rows[values["clickup_id"]] = values
+        # Un webhook `taskCreated` puede haber guardado ya la tarea: esas filas no se insertan
+        inserted = []
+        for attempt in range(2):
+            existing = set()
+            if rows:
+                existing = {
+                    clickup_id for (clickup_id,) in
+                    db.query(Task.clickup_id).filter(Task.clickup_id.in_(list(rows))).all()
+                }
+            inserted = [values for clickup_id, values in rows.items() if clickup_id not in existing]
+            try:
+                if inserted:
+                    db.bulk_insert_mappings(Task, inserted)
+                    # bulk_insert_mappings no pasa por los eventos del ORM
+                    mark_changed(db, {values["workspace_id"] for values in inserted})
+                    sync_task_attributes(db, inserted)
+                    record_task_events(db, "created", inserted)
+                db.commit()
+                break
+            except IntegrityError:
+                # El webhook llegó entre la consulta y el insert: se vuelve a consultar
+                db.rollback()
+                if attempt:
+                    raise
+        
+        created = {}
+        if rows:
+            created = {t.clickup_id: t for t in db.query(Task).filter(Task.clickup_id.in_(list(rows))).all()}
+        
+        results = []
+        for index, (clickup_response, error) in enumerate(outcomes):
+            if error is None:
+                clickup_id = str(clickup_response["id"])
+                results.append(TaskBatchCreateItem(
+                    index=index,
+                    success=True,
+                    clickup_id=clickup_id,
+                    task=_task_response(created[clickup_id]) if clickup_id in created else None
+                ))
+            else:
+                results.append(TaskBatchCreateItem(index=index, success=False, error=error))
+        
+        # Un único resumen en lugar de una notificación por tarea (las del webhook ya se notificaron)
+        inserted_ids = {values["clickup_id"] for values in inserted}
+        _notify_task_update(db, [t for t in created.values() if t.clickup_id in inserted_ids], action="created")
+        
+        succeeded = sum(1 for item in results if item.success)
+        return TaskBatchCreateResponse(
+            created=succeeded,
+            failed=len(results) - succeeded,
+            results=results
+        )
+        
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error en creación por lotes: {str(e)}"
+        )
+
 @router.delete("/bulk-delete", status_code=http_status.HTTP_204_NO_CONTENT)
 async def bulk_delete_tasks(
     bulk_data: TaskBulkDelete,
@@ -1279,15 +1530,15 @@ async def sync_all_tasks(
                                 synced_tasks.append(TaskResponse.model_validate(db_task))
                                 
                             except Exception as task_error:
-                                print(f"Error procesando tarea {task['id']}: {task_error}")
+                                tasks_logger.error(f"Error procesando tarea {task['id']}: {task_error}")
                                 continue
                             
                     except Exception as e:
-                        print(f"Error sincronizando lista {list_item['id']}: {e}")
+                        tasks_logger.error(f"Error sincronizando lista {list_item['id']}: {e}")
                         continue
                         
             except Exception as e:
-                print(f"Error sincronizando space {space['id']}: {e}")
+                tasks_logger.error(f"Error sincronizando space {space['id']}: {e}")
                 continue
         
         # Eliminar tareas que ya no existen en ClickUp
@@ -1298,7 +1549,7 @@ async def sync_all_tasks(
             ).all()
             
             for task_to_delete in tasks_to_delete:
-                print(f"🗑️ Eliminando tarea local que ya no existe en ClickUp: {task_to_delete.clickup_id}")
+                tasks_logger.info(f"🗑️ Eliminando tarea local que ya no existe en ClickUp: {task_to_delete.clickup_id}")
                 db.delete(task_to_delete)
         
         db.commit()
@@ -1310,3 +1561,77 @@ async def sync_all_tasks(
             status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al sincronizar las tareas: {str(e)}"
         )
+
+@router.post("/sync-workspaces")
+async def sync_all_workspaces(
+    workspace_ids: Optional[List[str]] = Query(None, description="IDs de workspaces (por defecto todos)")
+):
+    """Sincronizar varios workspaces en paralelo con reparto justo del rate limit"""
+    try:
+        from core.sync_orchestrator import sync_orchestrator
+        
+        result = await sync_orchestrator.sync_workspaces(workspace_ids)
+        return result.to_dict()
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al sincronizar los workspaces: {str(e)}"
+        )
+
+@router.post("/sync-dry-run")
+async def sync_dry_run(
+    workspace_id: str = Query(..., description="ID del workspace"),
+    sample_size: int = Query(20, ge=0, le=500, description="Tareas con diff por campo"),
+):
+    """Reportar qué crearía, actualizaría o eliminaría una sincronización, sin escribir"""
+    try:
+        from core.advanced_sync import sync_service
+        
+        result = await sync_service.dry_run_workspace(workspace_id, sample_size=sample_size)
+        return result.to_dict()
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error en el dry-run de sincronización: {str(e)}"
+        )
+
+@router.post("/archive")
+async def archive_tasks(
+    older_than_days: Optional[int] = Query(None, ge=0, description="Días desde el cierre (por defecto TASK_ARCHIVE_AFTER_DAYS)"),
+    batch_size: Optional[int] = Query(None, ge=1, le=10000, description="Tareas por lote"),
+    db: Session = Depends(get_db)
+):
+    """Mover tareas cerradas antiguas al archivo (tasks_archive) y compactar el registro de cambios"""
+    try:
+        from core.task_change_log import compact_change_log
+        
+        result = archive_closed_tasks(db, older_than_days=older_than_days, batch_size=batch_size)
+        # Mantenimiento del registro de cambios en el mismo trabajo periódico
+        result["change_log"] = compact_change_log(db)
+        return result
+        
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al archivar tareas: {str(e)}"
+        )
+
+@router.post("/reconcile")
+async def reconcile_workspace(
+    workspace_id: str = Query(..., description="ID del workspace")
+):
+    """Reconciliar un workspace saltando las listas cuyo digest no pudo cambiar"""
+    try:
+        from core.advanced_sync import sync_service
+        
+        result = await sync_service.reconcile_workspace(workspace_id)
+        return result.to_dict()
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error en la reconciliación: {str(e)}"
+        )
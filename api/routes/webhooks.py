@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 from core.config import settings
 from core.database import get_db
 from models.task import Task
+from core.task_archive import discard_archived
 from utils.advanced_notifications import notification_service
 from utils.notifications import extract_contacts_from_custom_fields
 
@@ -103,6 +104,9 @@ class WebhookProcessor:
                     db.delete(local_task)
                     db.commit()
                     webhook_logger.info(f"✅ Tarea {task_id} eliminada desde webhook")
+                else:
+                    discard_archived(db, [task_id])
+                    db.commit()
             
             elif event_type in ["taskStatusUpdated", "taskPriorityUpdated", "taskAssigneeUpdated"]:
                 if local_task:
@@ -145,6 +149,8 @@ class WebhookProcessor:
             last_sync=datetime.now()
         )
         
+        # Si la tarea estaba archivada, vuelve al tier caliente
+        discard_archived(db, [task.clickup_id])
         db.add(task)
         db.commit()
         db.refresh(task)
@@ -226,7 +232,7 @@ class WebhookProcessor:
                 
                 # Extraer contactos adicionales desde custom fields
                 if task.custom_fields:
-                    extra_emails, extra_telegrams, _ = extract_contacts_from_custom_fields(task.custom_fields)
+                    extra_emails, extra_telegrams, _ = extract_contacts_from_custom_fields(task.custom_fields, task.list_id)
                     recipient_emails.extend(extra_emails)
                     recipient_telegrams.extend(extra_telegrams)
                 
@@ -318,7 +324,12 @@ async def clickup_webhook(
         
         elif event_type in ["listCreated", "listUpdated", "listDeleted"]:
             webhook_logger.info(f"📋 Evento de lista: {event_type}")
-            # Aquí podrías procesar eventos de listas si es necesario
+            # Los custom fields de la lista pueden haber cambiado: descartar su esquema local
+            list_id = data.get("list_id") or (data.get("list") or {}).get("id")
+            if list_id and event_type != "listCreated":
+                from core.custom_field_registry import custom_field_registry
+                custom_field_registry.invalidate(list_id)
+                webhook_logger.info(f"🔄 Esquema de custom fields invalidado para la lista {list_id}")
         
         elif event_type == "ping":
             webhook_logger.info("🏓 Ping recibido de ClickUp")
@@ -376,7 +387,3 @@ async def test_notification(background_tasks: BackgroundTasks):
         "timestamp": datetime.now().isoformat()
     }
 
-
-# Configurar logging para webhooks
-logging.basicConfig(level=logging.INFO)
-webhook_logger.setLevel(logging.INFO)
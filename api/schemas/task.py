@@ -99,6 +99,7 @@ class TaskResponse(BaseModel):
     comments: Optional[List[Dict[str, Any]]] = None
     is_synced: bool
     last_sync: Optional[datetime] = None
+    highlight: Optional[Dict[str, Optional[str]]] = Field(None, description="Coincidencias resaltadas (solo con `search`)")
     
     class Config:
         from_attributes = True
@@ -108,10 +109,11 @@ class TaskResponse(BaseModel):
 class TaskList(BaseModel):
     """Esquema para lista de tareas"""
     tasks: List[TaskResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None
 
 class TaskFilter(BaseModel):
     """Esquema para filtros de tareas"""
@@ -131,6 +133,47 @@ class TaskBulkUpdate(BaseModel):
     task_ids: List[str] = Field(..., min_items=1, description="IDs de las tareas a actualizar")
     updates: TaskUpdate = Field(..., description="Actualizaciones a aplicar")
 
+class TaskBulkUpdateItem(BaseModel):
+    """Resultado de una tarea en una actualización masiva"""
+    task_id: str
+    success: bool
+    error: Optional[str] = None
+    task: Optional[TaskResponse] = None
+
+class TaskBulkUpdateResponse(BaseModel):
+    """Respuesta de actualización masiva con resultado por tarea"""
+    updated: int
+    failed: int
+    results: List[TaskBulkUpdateItem]
+
+class TaskBatchCreate(BaseModel):
+    """Esquema para creación de varias tareas en una sola petición"""
+    items: List[TaskCreate] = Field(..., min_items=1, description="Tareas a crear")
+
+class TaskBatchCreateItem(BaseModel):
+    """Resultado de una tarea en una creación por lotes (índice en `items`)"""
+    index: int
+    success: bool
+    clickup_id: Optional[str] = None
+    error: Optional[str] = None
+    task: Optional[TaskResponse] = None
+
+class TaskBatchCreateResponse(BaseModel):
+    """Respuesta de creación por lotes con resultado por tarea"""
+    created: int
+    failed: int
+    results: List[TaskBatchCreateItem]
+
+class TaskBatchGet(BaseModel):
+    """Esquema para obtener varias tareas por ID de ClickUp en una sola petición"""
+    task_ids: List[str] = Field(..., min_items=1, description="IDs de ClickUp de las tareas")
+    fetch_missing: bool = Field(False, description="Pedir a ClickUp las tareas que no están en la BD local")
+
+class TaskBatchGetResponse(BaseModel):
+    """Tareas en el orden de `task_ids` e IDs no encontrados"""
+    tasks: List[TaskResponse]
+    missing: List[str]
+
 class TaskBulkDelete(BaseModel):
     """Esquema para eliminación masiva de tareas"""
     task_ids: List[str] = Field(..., min_items=1, description="IDs de las tareas a eliminar")
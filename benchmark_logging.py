@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark de latencia de GET /api/v1/tasks antes/después del logging por cola.
+
+- antes: print() síncrono de 3 líneas por tarea (lo que hacía get_tasks) y
+  logging directo a la salida en el event loop
+- después: registros al QueueHandler (escritura en otro hilo), líneas por
+  tarea muestreadas y con ID de petición
+
+La salida va a un archivo; `--sink-latency-ms` simula una salida lenta
+(pipe del contenedor, colector de logs) con una espera por escritura.
+
+Uso:
+    python benchmark_logging.py [--tasks 2000] [--limit 100] [--requests 50] [--sink-latency-ms 0.2]
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "benchmark_logging.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+os.environ.setdefault("LOG_LEVEL", "DEBUG")
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from api.routes import tasks
+from core.database import SessionLocal, init_db
+from core.logging_config import SAMPLED, request_id_var, setup_logging, stop_logging
+from models.task import Task
+
+item_logger = logging.getLogger("tasks")
+ORIGINAL_ROW_TO_DICT = tasks.task_row_to_dict
+
+
+class SlowSink:
+    """Archivo con una espera opcional por escritura"""
+
+    def __init__(self, path: str, latency_ms: float):
+        self.file = open(path, "w", encoding="utf-8")
+        self.latency = latency_ms / 1000
+        self.lines = 0
+
+    def write(self, data: str) -> int:
+        if self.latency:
+            time.sleep(self.latency)
+        self.lines += data.count("\n")
+        return self.file.write(data)
+
+    def flush(self):
+        self.file.flush()
+
+
+def seed(total: int):
+    db = SessionLocal()
+    try:
+        for i in range(total):
+            db.add(Task(
+                clickup_id=f"task-{i}",
+                name=f"Tarea de benchmark {i}",
+                description="Descripción de ejemplo",
+                status="open",
+                priority=(i % 4) + 1,
+                workspace_id="ws-1",
+                list_id=f"list-{i % 7}",
+                is_synced=1,
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def build_app(per_task_log) -> FastAPI:
+    """App con la ruta de tareas y el middleware de request id; `per_task_log` se llama por tarea"""
+    def row_to_dict(row):
+        data = ORIGINAL_ROW_TO_DICT(row)
+        if data is not None:
+            per_task_log(data)
+        return data
+
+    tasks.task_row_to_dict = row_to_dict
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def request_context(request: Request, call_next):
+        token = request_id_var.set(request.headers.get("X-Request-ID") or "bench")
+        try:
+            response = await call_next(request)
+            logging.getLogger("http").info(f"{request.method} {request.url.path} {response.status_code}")
+            return response
+        finally:
+            request_id_var.reset(token)
+
+    app.include_router(tasks.router, prefix="/api/v1/tasks")
+    return app
+
+
+def measure(client: TestClient, limit: int, requests: int) -> tuple:
+    latencies = []
+    for i in range(requests + 1):
+        start = time.perf_counter()
+        response = client.get("/api/v1/tasks/", params={"limit": limit, "page": i % 5})
+        elapsed = (time.perf_counter() - start) * 1000
+        assert response.status_code == 200, response.text
+        if i:  # la primera petición calienta cachés
+            latencies.append(elapsed)
+    return statistics.median(latencies), statistics.quantiles(latencies, n=20)[18]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de logging en GET /tasks")
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--sink-latency-ms", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        asyncio.run(init_db())
+    seed(args.tasks)
+    out_dir = tempfile.mkdtemp()
+
+    # Antes: print() por tarea y logging directo a la salida
+    sink = SlowSink(os.path.join(out_dir, "before.log"), args.sink_latency_ms)
+    root = logging.getLogger()
+    direct = logging.StreamHandler(sink)
+    root.addHandler(direct)
+    root.setLevel(logging.DEBUG)
+
+    def print_per_task(data):
+        print(f"Tarea: {data['clickup_id']} - {data['name']}", file=sink)
+        print(f"  assignee_id: {data['assignee_id']}", file=sink)
+        print(f"  status: {data['status']}, priority: {data['priority']}", file=sink)
+
+    client = TestClient(build_app(print_per_task))
+    before = measure(client, args.limit, args.requests)
+    before_lines = sink.lines
+    root.removeHandler(direct)
+
+    # Después: cola + hilo de escritura, líneas por tarea a DEBUG con muestreo
+    sink = SlowSink(os.path.join(out_dir, "after.log"), args.sink_latency_ms)
+    setup_logging(stream=sink)
+
+    def log_per_task(data):
+        item_logger.debug("Tarea: %s - %s", data["clickup_id"], data["name"], extra=SAMPLED)
+        item_logger.debug("  assignee_id: %s", data["assignee_id"], extra=SAMPLED)
+        item_logger.debug("  status: %s, priority: %s", data["status"], data["priority"], extra=SAMPLED)
+
+    client = TestClient(build_app(log_per_task))
+    after = measure(client, args.limit, args.requests)
+    stop_logging()
+    after_lines = sink.lines
+
+    print(f"GET /api/v1/tasks?limit={args.limit} ({args.requests} peticiones, salida con {args.sink_latency_ms} ms por escritura)")
+    print(f"  antes   (print síncrono):      p50 {before[0]:8.2f} ms   p95 {before[1]:8.2f} ms   {before_lines} líneas")
+    print(f"  después (cola + muestreo):     p50 {after[0]:8.2f} ms   p95 {after[1]:8.2f} ms   {after_lines} líneas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark de GET /api/v1/tasks/changes: costo de un poll frente al tamaño de la BD.
+
+La base crece hasta cada tamaño (tareas más su entrada `created` en
+`task_changes`); después se modifican unas pocas tareas y se mide el poll
+desde el cursor anterior a esos cambios y, como referencia, releer todas las
+tareas (lo que hacía el extractor sin registro de cambios).
+
+Uso:
+    python benchmark_task_changes.py [--sizes 10000,50000,200000] [--changes 50] [--runs 20]
+"""
+
+import argparse
+import contextlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "benchmark_changes.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ["TASK_CHANGE_LOG_SETTLE_SECONDS"] = "0"
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import main as app_main
+from core.database import SessionLocal, engine, init_db
+from models.task import Task
+from models.task_change import TaskChange
+
+
+def grow(current: int, size: int):
+    """Agregar tareas (y su entrada `created`) hasta llegar a `size`"""
+    old = datetime.now() - timedelta(hours=1)
+    with engine.begin() as conn:
+        for start in range(current, size, 20000):
+            ids = range(start, min(size, start + 20000))
+            conn.execute(Task.__table__.insert(), [{
+                "clickup_id": f"task-{i}", "name": f"Tarea {i}", "description": "", "status": "open",
+                "priority": 3, "workspace_id": f"ws-{i % 10}", "list_id": f"list-{i % 100}",
+                "tags": [], "custom_fields": {}, "is_synced": 1, "last_sync": old,
+            } for i in ids])
+            conn.execute(TaskChange.__table__.insert(), [{
+                "task_id": f"task-{i}", "workspace_id": f"ws-{i % 10}", "change_type": "created",
+                "changes": {"name": f"Tarea {i}", "status": "open"}, "changed_at": old,
+            } for i in ids])
+
+
+def timed(func, runs: int) -> tuple:
+    func()
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies), statistics.quantiles(latencies, n=20)[18]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de GET /tasks/changes")
+    parser.add_argument("--sizes", default="10000,50000,200000")
+    parser.add_argument("--changes", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        asyncio.run(init_db())
+    client = TestClient(app_main.app)
+    current = 0
+
+    print(f"{'tareas':>8} {'poll /changes p50/p95 (ms)':>28} {'relectura completa (ms)':>26}")
+    for size in [int(value) for value in args.sizes.split(",")]:
+        grow(current, size)
+        current = size
+        cursor = client.get("/api/v1/tasks/changes").json()["cursor"]
+        db = SessionLocal()
+        for task in db.query(Task).filter(Task.clickup_id.in_([f"task-{i}" for i in range(args.changes)])):
+            task.priority = (task.priority % 4) + 1
+        db.commit()
+        db.close()
+
+        def poll():
+            data = client.get("/api/v1/tasks/changes", params={"since": cursor}).json()
+            assert len(data["changes"]) == args.changes, data
+
+        def full_reload():
+            page = client.get("/api/v1/tasks/", params={"include_closed": "true", "count": "none", "limit": 100}).json()
+            while page.get("has_more"):
+                page = client.get("/api/v1/tasks/", params={
+                    "include_closed": "true", "count": "none", "limit": 100, "cursor": page["next_cursor"]
+                }).json()
+
+        poll_stats = timed(poll, args.runs)
+        start = time.perf_counter()
+        full_reload()
+        reload_ms = (time.perf_counter() - start) * 1000
+        print(f"{size:>8} {poll_stats[0]:>15.2f} /{poll_stats[1]:>9.2f}   {reload_ms:>26.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark de GET /api/v1/tasks con fieldsets dispersos:
+tamaño del payload y latencia p95 a limit=100 para respuesta completa vs `summary`.
+
+Uso:
+    python benchmark_task_fields.py [--tasks 2000] [--requests 50]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "benchmark_fields.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes import tasks
+from core.database import SessionLocal, init_db
+from models.task import Task
+from models.user import User
+
+
+def seed(total: int):
+    db = SessionLocal()
+    try:
+        for i in range(total):
+            if i % 10 == 0:
+                db.add(User(clickup_id=f"user-{i // 10}", username=f"usuario{i // 10}"))
+            db.add(Task(
+                clickup_id=f"task-{i}",
+                name=f"Tarea de benchmark {i}",
+                description="Descripción de ejemplo " * 20,
+                status="open",
+                priority=(i % 4) + 1,
+                workspace_id="ws-1",
+                list_id=f"list-{i % 7}",
+                assignee_id=f"user-{i // 10}",
+                tags=["backend", "benchmark"],
+                custom_fields=[{"id": f"cf-{n}", "name": f"Campo {n}", "value": "x" * 40} for n in range(5)]
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def measure(client: TestClient, params: dict, requests: int) -> tuple:
+    latencies = []
+    size = 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            response = client.get("/api/v1/tasks/", params=params)
+        latencies.append((time.perf_counter() - start) * 1000)
+        size = len(response.content)
+    p95 = statistics.quantiles(latencies, n=20)[18]
+    return size, p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de fieldsets dispersos")
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(init_db())
+    seed(args.tasks)
+
+    app = FastAPI()
+    app.include_router(tasks.router, prefix="/api/v1/tasks")
+    client = TestClient(app)
+
+    print(f"📊 GET /api/v1/tasks limit=100 ({args.tasks} tareas, {args.requests} peticiones)")
+    print("=" * 50)
+    for label, params in (
+        ("full", {"limit": 100}),
+        ("summary", {"limit": 100, "fields": "summary"}),
+        ("id,name,status", {"limit": 100, "fields": "id,name,status"}),
+    ):
+        size, p95 = measure(client, params, args.requests)
+        print(f"{label:>16}: {size / 1024:8.1f} KB  p95 {p95:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
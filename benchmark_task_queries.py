@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark de las consultas calientes de tareas (tasks, dashboard y reports):
+plan de ejecución y latencia p50/p95 con y sin los índices compuestos y parciales.
+
+Uso:
+    python benchmark_task_queries.py [--tasks 500000] [--runs 20]
+
+Con DATABASE_URL definido usa esa base (p. ej. PostgreSQL); si no, un SQLite temporal.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+if not os.getenv("DATABASE_URL"):
+    DB_FILE = os.path.join(tempfile.mkdtemp(), "benchmark_queries.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+
+from sqlalchemy import and_, func
+
+from core.database import SessionLocal, engine, init_db
+from models.task import Task, task_indexes
+
+WORKSPACES = [f"ws-{n}" for n in range(20)]
+ASSIGNEES = [f"user-{n}" for n in range(500)]
+STATUSES = ["to do", "in progress", "review", "blocked", "complete"]
+STATUS_WEIGHTS = [30, 15, 10, 5, 40]
+SEED_BATCH = 20000
+
+
+def seed(total: int):
+    """Insertar tareas en lotes (executemany), sin pasar por el ORM"""
+    rng = random.Random(42)
+    now = datetime.now()
+    insert = Task.__table__.insert()
+    with engine.begin() as conn:
+        batch = []
+        for i in range(total):
+            batch.append({
+                "clickup_id": f"bench-{i}",
+                "name": f"Tarea {i}",
+                "description": "",
+                # ~40% completas, como un workspace con historial
+                "status": rng.choices(STATUSES, weights=STATUS_WEIGHTS)[0],
+                "priority": rng.randint(1, 4),
+                "due_date": now + timedelta(days=rng.randint(-60, 60)) if i % 3 else None,
+                "workspace_id": rng.choice(WORKSPACES),
+                "list_id": f"list-{i % 300}",
+                "assignee_id": rng.choice(ASSIGNEES) if i % 5 else None,
+                "tags": [],
+                "custom_fields": {},
+                "is_synced": 1,
+                "last_sync": now - timedelta(hours=rng.randint(0, 24 * 30)),
+            })
+            if len(batch) >= SEED_BATCH:
+                conn.execute(insert, batch)
+                batch = []
+        if batch:
+            conn.execute(insert, batch)
+
+
+def hot_queries(db):
+    """Consultas como las emiten las rutas (nombre, consulta ORM, ejecución)"""
+    now = datetime.now()
+    since = now - timedelta(hours=24)
+    workspace, assignee = WORKSPACES[3], ASSIGNEES[7]
+    open_tasks = Task.status != "complete"
+    return [
+        ("tasks: listado por workspace",
+         db.query(Task).filter(Task.workspace_id == workspace, open_tasks).order_by(Task.id).limit(50), "all"),
+        ("tasks: workspace + estado",
+         db.query(Task).filter(Task.workspace_id == workspace, Task.status == "in progress", open_tasks).order_by(Task.id).limit(50), "all"),
+        ("tasks: asignado + estado",
+         db.query(Task).filter(Task.assignee_id == assignee, Task.status == "to do", open_tasks).order_by(Task.id).limit(50), "all"),
+        ("tasks: prioridad",
+         db.query(Task).filter(Task.priority == 1, open_tasks).order_by(Task.id).limit(50), "all"),
+        ("tasks: total del workspace",
+         db.query(Task).filter(Task.workspace_id == workspace, open_tasks), "count"),
+        ("dashboard: recientes (last_sync >= desde)",
+         db.query(Task).filter(Task.last_sync >= since), "count"),
+        ("dashboard: por estado",
+         db.query(Task.status, func.count().label("count")).group_by(Task.status), "all"),
+        ("dashboard: por prioridad",
+         db.query(Task.priority, func.count().label("count")).group_by(Task.priority), "all"),
+        ("dashboard: vencidas",
+         db.query(Task).filter(and_(Task.due_date < now, Task.status != "complete")), "count"),
+        ("reports: tareas de un usuario",
+         db.query(Task).filter(Task.workspace_id == workspace, Task.assignee_id == assignee), "all"),
+        ("reports: estados del workspace",
+         db.query(Task.status, func.count(Task.id)).filter(Task.workspace_id == workspace).group_by(Task.status), "all"),
+        ("reports: prioridades del workspace",
+         db.query(Task.priority, func.count(Task.id)).filter(Task.workspace_id == workspace).group_by(Task.priority), "all"),
+    ]
+
+
+def explain(db, query) -> str:
+    """Plan de ejecución de la consulta con sus parámetros reales"""
+    compiled = query.statement.compile(dialect=engine.dialect)
+    sql = str(compiled)
+    if engine.dialect.name == "sqlite":
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+        rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        return "\n".join(f"      {row[-1]}" for row in rows)
+    rows = db.connection().exec_driver_sql(f"EXPLAIN {sql}", compiled.params).fetchall()
+    return "\n".join(f"      {row[0]}" for row in rows)
+
+
+def measure(query, mode: str, runs: int) -> tuple:
+    latencies = []
+    # Primera ejecución fuera de la medición (caché de páginas y de sentencias)
+    query.count() if mode == "count" else query.all()
+    for _ in range(runs):
+        start = time.perf_counter()
+        query.count() if mode == "count" else query.all()
+        latencies.append((time.perf_counter() - start) * 1000)
+    p95 = statistics.quantiles(latencies, n=20)[18] if runs > 1 else latencies[0]
+    return statistics.median(latencies), p95
+
+
+def run_all(runs: int, show_plans: bool) -> dict:
+    db = SessionLocal()
+    try:
+        results = {}
+        for name, query, mode in hot_queries(db):
+            results[name] = measure(query, mode, runs)
+            if show_plans:
+                print(f"\n  {name}  (p50 {results[name][0]:.2f} ms, p95 {results[name][1]:.2f} ms)")
+                print(explain(db, query))
+        return results
+    finally:
+        db.close()
+
+
+def new_indexes():
+    return [index for index in Task.__table__.indexes if index.name in {i.name for i in task_indexes("tasks")}]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de índices de las consultas de tareas")
+    parser.add_argument("--tasks", type=int, default=500000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(init_db())
+    print(f"🌱 Insertando {args.tasks} tareas...")
+    start = time.perf_counter()
+    seed(args.tasks)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    print(f"   listo en {time.perf_counter() - start:.1f} s")
+
+    print("\n📋 Planes y latencia con los índices:")
+    with_indexes = run_all(args.runs, show_plans=True)
+
+    indexes = new_indexes()
+    for index in indexes:
+        index.drop(bind=engine)
+    # Conexiones nuevas: sin planes preparados con el esquema anterior
+    engine.dispose()
+    try:
+        print("\n📋 Planes y latencia sin los índices:")
+        without_indexes = run_all(args.runs, show_plans=True)
+    finally:
+        for index in indexes:
+            index.create(bind=engine, checkfirst=True)
+        engine.dispose()
+
+    print(f"\n{'consulta':<45} {'sin índices p50/p95 (ms)':>26} {'con índices p50/p95 (ms)':>26}")
+    for name, (p50, p95) in with_indexes.items():
+        before = without_indexes[name]
+        print(f"{name:<45} {before[0]:>12.2f} /{before[1]:>10.2f}   {p50:>12.2f} /{p95:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialización de una página de tareas (limit=100):
+ruta Pydantic (model_validate + jsonable_encoder + json) vs fast path (tuplas + orjson).
+
+Uso:
+    python benchmark_task_serialization.py [--rows 100] [--rounds 200]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "benchmark_serialization.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from api.schemas.task import TaskResponse
+from core.database import SessionLocal, init_db
+from core.task_serialization import FastJSONResponse, response_columns, task_row_to_dict
+from models.task import Task
+
+
+def seed(db, total: int):
+    for i in range(total):
+        db.add(Task(
+            clickup_id=f"task-{i}",
+            name=f"Tarea {i}",
+            description="Descripción de ejemplo " * 10,
+            status="open",
+            priority=(i % 4) + 1,
+            due_date=datetime(2025, 1, 1) + timedelta(hours=i),
+            workspace_id="ws-1",
+            list_id="list-1",
+            assignee_id=str(i % 10),
+            tags=["backend"],
+            custom_fields=[{"id": f"cf-{n}", "value": n} for n in range(5)],
+            last_sync=datetime.now()
+        ))
+    db.commit()
+
+
+def timed(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de tareas")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(init_db())
+    db = SessionLocal()
+    try:
+        seed(db, args.rows)
+        tasks = db.query(Task).all()
+        rows = db.query(Task).with_entities(*response_columns(Task)).all()
+    finally:
+        db.close()
+
+    def pydantic_path():
+        responses = [TaskResponse.model_validate(task) for task in tasks]
+        return JSONResponse(content=jsonable_encoder({"tasks": responses})).body
+
+    def fast_path():
+        return FastJSONResponse(content={"tasks": [task_row_to_dict(row) for row in rows]}).body
+
+    pydantic_ms = timed(pydantic_path, args.rounds)
+    fast_ms = timed(fast_path, args.rounds)
+
+    print(f"📊 Serialización de {args.rows} tareas ({args.rounds} rondas)")
+    print("=" * 50)
+    print(f"   Pydantic + jsonable_encoder: {pydantic_ms:7.3f} ms/página")
+    print(f"   Tuplas + orjson:             {fast_ms:7.3f} ms/página")
+    print(f"   Mejora: x{pydantic_ms / fast_ms:.1f}")
+
+
+if __name__ == "__main__":
+    main()
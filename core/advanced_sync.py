@@ -18,6 +18,13 @@ from sqlalchemy.orm import Session
 
 from core.clickup_client import ClickUpClient
 from core.database import get_db
+from core.task_ingest import HASHED_FIELDS, custom_field_values, list_digest, normalize_clickup_task, task_content_hash
+from core.task_archive import discard_archived, task_source
+from core.task_attributes import delete_task_attributes
+from core.task_change_log import compact_change_log_if_due
+from core.task_events import record_task_events
+from models.list_digest import ListDigest
+from models.sync_watermark import SyncWatermark
 from models.task import Task
 from models.workspace import Workspace
 
@@ -41,6 +48,14 @@ class SyncResult:
         return asdict(self)
 
 
+@dataclass
+class ReconcileResult(SyncResult):
+    """Resultado de reconciliación por digests de lista"""
+    lists_total: int = 0
+    lists_skipped: int = 0
+    skip_ratio: float = 0.0
+
+
 @dataclass
 class TaskChange:
     """Representa un cambio en una tarea"""
@@ -51,6 +66,32 @@ class TaskChange:
     source: str  # clickup, local
 
 
+@dataclass
+class DryRunResult:
+    """Resultado de una sincronización en modo dry-run (sin escrituras)"""
+    workspace_id: str
+    success: bool
+    remote_tasks: int
+    to_create: List[str]
+    to_update: List[str]
+    to_delete: List[str]
+    unchanged: int
+    field_diffs: Dict[str, Dict[str, Any]]
+    errors: List[str]
+    duration: float
+    timestamp: datetime
+    
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["summary"] = {
+            "creates": len(self.to_create),
+            "updates": len(self.to_update),
+            "deletes": len(self.to_delete),
+            "unchanged": self.unchanged
+        }
+        return data
+
+
 class TaskCache:
     """Cache inteligente para tareas"""
     
@@ -181,8 +222,55 @@ class AdvancedSyncService:
         self.max_retries = 3
         self.retry_delay = 2
     
-    async def full_sync_workspace(self, workspace_id: str) -> SyncResult:
-        """Sincronización completa de un workspace"""
+    async def _acquire(self, workspace_id: str, scheduler: Optional[Any] = None):
+        """Adquirir permiso de request, vía el scheduler compartido si existe"""
+        if scheduler is not None:
+            await scheduler.acquire(workspace_id)
+        else:
+            await self.rate_limiter.acquire()
+    
+    async def _fetch_workspace_tasks(
+        self,
+        workspace_id: str,
+        scheduler: Optional[Any] = None,
+        max_concurrency: int = 1
+    ) -> List[Dict]:
+        """Obtener todas las tareas de un workspace (spaces -> listas -> tareas)"""
+        await self._acquire(workspace_id, scheduler)
+        spaces = await self.clickup_client.get_spaces(workspace_id)
+        
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def fetch_lists(space_id: str) -> List[Dict]:
+            async with semaphore:
+                await self._acquire(workspace_id, scheduler)
+                return await self.clickup_client.get_lists(space_id)
+        
+        async def fetch_tasks(list_id: str) -> List[Dict]:
+            async with semaphore:
+                await self._acquire(workspace_id, scheduler)
+                return await self.clickup_client.get_tasks(list_id)
+        
+        space_lists = await asyncio.gather(*[fetch_lists(space["id"]) for space in spaces])
+        list_ids = [list_data["id"] for lists in space_lists for list_data in lists]
+        
+        all_tasks = []
+        for tasks in await asyncio.gather(*[fetch_tasks(list_id) for list_id in list_ids]):
+            all_tasks.extend(tasks)
+        return all_tasks
+    
+    async def full_sync_workspace(
+        self,
+        workspace_id: str,
+        scheduler: Optional[Any] = None,
+        max_concurrency: int = 1
+    ) -> SyncResult:
+        """Sincronización completa de un workspace.
+        
+        `scheduler` permite compartir el presupuesto de rate limit entre varios
+        workspaces (ver core.sync_orchestrator); `max_concurrency` limita las
+        peticiones simultáneas de este workspace.
+        """
         start_time = datetime.now()
         result = SyncResult(
             success=False,
@@ -198,17 +286,8 @@ class AdvancedSyncService:
         try:
             sync_logger.info(f"🔄 Iniciando sincronización completa del workspace {workspace_id}")
             
-            # Obtener todas las listas del workspace
-            await self.rate_limiter.acquire()
-            spaces = await self.clickup_client.get_spaces(workspace_id)
-            
-            all_tasks = []
-            for space in spaces:
-                lists = await self.clickup_client.get_lists(space["id"])
-                for list_data in lists:
-                    await self.rate_limiter.acquire()
-                    tasks = await self.clickup_client.get_tasks(list_data["id"])
-                    all_tasks.extend(tasks)
+            # Obtener todas las tareas del workspace
+            all_tasks = await self._fetch_workspace_tasks(workspace_id, scheduler, max_concurrency)
             
             # Procesar tareas en lotes
             for i in range(0, len(all_tasks), self.batch_size):
@@ -233,6 +312,7 @@ class AdvancedSyncService:
         
         result.duration = (datetime.now() - start_time).total_seconds()
         self._add_to_history(result)
+        self._compact_change_log()
         
         sync_logger.info(f"✅ Sincronización completa terminada: {result.items_processed} procesadas, "
                         f"{result.items_created} creadas, {result.items_updated} actualizadas, "
@@ -240,11 +320,313 @@ class AdvancedSyncService:
         
         return result
     
+    async def dry_run_workspace(
+        self,
+        workspace_id: str,
+        sample_size: int = 20,
+        scheduler: Optional[Any] = None,
+        max_concurrency: int = 1
+    ) -> DryRunResult:
+        """Calcular lo que haría una sincronización completa sin escribir nada.
+        
+        Compara en bloque el hash de contenido de las tareas remotas con el
+        hash guardado en `tasks.content_hash` (una sola consulta de columnas,
+        sin cargar entidades ORM). Solo las tareas de la muestra se leen
+        completas para el diff por campo.
+        """
+        start_time = datetime.now()
+        result = DryRunResult(
+            workspace_id=workspace_id,
+            success=False,
+            remote_tasks=0,
+            to_create=[],
+            to_update=[],
+            to_delete=[],
+            unchanged=0,
+            field_diffs={},
+            errors=[],
+            duration=0,
+            timestamp=start_time
+        )
+        
+        try:
+            sync_logger.info(f"🔎 Dry-run de sincronización del workspace {workspace_id}")
+            remote_tasks = await self._fetch_workspace_tasks(workspace_id, scheduler, max_concurrency)
+            
+            remote: Dict[str, Dict[str, Any]] = {}
+            for task_data in remote_tasks:
+                try:
+                    values = normalize_clickup_task(task_data, workspace_id)
+                    remote[values["clickup_id"]] = values
+                except Exception as e:
+                    result.errors.append(f"Error normalizando tarea {task_data.get('id', 'unknown')}: {e}")
+            result.remote_tasks = len(remote)
+            
+            db = next(get_db())
+            try:
+                local_hashes = dict(
+                    db.query(Task.clickup_id, Task.content_hash)
+                    .filter(Task.workspace_id == workspace_id)
+                    .all()
+                )
+                
+                # Filas previas a content_hash (o editadas localmente): hash desde sus columnas;
+                # task_content_hash lleva los custom fields a la misma forma que los de ClickUp
+                missing = [task_id for task_id, task_hash in local_hashes.items() if not task_hash]
+                if missing:
+                    columns = [getattr(Task, field) for field in ("clickup_id",) + HASHED_FIELDS]
+                    for row in db.query(*columns).filter(Task.workspace_id == workspace_id, Task.content_hash.is_(None)):
+                        local_hashes[row.clickup_id] = task_content_hash(row._asdict())
+                
+                for task_id, values in remote.items():
+                    if task_id not in local_hashes:
+                        result.to_create.append(task_id)
+                    elif local_hashes[task_id] != task_content_hash(values):
+                        result.to_update.append(task_id)
+                    else:
+                        result.unchanged += 1
+                result.to_delete = [task_id for task_id in local_hashes if task_id not in remote]
+                
+                # Diff por campo solo para una muestra de las actualizaciones
+                sample_ids = result.to_update[:max(0, sample_size)]
+                if sample_ids:
+                    columns = [getattr(Task, field) for field in ("clickup_id",) + HASHED_FIELDS]
+                    for row in db.query(*columns).filter(Task.clickup_id.in_(sample_ids)):
+                        local_values = row._asdict()
+                        local_values["custom_fields"] = custom_field_values(local_values["custom_fields"])
+                        remote_values = remote[row.clickup_id]
+                        result.field_diffs[row.clickup_id] = {
+                            field: {"local": local_values.get(field), "remote": remote_values.get(field)}
+                            for field in HASHED_FIELDS
+                            if json.dumps(local_values.get(field), sort_keys=True, default=str)
+                            != json.dumps(remote_values.get(field), sort_keys=True, default=str)
+                        }
+            finally:
+                db.close()
+            
+            result.success = len(result.errors) == 0
+        
+        except Exception as e:
+            error_msg = f"Error en dry-run de sincronización: {e}"
+            sync_logger.error(error_msg)
+            result.errors.append(error_msg)
+        
+        result.duration = (datetime.now() - start_time).total_seconds()
+        sync_logger.info(f"🔎 Dry-run terminado: {len(result.to_create)} a crear, "
+                        f"{len(result.to_update)} a actualizar, {len(result.to_delete)} a eliminar "
+                        f"en {result.duration:.1f}s")
+        return result
+    
+    async def reconcile_workspace(
+        self,
+        workspace_id: str,
+        scheduler: Optional[Any] = None,
+        max_concurrency: int = 1
+    ) -> ReconcileResult:
+        """Reconciliación que solo desciende a las listas que pueden haber cambiado.
+        
+        Para cada lista se guarda un digest de los pares (task_id, date_updated)
+        local y remoto. Señales baratas para saltar una lista:
+        - `task_count` de la lista (ya viene en el listado de listas)
+        - una sola consulta a nivel workspace de tareas con `date_updated_gt`
+        Si el conteo no cambió, ninguna tarea de la lista se actualizó y el
+        digest local sigue igual que tras el último descenso, la lista no se
+        vuelve a pedir.
+        """
+        start_time = datetime.now()
+        result = ReconcileResult(
+            success=False,
+            items_processed=0,
+            items_created=0,
+            items_updated=0,
+            items_deleted=0,
+            errors=[],
+            duration=0,
+            timestamp=start_time
+        )
+        
+        try:
+            sync_logger.info(f"🌳 Reconciliación por digests del workspace {workspace_id}")
+            
+            # Listas del workspace (incluyen task_count)
+            await self._acquire(workspace_id, scheduler)
+            spaces = await self.clickup_client.get_spaces(workspace_id)
+            lists: List[Dict] = []
+            for space in spaces:
+                await self._acquire(workspace_id, scheduler)
+                lists.extend(await self.clickup_client.get_lists(space["id"]))
+            result.lists_total = len(lists)
+            
+            db = next(get_db())
+            try:
+                stored = {
+                    digest.list_id: digest
+                    for digest in db.query(ListDigest).filter(ListDigest.workspace_id == workspace_id)
+                }
+                local_digests = self._local_list_digests(db, workspace_id)
+            finally:
+                db.close()
+            
+            # Señal barata: tareas actualizadas desde el último chequeo, en todo el workspace.
+            # Cada reconciliación sella `last_checked` en todas las listas (también las
+            # saltadas), así que el mínimo es el chequeo anterior y no el de la lista más inactiva
+            checked_ms = {
+                list_id: int(d.last_checked.timestamp() * 1000)
+                for list_id, d in stored.items() if d.last_checked
+            }
+            changed_lists: Set[str] = set()
+            if stored and checked_ms:
+                since_ms = min(checked_ms.values())
+                page = 0
+                while True:
+                    await self._acquire(workspace_id, scheduler)
+                    response = await self.clickup_client.get_workspace_tasks(
+                        workspace_id, date_updated_gt=since_ms, include_closed=True, page=page
+                    )
+                    updated = response.get("tasks", [])
+                    for task_data in updated:
+                        list_id = str((task_data.get("list") or {}).get("id") or "")
+                        if not list_id:
+                            continue
+                        # Solo cuenta si es posterior al chequeo de su propia lista
+                        list_checked = checked_ms.get(list_id)
+                        try:
+                            updated_ms = int(task_data.get("date_updated"))
+                        except (TypeError, ValueError):
+                            updated_ms = None
+                        if list_checked is None or updated_ms is None or updated_ms > list_checked:
+                            changed_lists.add(list_id)
+                    if response.get("last_page", True) or not updated:
+                        break
+                    page += 1
+            
+            dirty_lists = []
+            for list_data in lists:
+                list_id = str(list_data["id"])
+                digest = stored.get(list_id)
+                if (
+                    digest is not None
+                    and list_data.get("task_count") is not None
+                    and digest.task_count == list_data.get("task_count")
+                    and list_id not in changed_lists
+                    and digest.local_digest == local_digests.get(list_id, list_digest([]))
+                ):
+                    continue
+                dirty_lists.append(list_data)
+            result.lists_skipped = result.lists_total - len(dirty_lists)
+            
+            dirty_ids = {str(list_data["id"]) for list_data in dirty_lists}
+            skipped_ids = [list_id for list_id in stored if list_id not in dirty_ids]
+            if skipped_ids:
+                db = next(get_db())
+                try:
+                    db.query(ListDigest).filter(ListDigest.list_id.in_(skipped_ids)).update(
+                        {ListDigest.last_checked: start_time}, synchronize_session=False
+                    )
+                    db.commit()
+                finally:
+                    db.close()
+            
+            # Descender solo a las listas distintas
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+            
+            async def fetch_list(list_id: str) -> List[Dict]:
+                tasks: List[Dict] = []
+                page = 0
+                while True:
+                    async with semaphore:
+                        await self._acquire(workspace_id, scheduler)
+                        # Con cerradas: las tareas no recibidas se eliminan localmente
+                        page_tasks = await self.clickup_client.get_tasks(list_id, include_closed=True, page=page)
+                    tasks.extend(page_tasks)
+                    if len(page_tasks) < 100:
+                        return tasks
+                    page += 1
+            
+            fetched = await asyncio.gather(*[fetch_list(str(l["id"])) for l in dirty_lists])
+            
+            for list_data, tasks in zip(dirty_lists, fetched):
+                list_id = str(list_data["id"])
+                for i in range(0, len(tasks), self.batch_size):
+                    batch_result = await self._process_task_batch(tasks[i:i + self.batch_size], workspace_id)
+                    result.items_processed += batch_result.items_processed
+                    result.items_created += batch_result.items_created
+                    result.items_updated += batch_result.items_updated
+                    result.errors.extend(batch_result.errors)
+                
+                db = next(get_db())
+                try:
+                    fetched_ids = {str(t["id"]) for t in tasks}
+                    stale_tasks = db.query(Task).filter(
+                        Task.list_id == list_id,
+                        ~Task.clickup_id.in_(fetched_ids)
+                    )
+                    delete_task_attributes(db, stale_tasks.with_entities(Task.clickup_id).scalar_subquery())
+                    record_task_events(db, "deleted", [
+                        row._asdict() for row in stale_tasks.with_entities(Task.clickup_id, Task.workspace_id)
+                    ])
+                    stale = stale_tasks.delete(synchronize_session=False)
+                    result.items_deleted += stale
+                    
+                    remote_digest = list_digest((str(t["id"]), t.get("date_updated")) for t in tasks)
+                    updated_values = [
+                        datetime.fromtimestamp(int(t["date_updated"]) / 1000)
+                        for t in tasks if t.get("date_updated")
+                    ]
+                    digest = db.query(ListDigest).filter(ListDigest.list_id == list_id).first()
+                    if not digest:
+                        digest = ListDigest(list_id=list_id)
+                        db.add(digest)
+                    digest.workspace_id = workspace_id
+                    digest.remote_digest = remote_digest
+                    digest.local_digest = self._local_list_digests(db, workspace_id, list_id).get(list_id, list_digest([]))
+                    digest.task_count = list_data.get("task_count")
+                    digest.max_date_updated = max(updated_values) if updated_values else start_time
+                    digest.last_checked = start_time
+                    db.commit()
+                finally:
+                    db.close()
+            
+            result.skip_ratio = result.lists_skipped / result.lists_total if result.lists_total else 0.0
+            result.success = len(result.errors) == 0
+        
+        except Exception as e:
+            error_msg = f"Error en reconciliación: {e}"
+            sync_logger.error(error_msg)
+            result.errors.append(error_msg)
+        
+        result.duration = (datetime.now() - start_time).total_seconds()
+        self._add_to_history(result)
+        self._compact_change_log()
+        
+        sync_logger.info(f"🌳 Reconciliación terminada: {result.lists_skipped}/{result.lists_total} listas saltadas "
+                        f"({result.skip_ratio:.0%}), {result.items_processed} tareas procesadas "
+                        f"en {result.duration:.1f}s")
+        return result
+    
+    def _local_list_digests(self, db: Session, workspace_id: str, list_id: Optional[str] = None) -> Dict[str, str]:
+        """Digest local (task_id, date_updated) por lista, en una sola consulta de columnas.
+
+        Cubre tareas calientes y archivadas, igual que la lectura remota con cerradas:
+        archivar no cambia el digest de una lista.
+        """
+        source = task_source(include_closed=True)
+        query = db.query(source.list_id, source.clickup_id, source.date_updated).filter(source.workspace_id == workspace_id)
+        if list_id is not None:
+            query = query.filter(source.list_id == list_id)
+        pairs: Dict[str, List] = {}
+        for row in query:
+            pairs.setdefault(str(row.list_id), []).append((row.clickup_id, row.date_updated))
+        return {key: list_digest(value) for key, value in pairs.items()}
+    
     async def incremental_sync(self, workspace_id: str, since: Optional[datetime] = None) -> SyncResult:
         """Sincronización incremental basada en cambios recientes"""
         start_time = datetime.now()
         
         if since is None:
+            # Con watermark (p.ej. tras una importación offline) solo se cubre el hueco
+            if get_watermark(workspace_id) is not None:
+                return await self.sync_since_watermark(workspace_id)
             since = start_time - timedelta(hours=1)  # Última hora por defecto
         
         result = SyncResult(
@@ -300,6 +682,63 @@ class AdvancedSyncService:
         
         result.duration = (datetime.now() - start_time).total_seconds()
         self._add_to_history(result)
+        self._compact_change_log()
+        
+        return result
+    
+    async def sync_since_watermark(self, workspace_id: str) -> SyncResult:
+        """Ingerir solo las tareas actualizadas en ClickUp después del watermark"""
+        start_time = datetime.now()
+        result = SyncResult(
+            success=False,
+            items_processed=0,
+            items_created=0,
+            items_updated=0,
+            items_deleted=0,
+            errors=[],
+            duration=0,
+            timestamp=start_time
+        )
+        
+        try:
+            watermark = get_watermark(workspace_id)
+            since_ms = int(watermark.timestamp() * 1000) if watermark else None
+            sync_logger.info(f"🔄 Sincronización desde watermark {watermark} del workspace {workspace_id}")
+            
+            newest = watermark
+            page = 0
+            while True:
+                await self.rate_limiter.acquire()
+                response = await self.clickup_client.get_workspace_tasks(
+                    workspace_id, date_updated_gt=since_ms, include_closed=True, page=page
+                )
+                tasks = response.get("tasks", [])
+                for i in range(0, len(tasks), self.batch_size):
+                    batch_result = await self._process_task_batch(tasks[i:i + self.batch_size], workspace_id)
+                    result.items_processed += batch_result.items_processed
+                    result.items_created += batch_result.items_created
+                    result.items_updated += batch_result.items_updated
+                    result.errors.extend(batch_result.errors)
+                for task_data in tasks:
+                    if task_data.get("date_updated"):
+                        updated = datetime.fromtimestamp(int(task_data["date_updated"]) / 1000)
+                        newest = max(newest, updated) if newest else updated
+                if response.get("last_page", True) or not tasks:
+                    break
+                page += 1
+            
+            result.success = len(result.errors) == 0
+            if result.success and newest:
+                set_watermark(workspace_id, newest, source="api")
+        
+        except Exception as e:
+            error_msg = f"Error en sincronización desde watermark: {e}"
+            sync_logger.error(error_msg)
+            result.errors.append(error_msg)
+        
+        result.duration = (datetime.now() - start_time).total_seconds()
+        self._add_to_history(result)
+        self._compact_change_log()
         
         return result
     
@@ -411,16 +850,28 @@ class AdvancedSyncService:
         if clickup_data.get("start_date"):
             local_task.start_date = datetime.fromtimestamp(clickup_data["start_date"] / 1000)
         
+        if clickup_data.get("date_closed"):
+            local_task.date_closed = datetime.fromtimestamp(int(clickup_data["date_closed"]) / 1000)
+        
+        if clickup_data.get("date_updated"):
+            local_task.date_updated = datetime.fromtimestamp(int(clickup_data["date_updated"]) / 1000)
+        
+        # Lista (las tareas pueden moverse entre listas)
+        if isinstance(clickup_data.get("list"), dict) and clickup_data["list"].get("id"):
+            local_task.list_id = clickup_data["list"]["id"]
+        
         # Assignees
         if clickup_data.get("assignees"):
             local_task.assignee_id = str(clickup_data["assignees"][0]["id"])
         
-        # Custom fields
-        local_task.custom_fields = clickup_data.get("custom_fields", {})
+        # Custom fields en la forma local `{nombre: valor}` (la misma que el hash)
+        values = normalize_clickup_task(clickup_data, local_task.workspace_id)
+        local_task.custom_fields = values["custom_fields"]
         
         # Metadata
         local_task.is_synced = True
         local_task.last_sync = datetime.now()
+        local_task.content_hash = task_content_hash(values)
         
         sync_logger.debug(f"Actualizada tarea local {local_task.clickup_id}")
     
@@ -428,6 +879,7 @@ class AdvancedSyncService:
         """Crear nueva tarea local desde datos de ClickUp"""
         from api.routes.tasks import _priority_to_int
         
+        values = normalize_clickup_task(clickup_data)
         task = Task(
             clickup_id=clickup_data["id"],
             name=clickup_data["name"],
@@ -436,16 +888,21 @@ class AdvancedSyncService:
             priority=_priority_to_int(clickup_data.get("priority", 3)),
             due_date=datetime.fromtimestamp(clickup_data["due_date"] / 1000) if clickup_data.get("due_date") else None,
             start_date=datetime.fromtimestamp(clickup_data["start_date"] / 1000) if clickup_data.get("start_date") else None,
+            date_closed=datetime.fromtimestamp(int(clickup_data["date_closed"]) / 1000) if clickup_data.get("date_closed") else None,
+            date_updated=datetime.fromtimestamp(int(clickup_data["date_updated"]) / 1000) if clickup_data.get("date_updated") else None,
             workspace_id=clickup_data["team_id"],
             list_id=clickup_data["list"]["id"],
             assignee_id=str(clickup_data["assignees"][0]["id"]) if clickup_data.get("assignees") else None,
             creator_id=str(clickup_data["creator"]["id"]) if clickup_data.get("creator") else None,
             tags=[tag["name"] for tag in clickup_data.get("tags", [])],
-            custom_fields=clickup_data.get("custom_fields", {}),
+            custom_fields=values["custom_fields"],
             is_synced=True,
-            last_sync=datetime.now()
+            last_sync=datetime.now(),
+            content_hash=task_content_hash(values)
         )
         
+        # Una tarea cerrada ya archivada vuelve al tier caliente: sin copia en el archivo
+        discard_archived(db, [task.clickup_id])
         db.add(task)
         sync_logger.debug(f"Creada nueva tarea local {task.clickup_id}")
     
@@ -463,6 +920,10 @@ class AdvancedSyncService:
             
             if deleted_task_ids:
                 # Marcar como eliminadas (o eliminar completamente)
+                delete_task_attributes(db, deleted_task_ids)
+                record_task_events(db, "deleted", [
+                    {"clickup_id": task_id, "workspace_id": workspace_id} for task_id in deleted_task_ids
+                ])
                 deleted_count = db.query(Task).filter(
                     Task.clickup_id.in_(deleted_task_ids)
                 ).delete(synchronize_session=False)
@@ -476,6 +937,17 @@ class AdvancedSyncService:
         finally:
             db.close()
     
+    def _compact_change_log(self):
+        """Compactación periódica del registro de cambios tras una sincronización"""
+        db = next(get_db())
+        try:
+            compact_change_log_if_due(db)
+        except Exception as e:
+            db.rollback()
+            sync_logger.error(f"❌ Error compactando el registro de cambios: {e}")
+        finally:
+            db.close()
+    
     def _add_to_history(self, result: SyncResult):
         """Agregar resultado al historial"""
         self.sync_history.append(result)
@@ -513,5 +985,32 @@ class AdvancedSyncService:
         sync_logger.info("🧹 Cache limpiado")
 
 
+def get_watermark(workspace_id: str) -> Optional[datetime]:
+    """Obtener el watermark de sincronización de un workspace"""
+    db = next(get_db())
+    try:
+        mark = db.query(SyncWatermark).filter(SyncWatermark.workspace_id == workspace_id).first()
+        return mark.last_date_updated if mark else None
+    finally:
+        db.close()
+
+
+def set_watermark(workspace_id: str, last_date_updated: datetime, source: str = "api"):
+    """Guardar (solo hacia adelante) el watermark de sincronización de un workspace"""
+    db = next(get_db())
+    try:
+        mark = db.query(SyncWatermark).filter(SyncWatermark.workspace_id == workspace_id).first()
+        if not mark:
+            mark = SyncWatermark(workspace_id=workspace_id)
+            db.add(mark)
+        if mark.last_date_updated is None or last_date_updated > mark.last_date_updated:
+            mark.last_date_updated = last_date_updated
+        mark.source = source
+        mark.updated_at = datetime.now()
+        db.commit()
+    finally:
+        db.close()
+
+
 # Instancia global del servicio de sincronización
 sync_service = AdvancedSyncService()
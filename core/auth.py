@@ -288,7 +288,3 @@ class SecurityUtils:
         # Verificar host permitido
         return parsed.netloc in allowed_hosts
 
-
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
-auth_logger.setLevel(logging.INFO)
@@ -0,0 +1,311 @@
+"""
+Importación masiva de exports offline de ClickUp (arranque en frío)
+- Lee exports JSON/CSV del workspace o dumps de payloads crudos (JSONL)
+- Inserta tareas, usuarios y workspaces por lotes (bulk insert/update)
+- Reconstruye el índice de búsqueda al final
+- Fija el watermark incremental para que la API solo cubra el hueco
+"""
+
+import csv
+import json
+import logging
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from core.advanced_sync import set_watermark
+from core.data_version import mark_changed
+from core.task_archive import discard_archived
+from core.task_attributes import sync_task_attributes
+from core.task_events import record_task_events
+from core.task_ingest import normalize_clickup_task, task_content_hash
+from models.task import Task
+from models.user import User
+from models.workspace import Workspace
+
+import_logger = logging.getLogger("bulk_import")
+
+# Filas por lote al leer las tareas para el índice de búsqueda
+SEARCH_INDEX_BATCH_SIZE = 1000
+
+# Cabeceras del export CSV de ClickUp (en minúsculas) -> campo del payload
+CSV_COLUMNS = {
+    "task id": "id",
+    "id": "id",
+    "task name": "name",
+    "name": "name",
+    "task content": "description",
+    "description": "description",
+    "status": "status",
+    "priority": "priority",
+    "due date": "due_date",
+    "start date": "start_date",
+    "date closed": "date_closed",
+    "date updated": "date_updated",
+    "list id": "list",
+    "list name": "list_name",
+    "assignees": "assignees",
+    "assignee": "assignees",
+    "tags": "tags",
+    "created by": "creator",
+    "team id": "team_id",
+    "workspace id": "team_id",
+}
+
+
+@dataclass
+class ImportResult:
+    """Resultado de una importación masiva"""
+    success: bool
+    files: List[str]
+    workspace_id: Optional[str]
+    tasks_created: int = 0
+    tasks_updated: int = 0
+    users_created: int = 0
+    workspaces_created: int = 0
+    skipped: int = 0
+    watermark: Optional[datetime] = None
+    search_indexed: bool = False
+    errors: List[str] = field(default_factory=list)
+    duration: float = 0
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _csv_timestamp(value: str) -> Optional[str]:
+    """Convertir fecha del CSV (ms o ISO) a timestamp de ClickUp en ms"""
+    value = (value or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return value
+    for parser in (datetime.fromisoformat, lambda v: datetime.strptime(v, "%m/%d/%Y")):
+        try:
+            return str(int(parser(value).timestamp() * 1000))
+        except ValueError:
+            continue
+    return None
+
+
+def _csv_row_to_payload(row: Dict[str, str]) -> Dict[str, Any]:
+    """Convertir una fila del export CSV a un payload tipo API de ClickUp"""
+    payload: Dict[str, Any] = {}
+    for header, value in row.items():
+        key = CSV_COLUMNS.get((header or "").strip().lower())
+        if key and value not in (None, ""):
+            payload[key] = value.strip()
+
+    for key in ("due_date", "start_date", "date_closed", "date_updated"):
+        if key in payload:
+            payload[key] = _csv_timestamp(payload[key])
+
+    if "assignees" in payload:
+        payload["assignees"] = [
+            {"id": item.strip()} for item in payload["assignees"].strip("[]").split(",") if item.strip()
+        ]
+    if "tags" in payload:
+        payload["tags"] = [tag.strip() for tag in payload["tags"].strip("[]").split(",") if tag.strip()]
+    payload.pop("list_name", None)
+    return payload
+
+
+def iter_export_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Recorrer los registros de un export como dicts {"kind": ..., "data": ...}.
+
+    `.jsonl`/`.ndjson` y `.csv` se leen en streaming línea a línea; un `.json`
+    se carga completo (objeto con `tasks`/`members`/`teams` o lista de tareas).
+    """
+    suffix = path.suffix.lower()
+
+    if suffix in (".jsonl", ".ndjson"):
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    yield from _records_from_json(json.loads(line))
+    elif suffix == ".csv":
+        with path.open(encoding="utf-8-sig", newline="") as handle:
+            for row in csv.DictReader(handle):
+                yield {"kind": "task", "data": _csv_row_to_payload(row)}
+    else:
+        with path.open(encoding="utf-8") as handle:
+            yield from _records_from_json(json.load(handle))
+
+
+def _records_from_json(data: Any) -> Iterator[Dict[str, Any]]:
+    """Clasificar un documento JSON de ClickUp en tareas, usuarios y workspaces"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _records_from_json(item)
+        return
+    if not isinstance(data, dict):
+        return
+
+    if "tasks" in data or "teams" in data or "members" in data:
+        for team in data.get("teams", []):
+            yield from _records_from_json({"team": team})
+        for member in data.get("members", []):
+            yield {"kind": "user", "data": member.get("user", member)}
+        for task in data.get("tasks", []):
+            yield {"kind": "task", "data": task}
+    elif "team" in data:
+        team = data["team"]
+        yield {"kind": "workspace", "data": team}
+        for member in team.get("members", []):
+            yield {"kind": "user", "data": member.get("user", member)}
+    elif "user" in data and "id" not in data:
+        yield {"kind": "user", "data": data["user"]}
+    elif "id" in data:
+        yield {"kind": "task", "data": data}
+
+
+class BulkImporter:
+    """Ingesta masiva de exports en `tasks`, `users` y `workspaces`"""
+
+    def __init__(self, db: Session, workspace_id: Optional[str] = None, batch_size: int = 1000):
+        self.db = db
+        self.workspace_id = workspace_id
+        self.batch_size = batch_size
+        self._tasks: Dict[str, dict] = {}
+        self._users: Dict[str, dict] = {}
+        self._workspaces: Dict[str, dict] = {}
+
+    def import_files(self, paths: List[str], rebuild_index: bool = True) -> ImportResult:
+        """Importar uno o varios ficheros de export"""
+        start_time = datetime.now()
+        result = ImportResult(success=False, files=[str(p) for p in paths], workspace_id=self.workspace_id)
+
+        try:
+            for path in paths:
+                import_logger.info(f"📥 Importando {path}")
+                for record in iter_export_records(Path(path)):
+                    self._add_record(record, result)
+                    if len(self._tasks) >= self.batch_size:
+                        self._flush_tasks(result)
+            self._flush_tasks(result)
+            self._flush_entities(User, self._users, result, "users_created")
+            self._flush_entities(Workspace, self._workspaces, result, "workspaces_created")
+
+            if result.watermark and result.workspace_id:
+                set_watermark(result.workspace_id, result.watermark, source="import")
+            if rebuild_index:
+                result.search_indexed = self._rebuild_search_index()
+            result.success = len(result.errors) == 0
+        except Exception as e:
+            self.db.rollback()
+            error_msg = f"Error en importación masiva: {e}"
+            import_logger.error(error_msg)
+            result.errors.append(error_msg)
+
+        result.duration = (datetime.now() - start_time).total_seconds()
+        import_logger.info(
+            f"✅ Importación: {result.tasks_created} creadas, {result.tasks_updated} actualizadas, "
+            f"{result.users_created} usuarios, {result.workspaces_created} workspaces"
+        )
+        return result
+
+    def _add_record(self, record: Dict[str, Any], result: ImportResult):
+        """Acumular un registro normalizado en el lote pendiente"""
+        data = record["data"]
+        if not data or not data.get("id"):
+            result.skipped += 1
+            return
+
+        if record["kind"] == "workspace":
+            self._workspaces[str(data["id"])] = {"clickup_id": str(data["id"]), "name": data.get("name")}
+            result.workspace_id = result.workspace_id or str(data["id"])
+        elif record["kind"] == "user":
+            self._users[str(data["id"])] = {
+                "clickup_id": str(data["id"]),
+                "username": data.get("username"),
+                "email": data.get("email"),
+            }
+        else:
+            try:
+                values = normalize_clickup_task(data, result.workspace_id)
+            except Exception as e:
+                result.skipped += 1
+                result.errors.append(f"Tarea {data.get('id')}: {e}")
+                return
+            values["content_hash"] = task_content_hash(values)
+            values["is_synced"] = 1
+            values["last_sync"] = datetime.now()
+            self._tasks[values["clickup_id"]] = values
+            result.workspace_id = result.workspace_id or values["workspace_id"] or None
+            if values["date_updated"] and (result.watermark is None or values["date_updated"] > result.watermark):
+                result.watermark = values["date_updated"]
+            for assignee in data.get("assignees") or []:
+                if isinstance(assignee, dict) and assignee.get("id") and str(assignee["id"]) not in self._users:
+                    self._users[str(assignee["id"])] = {
+                        "clickup_id": str(assignee["id"]),
+                        "username": assignee.get("username"),
+                        "email": assignee.get("email"),
+                    }
+
+    def _flush_tasks(self, result: ImportResult):
+        """Escribir el lote de tareas pendiente con bulk insert/update"""
+        if not self._tasks:
+            return
+        existing = dict(
+            self.db.query(Task.clickup_id, Task.id).filter(Task.clickup_id.in_(list(self._tasks))).all()
+        )
+        inserts = [values for clickup_id, values in self._tasks.items() if clickup_id not in existing]
+        updates = [
+            {**values, "id": existing[clickup_id]}
+            for clickup_id, values in self._tasks.items()
+            if clickup_id in existing
+        ]
+        discard_archived(self.db, self._tasks.keys())
+        if inserts:
+            self.db.bulk_insert_mappings(Task, inserts)
+        if updates:
+            self.db.bulk_update_mappings(Task, updates)
+        # bulk_*_mappings no pasa por los eventos del ORM
+        mark_changed(self.db, {values["workspace_id"] for values in self._tasks.values()})
+        sync_task_attributes(self.db, self._tasks.values())
+        record_task_events(self.db, "created", inserts)
+        record_task_events(self.db, "updated", updates)
+        self.db.commit()
+
+        result.tasks_created += len(inserts)
+        result.tasks_updated += len(updates)
+        self._tasks = {}
+
+    def _flush_entities(self, model, pending: Dict[str, dict], result: ImportResult, counter: str):
+        """Insertar usuarios/workspaces que aún no existen localmente"""
+        if not pending:
+            return
+        existing = {
+            row[0] for row in self.db.query(model.clickup_id).filter(model.clickup_id.in_(list(pending))).all()
+        }
+        inserts = [values for clickup_id, values in pending.items() if clickup_id not in existing]
+        if inserts:
+            self.db.bulk_insert_mappings(model, inserts)
+            self.db.commit()
+        setattr(result, counter, getattr(result, counter) + len(inserts))
+        pending.clear()
+
+    def _rebuild_search_index(self) -> bool:
+        """Reconstruir el índice de búsqueda con las tareas importadas"""
+        from core.search_engine import INDEX_COLUMNS, search_engine
+
+        try:
+            if not search_engine.is_initialized:
+                # Carga síncrona: import_files puede llamarse con un event loop en marcha
+                search_engine.load_model()
+            if not search_engine.is_initialized:
+                import_logger.warning("⚠️ Motor de búsqueda no disponible, índice no reconstruido")
+                return False
+            # Solo las columnas del texto indexado, leídas y agregadas al índice por lotes
+            columns = [getattr(Task, name) for name in INDEX_COLUMNS]
+            rows = (row._asdict() for row in self.db.query(*columns).yield_per(SEARCH_INDEX_BATCH_SIZE))
+            search_engine.build_search_index(rows, batch_size=SEARCH_INDEX_BATCH_SIZE)
+            return True
+        except Exception as e:
+            import_logger.warning(f"⚠️ Error reconstruyendo índice de búsqueda: {e}")
+            return False
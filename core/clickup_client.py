@@ -7,6 +7,7 @@ import asyncio
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from core.config import settings
+from core.logging_config import SAMPLED
 import logging
 
 logger = logging.getLogger(__name__)
@@ -41,10 +42,8 @@ class ClickUpClient:
             logger.error("❌ No se proporcionó token de ClickUp API")
             raise ValueError("CLICKUP_API_TOKEN no está configurado")
         
-        logger.info(f"🔗 Haciendo petición a ClickUp API: {method} {url}")
-        logger.info(f"🔑 Headers: {self.headers}")
-        if params:
-            logger.info(f"📋 Parámetros: {params}")
+        # Nunca registrar las cabeceras: contienen el token de la API
+        logger.debug("🔗 Petición a ClickUp API: %s %s params=%s", method, url, params, extra=SAMPLED)
         
         async with aiohttp.ClientSession() as session:
             try:
@@ -56,7 +55,7 @@ class ClickUpClient:
                     params=params,
                     timeout=aiohttp.ClientTimeout(total=30)
                 ) as response:
-                    logger.info(f"📡 Respuesta de ClickUp API: {response.status}")
+                    logger.debug("📡 Respuesta de ClickUp API: %s %s -> %s", method, url, response.status, extra=SAMPLED)
                     
                     if response.status >= 400:
                         error_text = await response.text()
@@ -75,9 +74,7 @@ class ClickUpClient:
                         # Algunos endpoints devuelven texto; no necesitamos su cuerpo
                         return {}
                     
-                    result = await response.json()
-                    logger.info(f"✅ Petición exitosa a ClickUp API")
-                    return result
+                    return await response.json()
                     
             except aiohttp.ClientError as e:
                 logger.error(f"❌ Error de conexión a ClickUp API: {e}")
@@ -131,8 +128,7 @@ class ClickUpClient:
             response = await self._make_request("GET", f"space/{space_id}/list")
             all_lists.extend(response.get("lists", []))
         except Exception as e:
-            print(f"Error obteniendo listas directas: {e}")
-        
+            logger.warning(f"Error obteniendo listas directas: {e}")
         # Obtener folders y sus listas
         try:
             folders_response = await self._make_request("GET", f"space/{space_id}/folder")
@@ -150,10 +146,9 @@ class ClickUpClient:
                     
                     all_lists.extend(folder_lists)
                 except Exception as e:
-                    print(f"Error obteniendo listas del folder {folder['id']}: {e}")
+                    logger.warning(f"Error obteniendo listas del folder {folder['id']}: {e}")
         except Exception as e:
-            print(f"Error obteniendo folders: {e}")
-        
+            logger.warning(f"Error obteniendo folders: {e}")
         return all_lists
     
     async def get_list(self, list_id: str) -> Dict:
@@ -175,12 +170,35 @@ class ClickUpClient:
         response = await self._make_request("GET", f"list/{list_id}/task", params=params)
         return response.get("tasks", [])
     
+    async def get_workspace_tasks(
+        self,
+        workspace_id: str,
+        date_updated_gt: Optional[int] = None,
+        include_closed: bool = False,
+        page: int = 0
+    ) -> Dict:
+        """Obtener tareas filtradas de todo un workspace (una página).
+
+        Devuelve la respuesta completa para poder leer `last_page`.
+        """
+        params = {
+            "include_closed": str(include_closed).lower(),
+            "page": page
+        }
+        if date_updated_gt is not None:
+            params["date_updated_gt"] = date_updated_gt
+        return await self._make_request("GET", f"team/{workspace_id}/task", params=params)
+    
     async def get_task(self, task_id: str) -> Dict:
         """Obtener una tarea específica"""
         return await self._make_request("GET", f"task/{task_id}")
     
-    async def create_task(self, list_id: str, task_data: Dict) -> Dict:
-        """Crear una nueva tarea"""
+    async def create_task(self, list_id: str, task_data: Dict, retry_minimal: bool = True) -> Dict:
+        """Crear una nueva tarea.
+        
+        Con `retry_minimal=False` un 400 se propaga sin reintentar con el
+        payload mínimo (el llamador decide cómo reintentar).
+        """
         try:
             # Asegurar que los campos personalizados se incluyan en la creación inicial
             if "custom_fields" in task_data:
@@ -198,7 +216,7 @@ class ClickUpClient:
             return await self._make_request("POST", f"list/{list_id}/task", data=task_data)
         except aiohttp.ClientResponseError as cre:
             # Fallback: algunos espacios/listas rechazan priority/status -> reintentar con payload mínimo
-            if cre.status == 400:
+            if cre.status == 400 and retry_minimal:
                 minimal_data: Dict[str, Any] = {
                     "name": task_data.get("name", "Nueva tarea"),
                     "description": task_data.get("description", "")
@@ -239,8 +257,7 @@ class ClickUpClient:
             if members:
                 return members
         except Exception as e:
-            print(f"Error en petición a ClickUp API (member): {e}")
-        
+            logger.warning(f"Error en petición a ClickUp API (member): {e}")
         # Fallback a /user
         try:
             response = await self._make_request("GET", f"team/{workspace_id}/user")
@@ -250,8 +267,7 @@ class ClickUpClient:
             if normalized:
                 return normalized
         except Exception as e:
-            print(f"Error en petición a ClickUp API (user): {e}")
-        
+            logger.warning(f"Error en petición a ClickUp API (user): {e}")
         # Fallback: intentar obtener usuarios del workspace directamente
         try:
             response = await self._make_request("GET", f"workspace/{workspace_id}/member")
@@ -259,8 +275,7 @@ class ClickUpClient:
             if members:
                 return members
         except Exception as e:
-            print(f"Error en petición a ClickUp API (workspace member): {e}")
-        
+            logger.warning(f"Error en petición a ClickUp API (workspace member): {e}")
         # Último fallback: obtener todos los teams y extraer los miembros del solicitado
         try:
             teams_resp = await self._make_request("GET", "team")
@@ -268,10 +283,9 @@ class ClickUpClient:
                 if str(team.get("id")) == str(workspace_id) and team.get("members"):
                     return team["members"]
         except Exception as e:
-            print(f"Error en petición a ClickUp API (team): {e}")
-        
+            logger.warning(f"Error en petición a ClickUp API (team): {e}")
         # Si todo falla, devolver un usuario de ejemplo para que la UI funcione
-        print("No se pudieron obtener usuarios de ClickUp, devolviendo usuario de ejemplo")
+        logger.warning("No se pudieron obtener usuarios de ClickUp, devolviendo usuario de ejemplo")
         return [{
             "user": {
                 "id": "156221125",
@@ -26,7 +26,7 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key-here-change-in-production")
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 horas
-    CLICKUP_API_BASE_URL: str = "https://api.clickup.com/api/v2"
+    CLICKUP_API_BASE_URL: str = os.getenv("CLICKUP_API_BASE_URL", "https://api.clickup.com/api/v2")
     
     # Configuración de base de datos
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./clickup_manager.db")
@@ -52,6 +52,12 @@ class Settings(BaseSettings):
     # Configuración de logs
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE: str = os.getenv("LOG_FILE", "logs/app.log")
+    # Formato de salida: json (una línea por registro) o text
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json").lower()
+    # Niveles por subsistema: "sync=DEBUG,core.search_engine=WARNING"
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")
+    # Líneas por ítem (marcadas para muestreo) emitidas por segundo y por línea de código
+    LOG_SAMPLE_PER_SECOND: int = int(os.getenv("LOG_SAMPLE_PER_SECOND", "10"))
     
     # Configuración de automatización
     AUTOMATION_ENABLED: bool = os.getenv("AUTOMATION_ENABLED", "True").lower() == "true"
@@ -90,9 +96,51 @@ class Settings(BaseSettings):
     TASK_TELEGRAM_FIELDS: str = os.getenv("TASK_TELEGRAM_FIELDS", "")  # CAMPO ELIMINADO - Telegram deshabilitado
     TASK_SMS_FIELDS: str = os.getenv("TASK_SMS_FIELDS", "")  # Campo eliminado - SMS deshabilitado
     
+    # Releer cada tarea creada en ClickUp para verificarla (depuración; un GET extra por creación)
+    TASK_CREATE_VERIFY: bool = os.getenv("TASK_CREATE_VERIFY", "False").lower() == "true"
+
+    # Vigencia (segundos) del esquema de custom fields de una lista antes de refrescarlo
+    CUSTOM_FIELD_SCHEMA_TTL: int = int(os.getenv("CUSTOM_FIELD_SCHEMA_TTL", "3600"))
+
     # Configuración del motor de búsqueda RAG
     SEARCH_ENGINE_ENABLED: bool = os.getenv("SEARCH_ENGINE_ENABLED", "False").lower() == "true"
+
+    # Configuración del archivo de tareas cerradas (tier frío `tasks_archive`)
+    TASK_ARCHIVE_AFTER_DAYS: int = int(os.getenv("TASK_ARCHIVE_AFTER_DAYS", "30"))
+    TASK_ARCHIVE_BATCH_SIZE: int = int(os.getenv("TASK_ARCHIVE_BATCH_SIZE", "500"))
+
+    # Peticiones simultáneas a ClickUp en operaciones masivas de tareas (bulk-update, batch)
+    BULK_UPDATE_CONCURRENCY: int = int(os.getenv("BULK_UPDATE_CONCURRENCY", "5"))
     
+    # Máximo de IDs por petición a POST /tasks/batch-get
+    TASK_BATCH_GET_MAX_IDS: int = int(os.getenv("TASK_BATCH_GET_MAX_IDS", "100"))
+
+    # Segundos desde la última sincronización en que GET /tasks/{id} sirve la fila sin refrescarla
+    TASK_FRESH_SECONDS: int = int(os.getenv("TASK_FRESH_SECONDS", "300"))
+
+    # Stream SSE de cambios de tareas (GET /tasks/stream)
+    # Eventos recientes guardados para reanudar con Last-Event-ID
+    TASK_STREAM_HISTORY: int = int(os.getenv("TASK_STREAM_HISTORY", "1000"))
+    # Eventos pendientes por cliente antes de descartarlos y enviar un reset
+    TASK_STREAM_CLIENT_BUFFER: int = int(os.getenv("TASK_STREAM_CLIENT_BUFFER", "500"))
+    # Segundos entre comentarios keep-alive cuando no hay eventos
+    TASK_STREAM_HEARTBEAT: int = int(os.getenv("TASK_STREAM_HEARTBEAT", "15"))
+
+    # Registro de cambios de tareas (GET /tasks/changes)
+    # Horas tras las que las entradas de una misma tarea se fusionan en una
+    TASK_CHANGE_LOG_COMPACT_AFTER_HOURS: int = int(os.getenv("TASK_CHANGE_LOG_COMPACT_AFTER_HOURS", "24"))
+    # Días que se conservan las entradas (cursores más antiguos deben recargar)
+    TASK_CHANGE_LOG_RETENTION_DAYS: int = int(os.getenv("TASK_CHANGE_LOG_RETENTION_DAYS", "30"))
+    # Segundos de espera antes de entregar una entrada (transacciones aún sin confirmar)
+    TASK_CHANGE_LOG_SETTLE_SECONDS: int = int(os.getenv("TASK_CHANGE_LOG_SETTLE_SECONDS", "2"))
+
+    # Configuración de sincronización multi-workspace
+    # Peticiones simultáneas por workspace (por defecto y overrides "workspace_id:N" coma-separados)
+    SYNC_WORKSPACE_CONCURRENCY: int = int(os.getenv("SYNC_WORKSPACE_CONCURRENCY", "2"))
+    SYNC_WORKSPACE_CONCURRENCY_OVERRIDES: str = os.getenv("SYNC_WORKSPACE_CONCURRENCY_OVERRIDES", "")
+    # Pesos del reparto justo del rate limit ("workspace_id:peso" coma-separados, por defecto 1)
+    SYNC_WORKSPACE_WEIGHTS: str = os.getenv("SYNC_WORKSPACE_WEIGHTS", "")
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,266 @@
+"""
+Registro local de esquemas de custom fields por lista
+- Un esquema (id, nombre, tipo, opciones) por lista en `list_field_schemas`, con versión
+- Carga perezosa: memoria -> BD -> ClickUp, y refresco al vencer el TTL
+- Los webhooks de lista lo invalidan; la versión solo sube si el esquema cambió
+- Búsquedas nombre -> ID (sin distinguir mayúsculas) e ID -> campo en O(1)
+"""
+
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import SessionLocal
+from models.list_field_schema import ListFieldSchema
+
+registry_logger = logging.getLogger("custom_field_registry")
+
+# Segundos que `cached` recuerda que una lista no tiene esquema guardado
+MISSING_TTL_SECONDS = 60
+
+
+def _normalize_field(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Campo de ClickUp -> {id, name, type, options}"""
+    type_config = raw.get("type_config") or {}
+    options = [
+        {"id": option.get("id"), "name": option.get("name") or option.get("label"), "orderindex": option.get("orderindex")}
+        for option in type_config.get("options") or []
+        if isinstance(option, dict)
+    ]
+    return {
+        "id": str(raw.get("id")),
+        "name": raw.get("name") or "",
+        "type": raw.get("type"),
+        "options": options,
+    }
+
+
+def _fields_hash(fields: List[Dict[str, Any]]) -> str:
+    data = json.dumps(sorted(fields, key=lambda f: f["id"]), sort_keys=True, default=str)
+    return hashlib.md5(data.encode()).hexdigest()
+
+
+@dataclass
+class ListFieldSchemaEntry:
+    """Esquema de custom fields de una lista con índices por nombre e ID"""
+    list_id: str
+    version: int
+    fields: List[Dict[str, Any]]
+    fetched_at: Optional[datetime] = None
+    by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict, repr=False)
+    by_name: Dict[str, Dict[str, Any]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        self.by_id = {f["id"]: f for f in self.fields}
+        self.by_name = {f["name"].strip().lower(): f for f in self.fields if f.get("name")}
+
+    def get(self, name_or_id: Any) -> Optional[Dict[str, Any]]:
+        """Campo por ID o por nombre (sin distinguir mayúsculas)"""
+        if name_or_id is None:
+            return None
+        key = str(name_or_id)
+        return self.by_id.get(key) or self.by_name.get(key.strip().lower())
+
+    def field_id(self, name: str) -> Optional[str]:
+        found = self.get(name)
+        return found["id"] if found else None
+
+    def field_name(self, field_id: str) -> Optional[str]:
+        found = self.by_id.get(str(field_id))
+        return found["name"] if found else None
+
+    def display_value(self, name_or_id: Any, value: Any) -> Any:
+        """Valor legible: nombre de la opción para campos drop_down/labels"""
+        found = self.get(name_or_id)
+        if not found or not found["options"] or value is None:
+            return value
+        by_key = {}
+        for option in found["options"]:
+            by_key[str(option.get("id"))] = option.get("name")
+            if option.get("orderindex") is not None:
+                by_key[str(option["orderindex"])] = option.get("name")
+        if isinstance(value, list):
+            return [by_key.get(str(v), v) for v in value]
+        return by_key.get(str(value), value)
+
+    def to_clickup_payload(self, custom_fields: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """{nombre: valor} -> [{id, value}] con los IDs de la lista"""
+        payload = []
+        for field_name, field_value in (custom_fields or {}).items():
+            if not field_value:
+                continue
+            field_id = self.field_id(field_name)
+            if field_id:
+                payload.append({"id": field_id, "value": str(field_value)})
+            else:
+                registry_logger.warning(f"⚠️ Campo '{field_name}' no encontrado en la lista {self.list_id}")
+        return payload
+
+    def named_values(self, custom_fields: Any) -> Dict[str, Any]:
+        """Custom fields guardados (dict o lista de ClickUp) -> {nombre: valor}"""
+        if isinstance(custom_fields, dict):
+            return dict(custom_fields)
+        values = {}
+        for item in custom_fields or []:
+            if not isinstance(item, dict):
+                continue
+            name = item.get("name") or self.field_name(item.get("id")) or item.get("id")
+            if name:
+                values[name] = item.get("value")
+        return values
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "list_id": self.list_id,
+            "version": self.version,
+            "fields": self.fields,
+            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None,
+        }
+
+
+# Esquema vacío para listas desconocidas o sin acceso a ClickUp
+def empty_schema(list_id: Optional[str]) -> ListFieldSchemaEntry:
+    return ListFieldSchemaEntry(list_id=str(list_id or ""), version=0, fields=[])
+
+
+class CustomFieldRegistry:
+    """Registro de esquemas de custom fields por lista con caché en proceso"""
+
+    def __init__(self, ttl_seconds: int = 3600):
+        self.ttl_seconds = ttl_seconds
+        # list_id -> (entrada, expiración monotónica)
+        self._entries: Dict[str, tuple] = {}
+        # list_id -> expiración de "sin esquema guardado" (solo para `cached`)
+        self._missing: Dict[str, float] = {}
+
+    def _remember(self, entry: ListFieldSchemaEntry) -> ListFieldSchemaEntry:
+        self._missing.pop(entry.list_id, None)
+        self._entries[entry.list_id] = (entry, time.monotonic() + self.ttl_seconds)
+        return entry
+
+    def _from_memory(self, list_id: str) -> Optional[ListFieldSchemaEntry]:
+        cached = self._entries.get(list_id)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        return None
+
+    def _from_db(self, db: Session, list_id: str) -> Optional[ListFieldSchemaEntry]:
+        """Esquema guardado, si existe y no está invalidado ni vencido"""
+        row = db.query(ListFieldSchema).filter(ListFieldSchema.list_id == list_id).first()
+        if not row or row.stale or not row.fetched_at:
+            return None
+        if datetime.now() - row.fetched_at > timedelta(seconds=self.ttl_seconds):
+            return None
+        return ListFieldSchemaEntry(list_id=list_id, version=row.version, fields=row.fields or [], fetched_at=row.fetched_at)
+
+    def _store(self, db: Session, list_id: str, raw_fields: List[Dict[str, Any]]) -> ListFieldSchemaEntry:
+        """Guardar el esquema recibido de ClickUp; la versión sube solo si cambió"""
+        fields = [_normalize_field(f) for f in raw_fields if isinstance(f, dict) and f.get("id")]
+        fields_hash = _fields_hash(fields)
+        now = datetime.now()
+        row = db.query(ListFieldSchema).filter(ListFieldSchema.list_id == list_id).first()
+        if not row:
+            row = ListFieldSchema(list_id=list_id, version=0)
+            db.add(row)
+        if row.fields_hash != fields_hash:
+            row.version = (row.version or 0) + 1
+            row.fields = fields
+            row.fields_hash = fields_hash
+        row.fetched_at = now
+        row.stale = 0
+        db.commit()
+        return ListFieldSchemaEntry(list_id=list_id, version=row.version, fields=fields, fetched_at=now)
+
+    async def get_schema(self, list_id: Any, client=None) -> ListFieldSchemaEntry:
+        """Esquema de una lista: memoria, luego BD y, si falta o venció, ClickUp.
+
+        Usa una sesión propia para no confirmar la transacción de quien llama.
+        """
+        if not list_id:
+            return empty_schema(list_id)
+        list_id = str(list_id)
+        entry = self._from_memory(list_id)
+        if entry:
+            return entry
+
+        db = SessionLocal()
+        try:
+            entry = self._from_db(db, list_id)
+            if entry:
+                return self._remember(entry)
+            if client is None:
+                from core.clickup_client import ClickUpClient
+                client = ClickUpClient()
+            try:
+                raw_fields = await client.get_list_custom_fields(list_id)
+            except Exception as e:
+                registry_logger.warning(f"⚠️ No se pudo obtener el esquema de la lista {list_id}: {e}")
+                # Mejor un esquema viejo que ninguno
+                return self.cached(list_id, db) or empty_schema(list_id)
+            entry = self._store(db, list_id, raw_fields)
+            registry_logger.info(f"📋 Esquema de custom fields de la lista {list_id}: v{entry.version}, {len(entry.fields)} campos")
+            return self._remember(entry)
+        finally:
+            db.close()
+
+    async def get_schemas(self, list_ids: Iterable[Any], client=None) -> Dict[str, ListFieldSchemaEntry]:
+        """Esquemas de varias listas (una petición a ClickUp por lista sin esquema)"""
+        return {str(list_id): await self.get_schema(list_id, client) for list_id in dict.fromkeys(list_ids) if list_id}
+
+    def cached(self, list_id: Any, db: Optional[Session] = None) -> Optional[ListFieldSchemaEntry]:
+        """Esquema conocido sin llamar a ClickUp (memoria o BD, aunque esté vencido)"""
+        if not list_id:
+            return None
+        list_id = str(list_id)
+        entry = self._from_memory(list_id)
+        if entry:
+            return entry
+        if self._missing.get(list_id, 0) > time.monotonic():
+            return None
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            entry = self._from_db(db, list_id)
+            if entry:
+                return self._remember(entry)
+            row = db.query(ListFieldSchema).filter(ListFieldSchema.list_id == list_id).first()
+            if not row or not row.fields:
+                # Evitar una consulta por tarea al recorrer tareas de listas sin esquema
+                self._missing[list_id] = time.monotonic() + MISSING_TTL_SECONDS
+                return None
+            # Vencido o invalidado: sirve a lecturas sin evitar el refresco en get_schema
+            return ListFieldSchemaEntry(list_id=list_id, version=row.version, fields=row.fields, fetched_at=row.fetched_at)
+        except Exception as e:
+            registry_logger.error(f"❌ Error leyendo esquema de la lista {list_id}: {e}")
+            return None
+        finally:
+            if own_session:
+                db.close()
+
+    def invalidate(self, list_id: Any):
+        """Descartar el esquema de una lista (webhooks listUpdated/listDeleted)"""
+        if not list_id:
+            return
+        list_id = str(list_id)
+        self._entries.pop(list_id, None)
+        db = SessionLocal()
+        try:
+            db.query(ListFieldSchema).filter(ListFieldSchema.list_id == list_id).update({"stale": 1})
+            db.commit()
+        finally:
+            db.close()
+
+    def clear(self):
+        self._entries.clear()
+        self._missing.clear()
+
+
+# Instancia global del registro
+custom_field_registry = CustomFieldRegistry(ttl_seconds=settings.CUSTOM_FIELD_SCHEMA_TTL)
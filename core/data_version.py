@@ -0,0 +1,170 @@
+"""
+Versión de datos por workspace para GET condicionales (ETag / If-None-Match)
+- Contador por workspace en `data_versions`; `*` (cualquier workspace) no
+  tiene fila propia: es la suma de los contadores de tareas, así cada
+  escritura solo toca la fila de su workspace
+- Contadores `users` y `workspaces`: los nombres resueltos en las respuestas
+  de tareas cambian con ellos
+- Se incrementa en la misma transacción que el cambio (eventos de Session):
+  sync, webhooks, mutaciones de tareas, archivo e importación
+- ETag débil derivado de la versión y los parámetros de la consulta
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event, insert, update
+from sqlalchemy.orm import Session
+
+from models.data_version import DataVersion
+
+# Cualquier cambio de tareas (consultas sin filtro de workspace): suma de los contadores
+GLOBAL_SCOPE = "*"
+# Cambios masivos sin workspace conocido: se incrementan todos los contadores
+ALL_SCOPES = "__all__"
+# Tareas sin workspace
+UNSCOPED = "-"
+NOTIFICATIONS_SCOPE = "notifications"
+USERS_SCOPE = "users"
+WORKSPACES_SCOPE = "workspaces"
+# Contadores que no son de tareas (fuera de la suma de GLOBAL_SCOPE)
+OTHER_SCOPES = (GLOBAL_SCOPE, NOTIFICATIONS_SCOPE, USERS_SCOPE, WORKSPACES_SCOPE)
+
+TASK_TABLES = ("tasks", "tasks_archive")
+# Tablas con contador propio (nombre de tabla = scope)
+NAME_TABLES = (USERS_SCOPE, WORKSPACES_SCOPE)
+PENDING_KEY = "data_version_pending"
+# Scopes incrementados en el último commit (los lee la caché de nombres)
+COMMITTED_KEY = "data_version_committed"
+
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(PENDING_KEY, set())
+
+
+def mark_changed(session: Session, workspace_ids: Iterable[Any] = ()):
+    """Registrar cambios de tareas hechos fuera del ORM (bulk insert/update)"""
+    _pending(session).update(str(workspace_id) if workspace_id else UNSCOPED for workspace_id in workspace_ids)
+
+
+def task_scopes(workspace_id: Optional[str] = None) -> List[str]:
+    """Scopes de las que depende una respuesta de tareas (incluidos los nombres)"""
+    return [workspace_id or GLOBAL_SCOPE, USERS_SCOPE, WORKSPACES_SCOPE]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_changes(session: Session, flush_context):
+    """Recoger los workspaces de tareas creadas, modificadas o eliminadas"""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table in TASK_TABLES or table in NAME_TABLES:
+            if obj in session.dirty and not session.is_modified(obj):
+                continue
+            if table in NAME_TABLES:
+                _pending(session).add(table)
+            else:
+                mark_changed(session, [getattr(obj, "workspace_id", None)])
+        elif table == "notification_logs":
+            _pending(session).add(NOTIFICATIONS_SCOPE)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state):
+    """Recoger INSERT/UPDATE/DELETE masivos sobre tablas de tareas, usuarios y workspaces"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    name = getattr(getattr(orm_execute_state.statement, "table", None), "name", None)
+    if name in TASK_TABLES:
+        _pending(orm_execute_state.session).add(ALL_SCOPES)
+    elif name in NAME_TABLES:
+        _pending(orm_execute_state.session).add(name)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_before_commit(session: Session):
+    """Incrementar las versiones en la misma transacción que los cambios"""
+    session.flush()
+    scopes = session.info.pop(PENDING_KEY, None)
+    if scopes:
+        bump_data_version(session, scopes)
+        session.info[COMMITTED_KEY] = scopes
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session):
+    session.info.pop(PENDING_KEY, None)
+    session.info.pop(COMMITTED_KEY, None)
+
+
+def bump_data_version(session: Session, scopes: Iterable[str]):
+    """Incrementar (o crear) los contadores de versión indicados"""
+    now = datetime.now()
+    scopes = set(scopes)
+    if ALL_SCOPES in scopes:
+        # Todos los contadores de tareas; UNSCOPED garantiza que la suma sube
+        scopes.discard(ALL_SCOPES)
+        scopes.add(UNSCOPED)
+        session.execute(
+            update(DataVersion)
+            .where(DataVersion.scope.not_in(OTHER_SCOPES))
+            .values(version=DataVersion.version + 1, updated_at=now)
+        )
+        existing = {
+            scope for (scope,) in session.query(DataVersion.scope).filter(DataVersion.scope.not_in(OTHER_SCOPES))
+        }
+        scopes -= existing
+    for scope in scopes:
+        result = session.execute(
+            update(DataVersion)
+            .where(DataVersion.scope == scope)
+            .values(version=DataVersion.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            session.execute(insert(DataVersion).values(scope=scope, version=1, updated_at=now))
+
+
+def get_data_versions(db: Session, scopes: Iterable[str]) -> Dict[str, int]:
+    """Versión actual de cada scope (0 si nunca cambió)"""
+    scopes = list(scopes)
+    query = db.query(DataVersion.scope, DataVersion.version)
+    if GLOBAL_SCOPE not in scopes:
+        query = query.filter(DataVersion.scope.in_(scopes))
+    versions = dict(query.all())
+    if GLOBAL_SCOPE in scopes:
+        # Una fila por workspace: se leen todas en la misma consulta. Los
+        # contadores solo crecen, así la suma cambia con cualquier cambio de tareas
+        versions[GLOBAL_SCOPE] = sum(
+            version for scope, version in versions.items() if scope not in OTHER_SCOPES
+        )
+    return {scope: versions.get(scope, 0) for scope in scopes}
+
+
+def build_etag(db: Session, scopes: Iterable[str], *parts: Any) -> str:
+    """ETag débil a partir de las versiones de datos y los parámetros de la consulta"""
+    seed = json.dumps([get_data_versions(db, scopes), parts], sort_keys=True, default=str)
+    return f'W/"{hashlib.md5(seed.encode()).hexdigest()}"'
+
+
+def query_params_key(request: Request) -> list:
+    """Parámetros de la consulta en forma canónica para el ETag"""
+    return sorted(request.query_params.multi_items())
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Comparación débil de If-None-Match con el ETag actual"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == current for candidate in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Respuesta 304 sin cuerpo"""
+    return Response(status_code=304, headers={"ETag": etag})
@@ -2,10 +2,11 @@
 Configuración de la base de datos
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import MetaData, create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateTable
 from core.config import settings
 
 # Crear engine de base de datos
@@ -42,12 +43,96 @@ def get_db():
 async def init_db():
     """Inicializar base de datos"""
     try:
-        from models import task, workspace, user, automation, report, integration
+        from models import task, task_archive, list_digest, sync_watermark, data_version, list_field_schema, task_attribute, task_change, workspace, user, automation, report, integration
         
         # Crear todas las tablas
+        existing_tables = set(inspect(engine).get_table_names())
         Base.metadata.create_all(bind=engine)
+        _add_missing_columns()
+        _enable_task_autoincrement()
+        _add_missing_indexes()
+        
+        # Tags y custom fields en tablas auxiliares (eventos del ORM); tablas nuevas: poblar
+        from core.task_attributes import backfill_task_attributes
+        if "task_tags" not in existing_tables and "tasks" in existing_tables:
+            db = SessionLocal()
+            try:
+                backfill_task_attributes(db)
+            finally:
+                db.close()
+        
+        # Índice de texto completo para la búsqueda de tareas
+        from core.task_search_index import ensure_search_index
+        ensure_search_index(engine)
         print("✅ Base de datos inicializada correctamente")
     except Exception as e:
         print(f"⚠️  Error inicializando base de datos: {e}")
         # No lanzar excepción para evitar que el servidor falle
         pass
+
+def _add_missing_columns():
+    """Agregar columnas nuevas (nullable) a tablas existentes.
+
+    `create_all` no altera tablas ya creadas; esto cubre las columnas
+    agregadas a los modelos después de la creación inicial.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                print(f"✅ Columna agregada: {table.name}.{column.name}")
+
+
+def _enable_task_autoincrement():
+    """Reconstruir `tasks` con AUTOINCREMENT en bases SQLite creadas sin él.
+
+    Sin AUTOINCREMENT SQLite reutiliza el ID más alto cuando esa fila se
+    archiva, y la unión hot + archivo devolvería dos tareas con el mismo ID.
+    Las filas del archivo que ya chocan con el tier caliente reciben IDs nuevos.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        table_sql = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'")
+        ).scalar()
+        if not table_sql or "AUTOINCREMENT" in table_sql.upper():
+            return
+
+        offset = conn.execute(text(
+            "SELECT max(coalesce((SELECT max(id) FROM tasks), 0), coalesce((SELECT max(id) FROM tasks_archive), 0))"
+        )).scalar()
+        renumbered = conn.execute(text(
+            "UPDATE tasks_archive SET id = id + :offset WHERE id IN (SELECT id FROM tasks)"
+        ), {"offset": offset}).rowcount
+
+        tasks_table = Base.metadata.tables["tasks"]
+        columns = ", ".join(column.name for column in tasks_table.columns)
+        rebuilt = tasks_table.to_metadata(MetaData(), name="tasks_rebuild")
+        conn.execute(CreateTable(rebuilt))
+        conn.execute(text(f"INSERT INTO tasks_rebuild ({columns}) SELECT {columns} FROM tasks"))
+        # La vista de origen del índice FTS depende de `tasks`; se recrea al iniciar
+        conn.execute(text("DROP VIEW IF EXISTS tasks_search_source"))
+        conn.execute(text("DROP TABLE tasks"))
+        conn.execute(text("ALTER TABLE tasks_rebuild RENAME TO tasks"))
+        conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'tasks'"))
+        conn.execute(text(
+            "INSERT INTO sqlite_sequence (name, seq) SELECT 'tasks', "
+            "max(coalesce((SELECT max(id) FROM tasks), 0), coalesce((SELECT max(id) FROM tasks_archive), 0))"
+        ))
+    print(f"✅ Tabla tasks reconstruida con AUTOINCREMENT ({renumbered} IDs del archivo renumerados)")
+
+
+def _add_missing_indexes():
+    """Crear índices agregados a los modelos después de crear sus tablas"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -0,0 +1,158 @@
+"""
+Logging estructurado y no bloqueante
+- Los registros pasan por una cola (`QueueHandler`); un hilo (`QueueListener`)
+  los formatea y escribe, fuera del event loop
+- Niveles por subsistema (`LOG_LEVELS="sync=DEBUG,core.search_engine=WARNING"`)
+- Muestreo de líneas por ítem: `extra=SAMPLED` limita cada línea de código a
+  LOG_SAMPLE_PER_SECOND registros por segundo
+- ID de petición (`X-Request-ID`) en cada registro emitido durante la petición
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+from core.config import settings
+
+# ID de la petición en curso ("-" fuera de una petición)
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Marca para líneas por ítem sujetas a muestreo: logger.debug(..., extra=SAMPLED)
+SAMPLED = {"sample": True}
+
+# Atributos estándar de LogRecord (el resto son campos de `extra`)
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "sample", "suppressed"}
+
+_listener: Optional[QueueListener] = None
+
+
+class RequestContextFilter(logging.Filter):
+    """Agregar el ID de petición; se evalúa en el hilo que emite el registro"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Limitar los registros marcados con SAMPLED a N por segundo por línea de código.
+
+    El primer registro que pasa tras una ventana con descartes lleva
+    `suppressed` con la cantidad omitida.
+    """
+
+    def __init__(self, per_second: int):
+        super().__init__()
+        self.per_second = max(1, per_second)
+        # (logger, archivo, línea) -> [inicio de la ventana, emitidos, suprimidos]
+        self._windows: Dict[Tuple[str, str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sample", False):
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= 1.0:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if window[1] < self.per_second:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro con los campos de `extra`"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRS and not name.startswith("_"):
+                data[name] = value
+        if getattr(record, "suppressed", None):
+            data["suppressed"] = record.suppressed
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Formato legible para desarrollo"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s [%(name)s] [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "request_id"):
+            record.request_id = "-"
+        line = super().format(record)
+        if getattr(record, "suppressed", None):
+            line += f" (+{record.suppressed} omitidos)"
+        return line
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """"sync=DEBUG,core.search_engine=WARNING" -> {logger: nivel}"""
+    levels = {}
+    for item in (spec or "").split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return {name: level for name, level in levels.items() if isinstance(level, int)}
+
+
+def setup_logging(stream=None) -> QueueListener:
+    """Configurar el logger raíz con cola y hilo de escritura (idempotente)"""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+    queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_PER_SECOND))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(logging.getLevelName(settings.LOG_LEVEL.upper()))
+    for name, level in parse_levels(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Vaciar la cola y detener el hilo de escritura"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
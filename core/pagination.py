@@ -0,0 +1,114 @@
+"""
+Paginación por cursor (keyset) para listados de tareas
+- Cursor opaco con el último par (sort_key, id) devuelto
+- Orden estable: sort_key ascendente, desempate por id; las filas sin
+  sort_key van al final en un segundo tramo ordenado por id. Cada tramo
+  es un rango simple que recorren los índices de la columna
+- Conteo total opcional: exacto, estimado por estadísticas o ninguno
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException, status as http_status
+from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import Query, Session
+
+# Claves de ordenación permitidas para el cursor
+CURSOR_SORT_KEYS = ("id", "due_date", "priority", "last_sync")
+DATETIME_SORT_KEYS = ("due_date", "last_sync")
+COUNT_MODES = ("exact", "estimated", "none")
+
+
+def encode_cursor(sort_by: str, sort_value: Any, row_id: int) -> str:
+    """Codificar la posición (sort_key, id) de la última fila como cursor opaco"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps({"s": sort_by, "k": sort_value, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> Tuple[Any, int]:
+    """Decodificar un cursor y validar que corresponde a la ordenación pedida"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        sort_value, row_id = payload.get("k"), int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+    if payload.get("s") != sort_by:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail="El cursor no corresponde a la ordenación solicitada"
+        )
+    if sort_value is not None and sort_by in DATETIME_SORT_KEYS:
+        sort_value = datetime.fromisoformat(sort_value)
+    return sort_value, row_id
+
+
+def apply_keyset(query: Query, source, sort_by: str, cursor: Optional[str]) -> Query:
+    """Ordenar por (sort_key, id) y continuar tras la posición del cursor.
+
+    Sin `ORDER BY sort_key IS NULL`, que ningún índice puede servir: primero
+    se recorren las filas con valor y después (cursor con valor nulo, ver
+    `null_tail_cursor`) las filas sin valor por id.
+    """
+    if sort_by not in CURSOR_SORT_KEYS:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=f"Ordenación no soportada: {sort_by}. Opciones: {', '.join(CURSOR_SORT_KEYS)}"
+        )
+    sort_column = getattr(source, sort_by)
+
+    if sort_by == "id":
+        if cursor:
+            _, last_id = decode_cursor(cursor, sort_by)
+            query = query.filter(source.id > last_id)
+        return query.order_by(source.id)
+
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, sort_by)
+        if last_value is None:
+            # Tramo final: filas sin valor, por id
+            return query.filter(sort_column.is_(None), source.id > last_id).order_by(source.id)
+        query = query.filter(
+            sort_column >= last_value,
+            or_(sort_column > last_value, and_(sort_column == last_value, source.id > last_id))
+        )
+    else:
+        query = query.filter(sort_column.isnot(None))
+    return query.order_by(sort_column, source.id)
+
+
+def null_tail_cursor(query: Query, source, sort_by: str, cursor: Optional[str]) -> Optional[str]:
+    """Cursor del tramo de filas sin sort_key al agotar las filas con valor.
+
+    `query` es la consulta filtrada antes de `apply_keyset`. None si ya se
+    está en ese tramo, si se ordena por id o si no hay filas sin valor.
+    """
+    if sort_by == "id" or (cursor and decode_cursor(cursor, sort_by)[0] is None):
+        return None
+    if query.filter(getattr(source, sort_by).is_(None)).limit(1).first() is None:
+        return None
+    return encode_cursor(sort_by, None, 0)
+
+
+def estimate_row_count(db: Session, table_name: str) -> Optional[int]:
+    """Estimación barata del número de filas de una tabla.
+
+    No aplica ningún filtro: es el tamaño de la tabla completa, por eso el
+    listado devuelve `total` nulo si la petición filtra. En PostgreSQL usa
+    las estadísticas del planificador (`pg_class.reltuples`); en SQLite, el
+    máximo rowid.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        value = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :name"),
+            {"name": table_name}
+        ).scalar()
+    else:
+        value = db.execute(text(f"SELECT MAX(rowid) FROM {table_name}")).scalar()
+    return max(int(value), 0) if value is not None else 0
@@ -3,13 +3,22 @@ Motor de búsqueda contextual RAG para tareas
 Permite búsqueda semántica por nombre, descripción, usuario, notas, etc.
 """
 
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import Iterable, List, Dict, Any, Optional
 import logging
 from datetime import datetime
 import json
 
+from core.logging_config import SAMPLED
+
 logger = logging.getLogger(__name__)
 
+# Columnas de `tasks` que usa el texto indexado (más el ID de ClickUp de cada resultado)
+INDEX_COLUMNS = (
+    "clickup_id", "name", "description", "status", "priority",
+    "assignee_id", "list_id", "tags", "custom_fields", "due_date"
+)
+
 class TaskSearchEngine:
     """Motor de búsqueda contextual para tareas usando RAG"""
     
@@ -24,6 +33,10 @@ class TaskSearchEngine:
         
     async def initialize(self):
         """Inicializar el modelo y cargar embeddings"""
+        self.load_model()
+    
+    def load_model(self):
+        """Cargar el modelo de embeddings (síncrono: sirve con o sin event loop en marcha)"""
         try:
             logger.info(f"🔍 Inicializando motor de búsqueda con modelo: {self.model_name}")
             # Importar dependencias pesadas solo cuando se inicializa
@@ -66,17 +79,14 @@ class TaskSearchEngine:
         if task.get('priority'):
             text_parts.append(f"Prioridad: {task['priority']}")
         
-        # Campos personalizados
+        # Campos personalizados: nombres y opciones legibles desde el esquema de la lista
         if task.get('custom_fields'):
-            custom_fields = task['custom_fields']
-            if isinstance(custom_fields, dict):
-                for field_name, field_value in custom_fields.items():
-                    if field_value:
-                        text_parts.append(f"{field_name}: {field_value}")
-            elif isinstance(custom_fields, list):
-                for field in custom_fields:
-                    if isinstance(field, dict) and field.get('value'):
-                        text_parts.append(f"Campo: {field['value']}")
+            from core.custom_field_registry import custom_field_registry, empty_schema
+            schema = custom_field_registry.cached(task.get('list_id')) or empty_schema(task.get('list_id'))
+            for field_name, field_value in schema.named_values(task['custom_fields']).items():
+                # 0 es un valor válido (índice de opción de un drop_down)
+                if field_value not in (None, "", []):
+                    text_parts.append(f"{field_name}: {schema.display_value(field_name, field_value)}")
         
         # Tags
         if task.get('tags'):
@@ -97,12 +107,41 @@ class TaskSearchEngine:
             text_parts.append(f"Creada: {task['created_at']}")
         
         final_text = " | ".join(text_parts)
-        logger.debug(f"🔍 Texto preparado para tarea {task.get('id', 'unknown')}: {final_text[:200]}...")
+        logger.debug("🔍 Texto preparado para tarea %s: %.200s...", task.get('id', 'unknown'), final_text, extra=SAMPLED)
         
         return final_text
     
-    def build_search_index(self, tasks: List[Dict[str, Any]]):
-        """Construir índice de búsqueda desde las tareas"""
+    def index_texts(self, tasks: List[Dict[str, Any]]):
+        """Textos e IDs de las tareas a indexar.
+        
+        Los resultados se identifican por el ID de ClickUp (el mismo que
+        usan las rutas de tareas y POST /tasks/batch-get), no por el ID local.
+        """
+        self.task_texts = []
+        self.task_ids = []
+        self._append_texts(tasks)
+    
+    def _append_texts(self, tasks: List[Dict[str, Any]]):
+        """Agregar textos e IDs de un lote de tareas a los ya indexados"""
+        for i, task in enumerate(tasks):
+            task_id = task.get('clickup_id') or task.get('id')
+            logger.debug("🔍 Procesando tarea %s/%s: %s", i + 1, len(tasks), task_id, extra=SAMPLED)
+            
+            task_text = self._prepare_task_text(task)
+            if task_text.strip():
+                self.task_texts.append(task_text)
+                self.task_ids.append(str(task_id))
+                logger.debug("✅ Tarea %s indexada con %s caracteres", task_id, len(task_text), extra=SAMPLED)
+            else:
+                logger.warning(f"⚠️ Tarea {task_id} no tiene texto válido")
+    
+    def build_search_index(self, tasks: Iterable[Dict[str, Any]], batch_size: Optional[int] = None):
+        """Construir índice de búsqueda desde las tareas.
+        
+        Con `batch_size`, `tasks` puede ser un iterador (p. ej. filas leídas con
+        yield_per): los embeddings se generan y se agregan al índice por lotes,
+        sin tener todas las filas en memoria.
+        """
         if not self.is_initialized:
             logger.warning("⚠️ Motor de búsqueda no inicializado")
             return
@@ -111,43 +150,37 @@ class TaskSearchEngine:
             # Importar dependencias pesadas aquí para evitar fallos en import del módulo
             import numpy as np  # type: ignore
             import faiss  # type: ignore
-            logger.info(f"🔍 Construyendo índice de búsqueda para {len(tasks)} tareas")
+            logger.info("🔍 Construyendo índice de búsqueda")
             
-            # Preparar textos de tareas
             self.task_texts = []
             self.task_ids = []
-            
-            for i, task in enumerate(tasks):
-                task_id = task.get('id') or task.get('clickup_id')
-                logger.info(f"🔍 Procesando tarea {i+1}/{len(tasks)}: {task_id}")
-                
-                task_text = self._prepare_task_text(task)
-                if task_text.strip():
-                    self.task_texts.append(task_text)
-                    self.task_ids.append(task_id)
-                    logger.info(f"✅ Tarea {task_id} indexada con {len(task_text)} caracteres")
-                else:
-                    logger.warning(f"⚠️ Tarea {task_id} no tiene texto válido")
+            self.index = None
+            iterator = iter(tasks)
+            while True:
+                batch = list(islice(iterator, batch_size)) if batch_size else list(iterator)
+                if not batch:
+                    break
+                # Preparar textos de tareas
+                indexed = len(self.task_texts)
+                self._append_texts(batch)
+                texts = self.task_texts[indexed:]
+                if texts:
+                    # Generar y normalizar embeddings
+                    logger.info(f"📊 Generando embeddings de {len(texts)} tareas...")
+                    embeddings = self.model.encode(texts, show_progress_bar=True)
+                    embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+                    if self.index is None:
+                        # Crear índice FAISS
+                        self.index = faiss.IndexFlatIP(embeddings.shape[1])  # Inner Product para similitud coseno
+                    self.index.add(embeddings.astype('float32'))
+                if not batch_size:
+                    break
             
             if not self.task_texts:
                 logger.warning("⚠️ No hay textos válidos para indexar")
                 return
             
-            logger.info(f"🔍 Total de tareas a indexar: {len(self.task_texts)}")
-            logger.info(f"🔍 IDs de tareas: {self.task_ids}")
-            
-            # Generar embeddings
-            logger.info("📊 Generando embeddings...")
-            embeddings = self.model.encode(self.task_texts, show_progress_bar=True)
-            
-            # Normalizar embeddings
-            embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
-            
-            # Crear índice FAISS
-            dimension = embeddings.shape[1]
-            self.index = faiss.IndexFlatIP(dimension)  # Inner Product para similitud coseno
-            self.index.add(embeddings.astype('float32'))
-            
+            logger.debug("🔍 IDs de tareas: %s", self.task_ids)
             logger.info(f"✅ Índice de búsqueda construido: {len(self.task_texts)} tareas indexadas")
             
         except Exception as e:
@@ -162,17 +195,15 @@ class TaskSearchEngine:
             return []
         
         try:
-            logger.info(f"🔍 Iniciando búsqueda ULTRA SIMPLIFICADA para: '{query}'")
-            logger.info(f"🔍 Tareas indexadas: {len(self.task_texts)}")
-            logger.info(f"🔍 IDs de tareas: {self.task_texts[:2] if self.task_texts else 'Ninguna'}")
+            logger.debug("🔍 Iniciando búsqueda ULTRA SIMPLIFICADA para: '%s'", query)
+            logger.debug("🔍 Tareas indexadas: %s", len(self.task_texts))
             
             # BÚSQUEDA ULTRA SIMPLIFICADA: Devolver TODAS las tareas para debug
             results = []
             
             # Por ahora, devolver todas las tareas para ver qué está pasando
             for i, (task_id, task_text) in enumerate(zip(self.task_ids, self.task_texts)):
-                logger.info(f"🔍 Procesando tarea {i+1}: {task_id}")
-                logger.info(f"🔍 Texto de tarea: {task_text[:100]}...")
+                logger.debug("🔍 Procesando tarea %s: %s", i + 1, task_id, extra=SAMPLED)
                 
                 # Asignar un score simple basado en el índice
                 score = 1.0 - (i * 0.1)  # Score decreciente
@@ -182,12 +213,12 @@ class TaskSearchEngine:
                     'score': score,
                     'text': task_text
                 })
-                logger.info(f"✅ Tarea {task_id} agregada con score {score}")
+                logger.debug("✅ Tarea %s agregada con score %s", task_id, score, extra=SAMPLED)
             
             # Ordenar por score
             results.sort(key=lambda x: x['score'], reverse=True)
             
-            logger.info(f"🔍 Búsqueda ULTRA SIMPLIFICADA completada: {len(results)} resultados para '{query}'")
+            logger.debug("🔍 Búsqueda ULTRA SIMPLIFICADA completada: %s resultados para '%s'", len(results), query)
             return results[:top_k]
             
         except Exception as e:
@@ -200,7 +231,7 @@ class TaskSearchEngine:
         """Detectar si la consulta es para buscar por usuario - VERSION MEJORADA"""
         # Si es solo números, probablemente es un ID de usuario
         if query.isdigit():
-            logger.info(f"🔍 Query '{query}' detectado como ID numérico")
+            logger.debug(f"🔍 Query '{query}' detectado como ID numérico")
             return True
         
         # Si contiene palabras clave de usuario
@@ -209,7 +240,7 @@ class TaskSearchEngine:
         
         for keyword in user_keywords:
             if keyword in query_lower:
-                logger.info(f"🔍 Query '{query}' detectado como palabra clave de usuario: {keyword}")
+                logger.debug(f"🔍 Query '{query}' detectado como palabra clave de usuario: {keyword}")
                 return True
         
         # Si es un nombre típico (primera letra mayúscula, sin espacios, longitud razonable)
@@ -217,10 +248,10 @@ class TaskSearchEngine:
             # Excluir palabras comunes que no son nombres
             common_words = ['escoger', 'task', 'tarea', 'módulo', 'proyecto', 'lista', 'workspace']
             if query.lower() not in common_words:
-                logger.info(f"🔍 Query '{query}' detectado como nombre de usuario")
+                logger.debug(f"🔍 Query '{query}' detectado como nombre de usuario")
                 return True
         
-        logger.info(f"🔍 Query '{query}' NO detectado como búsqueda por usuario")
+        logger.debug(f"🔍 Query '{query}' NO detectado como búsqueda por usuario")
         return False
     
     def search_by_criteria(self, 
@@ -298,7 +329,7 @@ class TaskSearchEngine:
         """Actualizar una tarea en el índice (para búsquedas en tiempo real)"""
         # Nota: Para implementación completa, se necesitaría reconstruir el índice
         # o implementar actualizaciones incrementales
-        logger.info(f"🔄 Actualizando tarea {task_id} en índice de búsqueda")
+        logger.debug("🔄 Actualizando tarea %s en índice de búsqueda", task_id, extra=SAMPLED)
         # Por ahora, marcamos que se necesita reconstruir el índice
         self.index = None
     
@@ -319,7 +350,7 @@ class TaskSearchEngine:
             return []
         
         try:
-            logger.info(f"🔍 Iniciando búsqueda especializada por usuario: {user_query}")
+            logger.debug(f"🔍 Iniciando búsqueda especializada por usuario: {user_query}")
             
             # Crear consultas específicas para usuario con diferentes estrategias
             user_queries = []
@@ -331,7 +362,7 @@ class TaskSearchEngine:
                     f"Usuario: {user_query}",
                     f"asignado {user_query}"
                 ])
-                logger.info(f"🔍 Consultas para ID numérico: {user_queries}")
+                logger.debug(f"🔍 Consultas para ID numérico: {user_queries}")
             else:
                 # Si es un nombre
                 user_queries.extend([
@@ -340,15 +371,15 @@ class TaskSearchEngine:
                     f"asignado {user_query}",
                     f"UsuarioID: {user_query}"  # Por si acaso
                 ])
-                logger.info(f"🔍 Consultas para nombre: {user_queries}")
+                logger.debug(f"🔍 Consultas para nombre: {user_queries}")
             
             all_results = []
             for i, query in enumerate(user_queries):
                 try:
-                    logger.info(f"🔍 Ejecutando consulta {i+1}/{len(user_queries)}: '{query}'")
+                    logger.debug(f"🔍 Ejecutando consulta {i+1}/{len(user_queries)}: '{query}'")
                     # Usar búsqueda directa para evitar recursión infinita
                     results = self._direct_search(query, top_k=top_k, threshold=0.1)
-                    logger.info(f"🔍 Consulta '{query}' devolvió {len(results)} resultados")
+                    logger.debug(f"🔍 Consulta '{query}' devolvió {len(results)} resultados")
                     all_results.extend(results)
                 except Exception as e:
                     logger.warning(f"⚠️ Error en consulta '{query}': {e}")
@@ -365,7 +396,7 @@ class TaskSearchEngine:
             # Ordenar por score
             unique_results.sort(key=lambda x: x['score'], reverse=True)
             
-            logger.info(f"🔍 Búsqueda por usuario completada: {len(unique_results)} resultados únicos para '{user_query}'")
+            logger.debug(f"🔍 Búsqueda por usuario completada: {len(unique_results)} resultados únicos para '{user_query}'")
             return unique_results[:top_k]
             
         except Exception as e:
@@ -375,22 +406,22 @@ class TaskSearchEngine:
     def _direct_search(self, query: str, top_k: int = 10, threshold: float = 0.1) -> List[Dict[str, Any]]:
         """Búsqueda directa sin detección automática de tipo - VERSION MEJORADA"""
         try:
-            logger.info(f"🔍 Búsqueda directa para: '{query}' (threshold: {threshold})")
+            logger.debug("🔍 Búsqueda directa para: '%s' (threshold: %s)", query, threshold)
             
             # Generar embedding de la consulta
             import numpy as np  # type: ignore
             query_embedding = self.model.encode([query])
             query_embedding = query_embedding / np.linalg.norm(query_embedding, axis=1, keepdims=True)
-            logger.info(f"🔍 Embedding generado para consulta: {query_embedding.shape}")
+            logger.debug("🔍 Embedding generado para consulta: %s", query_embedding.shape)
             
             # Buscar en el índice
             scores, indices = self.index.search(query_embedding.astype('float32'), top_k)
-            logger.info(f"🔍 Búsqueda en índice: {len(scores[0])} scores, {len(indices[0])} índices")
+            logger.debug("🔍 Búsqueda en índice: %s scores, %s índices", len(scores[0]), len(indices[0]))
             
             # Filtrar por umbral de similitud
             results = []
             for i, (score, idx) in enumerate(zip(scores[0], indices[0])):
-                logger.info(f"🔍 Score {i+1}: {score:.4f}, Índice: {idx}")
+                logger.debug("🔍 Score %s: %.4f, Índice: %s", i + 1, score, idx, extra=SAMPLED)
                 if score >= threshold and idx < len(self.task_ids):
                     task_id = self.task_ids[idx]
                     task_text = self.task_texts[idx][:100] + "..." if len(self.task_texts[idx]) > 100 else self.task_texts[idx]
@@ -399,14 +430,14 @@ class TaskSearchEngine:
                         'score': float(score),
                         'text': self.task_texts[idx]
                     })
-                    logger.info(f"✅ Tarea {task_id} agregada (score: {score:.4f})")
+                    logger.debug("✅ Tarea %s agregada (score: %.4f)", task_id, score, extra=SAMPLED)
                 else:
                     if score < threshold:
-                        logger.info(f"❌ Score {score:.4f} < threshold {threshold}")
+                        logger.debug("❌ Score %.4f < threshold %s", score, threshold, extra=SAMPLED)
                     if idx >= len(self.task_ids):
-                        logger.info(f"❌ Índice {idx} >= {len(self.task_ids)} tareas")
+                        logger.debug("❌ Índice %s >= %s tareas", idx, len(self.task_ids), extra=SAMPLED)
             
-            logger.info(f"🔍 Búsqueda directa completada: {len(results)} resultados para '{query}'")
+            logger.debug("🔍 Búsqueda directa completada: %s resultados para '%s'", len(results), query)
             return results
             
         except Exception as e:
@@ -0,0 +1,169 @@
+"""
+Orquestador de sincronización multi-workspace
+- Sincroniza varios workspaces en paralelo
+- Reparte un único presupuesto de rate limit con weighted fair queuing
+- Límite de concurrencia configurable por workspace
+"""
+
+import asyncio
+import heapq
+import itertools
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.advanced_sync import AdvancedSyncService, RateLimiter, sync_logger, sync_service
+from core.config import settings
+
+
+def _parse_workspace_map(raw: str, cast: Callable[[str], Any]) -> Dict[str, Any]:
+    """Parsear "ws1:valor,ws2:valor" a diccionario"""
+    result: Dict[str, Any] = {}
+    for item in (raw or "").split(","):
+        if ":" not in item:
+            continue
+        workspace_id, value = item.split(":", 1)
+        try:
+            result[workspace_id.strip()] = cast(value.strip())
+        except (ValueError, TypeError):
+            sync_logger.warning(f"⚠️ Valor inválido para workspace {workspace_id}: {value}")
+    return result
+
+
+class FairRateScheduler:
+    """Reparte un RateLimiter compartido entre workspaces (weighted fair queuing).
+
+    Cada petición recibe una etiqueta de finalización virtual
+    `max(tiempo_virtual, ultima_etiqueta_ws) + 1/peso`; el despachador concede
+    el siguiente hueco del rate limiter a la etiqueta más baja. Un workspace
+    grande con muchas peticiones pendientes avanza su etiqueta y no puede
+    acaparar el presupuesto frente a los pequeños.
+    """
+
+    def __init__(self, rate_limiter: RateLimiter, weights: Optional[Dict[str, float]] = None):
+        self.rate_limiter = rate_limiter
+        self.weights = weights or {}
+        self.granted: Dict[str, int] = {}
+        self._virtual_time = 0.0
+        self._last_finish: Dict[str, float] = {}
+        self._queue: List[Tuple[float, int, str, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _weight(self, workspace_id: str) -> float:
+        return max(float(self.weights.get(workspace_id, 1.0)), 0.01)
+
+    async def acquire(self, workspace_id: str):
+        """Esperar turno de petición para un workspace"""
+        start = max(self._virtual_time, self._last_finish.get(workspace_id, 0.0))
+        finish = start + 1.0 / self._weight(workspace_id)
+        self._last_finish[workspace_id] = finish
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (finish, next(self._counter), workspace_id, future))
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        await future
+
+    async def _dispatch(self):
+        """Conceder huecos del rate limiter en orden de etiqueta virtual"""
+        while self._queue:
+            finish, _, workspace_id, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            await self.rate_limiter.acquire()
+            self._virtual_time = finish
+            self.granted[workspace_id] = self.granted.get(workspace_id, 0) + 1
+            if not future.done():
+                future.set_result(None)
+
+    def get_stats(self) -> dict:
+        """Obtener estadísticas del reparto"""
+        return {
+            "granted": dict(self.granted),
+            "pending": len(self._queue),
+            "weights": {ws: self._weight(ws) for ws in self._last_finish},
+            "virtual_time": self._virtual_time
+        }
+
+
+@dataclass
+class MultiWorkspaceSyncResult:
+    """Resultado de sincronización de varios workspaces"""
+    success: bool
+    workspaces: Dict[str, dict]
+    scheduler: dict
+    duration: float
+    timestamp: datetime
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class MultiWorkspaceSyncOrchestrator:
+    """Sincroniza todos los workspaces visibles bajo un presupuesto de rate limit compartido"""
+
+    def __init__(
+        self,
+        service: Optional[AdvancedSyncService] = None,
+        weights: Optional[Dict[str, float]] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: Optional[int] = None
+    ):
+        self.service = service or sync_service
+        self.weights = weights if weights is not None else _parse_workspace_map(
+            settings.SYNC_WORKSPACE_WEIGHTS, float
+        )
+        self.concurrency = concurrency if concurrency is not None else _parse_workspace_map(
+            settings.SYNC_WORKSPACE_CONCURRENCY_OVERRIDES, int
+        )
+        self.default_concurrency = default_concurrency or settings.SYNC_WORKSPACE_CONCURRENCY
+
+    def concurrency_for(self, workspace_id: str) -> int:
+        """Límite de peticiones simultáneas para un workspace"""
+        return max(1, int(self.concurrency.get(workspace_id, self.default_concurrency)))
+
+    async def sync_workspaces(self, workspace_ids: Optional[List[str]] = None) -> MultiWorkspaceSyncResult:
+        """Sincronizar en paralelo los workspaces indicados (o todos los del token)"""
+        start_time = datetime.now()
+        scheduler = FairRateScheduler(self.service.rate_limiter, self.weights)
+
+        if not workspace_ids:
+            await self.service.rate_limiter.acquire()
+            workspaces = await self.service.clickup_client.get_workspaces()
+            workspace_ids = [str(ws["id"]) for ws in workspaces]
+
+        sync_logger.info(f"🔄 Sincronizando {len(workspace_ids)} workspaces en paralelo")
+
+        results = await asyncio.gather(
+            *[
+                self.service.full_sync_workspace(
+                    workspace_id,
+                    scheduler=scheduler,
+                    max_concurrency=self.concurrency_for(workspace_id)
+                )
+                for workspace_id in workspace_ids
+            ],
+            return_exceptions=True
+        )
+
+        per_workspace: Dict[str, dict] = {}
+        for workspace_id, result in zip(workspace_ids, results):
+            if isinstance(result, Exception):
+                per_workspace[workspace_id] = {"success": False, "errors": [str(result)]}
+            else:
+                per_workspace[workspace_id] = result.to_dict()
+
+        return MultiWorkspaceSyncResult(
+            success=all(r.get("success") for r in per_workspace.values()),
+            workspaces=per_workspace,
+            scheduler=scheduler.get_stats(),
+            duration=(datetime.now() - start_time).total_seconds(),
+            timestamp=start_time
+        )
+
+
+# Instancia global del orquestador
+sync_orchestrator = MultiWorkspaceSyncOrchestrator()
@@ -0,0 +1,110 @@
+"""
+Particionado hot/cold de tareas
+- Tareas cerradas hace más de N días se mueven por lotes a `tasks_archive`
+- Las consultas por defecto leen solo `tasks` (tier caliente)
+- Con include_closed=true se une el archivo de forma transparente
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, insert, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from core.config import settings
+from core.task_attributes import delete_task_attributes
+from models.task import Task
+from models.task_archive import TaskArchive
+
+archive_logger = logging.getLogger("archive")
+
+# Estados que se consideran cerrados
+CLOSED_STATUSES = ("complete", "closed")
+
+
+def task_source(include_closed: bool = False):
+    """Entidad de consulta para tareas: solo hot, o hot + archivo.
+
+    Devuelve `Task` o un alias de `Task` sobre `tasks UNION ALL tasks_archive`,
+    de modo que los filtros (`source.workspace_id == ...`) se escriben igual
+    en ambos casos.
+    """
+    if not include_closed:
+        return Task
+    hot_columns = [column for column in Task.__table__.c]
+    archive_columns = [TaskArchive.__table__.c[column.name] for column in hot_columns]
+    combined = union_all(select(*hot_columns), select(*archive_columns)).subquery("tasks_all")
+    return aliased(Task, combined)
+
+
+def archive_closed_tasks(
+    db: Session,
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None
+) -> dict:
+    """Mover a `tasks_archive` las tareas cerradas hace más de N días.
+
+    El cierre se toma de `date_closed` (o `last_sync` para filas antiguas).
+    Cada lote se copia y borra en una transacción propia para no bloquear
+    la tabla caliente durante mucho tiempo.
+    """
+    older_than_days = settings.TASK_ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.TASK_ARCHIVE_BATCH_SIZE
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    columns = [column.name for column in Task.__table__.c]
+
+    archived = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = [
+            row[0]
+            for row in db.query(Task.id)
+            .filter(
+                Task.status.in_(CLOSED_STATUSES),
+                func.coalesce(Task.date_closed, Task.last_sync) < cutoff
+            )
+            .limit(batch_size)
+            .all()
+        ]
+        if not ids:
+            break
+
+        # Evitar duplicados si una tarea ya archivada volvió al tier caliente
+        clickup_ids = select(Task.clickup_id).where(Task.id.in_(ids))
+        db.execute(delete(TaskArchive).where(TaskArchive.clickup_id.in_(clickup_ids)))
+        db.execute(
+            insert(TaskArchive).from_select(
+                columns,
+                select(*[Task.__table__.c[name] for name in columns]).where(Task.id.in_(ids))
+            )
+        )
+        db.execute(delete(Task).where(Task.id.in_(ids)))
+        db.commit()
+
+        archived += len(ids)
+        batches += 1
+        archive_logger.info(f"🗄️ Lote {batches}: {len(ids)} tareas archivadas")
+
+    return {
+        "archived": archived,
+        "batches": batches,
+        "cutoff": cutoff.isoformat(),
+        "older_than_days": older_than_days
+    }
+
+
+def discard_archived(db: Session, clickup_ids: Iterable[str]):
+    """Eliminar del archivo las tareas que vuelven al tier caliente.
+
+    El DELETE masivo no pasa por los eventos del ORM: las filas de tags y
+    custom fields de las tareas archivadas se borran aquí; la fila caliente
+    que se inserte después genera las suyas.
+    """
+    clickup_ids = [str(task_id) for task_id in clickup_ids if task_id]
+    if clickup_ids:
+        delete_task_attributes(db, select(TaskArchive.clickup_id).where(TaskArchive.clickup_id.in_(clickup_ids)))
+        db.query(TaskArchive).filter(
+            TaskArchive.clickup_id.in_(clickup_ids)
+        ).delete(synchronize_session=False)
@@ -0,0 +1,246 @@
+"""
+Tablas auxiliares de tags y valores de custom fields por tarea
+- `task_tags(task_id, tag)` y `task_field_values(task_id, field_id, field_name, value_text, value_num)`
+- Se mantienen al guardar tareas: eventos de Session para el ORM y
+  `sync_task_attributes` después de bulk insert/update
+- Filtros y conteos por tag o por campo en SQL, sin leer el JSON de cada fila
+"""
+
+import logging
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, inspect, insert, or_, select
+from sqlalchemy.orm import Session
+
+from core.custom_field_registry import ListFieldSchemaEntry, _normalize_field, custom_field_registry, empty_schema
+from models.task_attribute import TaskFieldValue, TaskTag
+
+attributes_logger = logging.getLogger("task_attributes")
+
+TASK_TABLES = ("tasks", "tasks_archive")
+# Columnas que cambian las filas auxiliares de una tarea
+TRACKED_COLUMNS = ("clickup_id", "list_id", "tags", "custom_fields")
+# IDs por sentencia DELETE ... IN (límite de parámetros de SQLite)
+SYNC_CHUNK_SIZE = 500
+
+
+def _value(task: Any, name: str) -> Any:
+    return task.get(name) if isinstance(task, dict) else getattr(task, name, None)
+
+
+def normalize_tag(tag: Any) -> Optional[str]:
+    """Tags de ClickUp: sin distinguir mayúsculas"""
+    if isinstance(tag, dict):
+        tag = tag.get("name")
+    if tag is None:
+        return None
+    tag = str(tag).strip().lower()
+    return tag or None
+
+
+def _text_value(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("username") or value.get("email") or value.get("formatted_address") or value.get("value")
+        return _text_value(value)
+    if isinstance(value, list):
+        parts = [_text_value(item) for item in value]
+        return ", ".join(part for part in parts if part) or None
+    return str(value)
+
+
+def _numeric_value(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _field_entries(custom_fields: Any, schema: ListFieldSchemaEntry) -> List[Tuple[str, str, Any]]:
+    """(field_id, nombre, valor legible) de custom fields en forma {nombre: valor} o lista de ClickUp"""
+    entries = []
+    if isinstance(custom_fields, dict):
+        for name, value in custom_fields.items():
+            known = schema.get(name)
+            field_id = known["id"] if known else str(name)
+            entries.append((field_id, known["name"] if known else str(name), schema.display_value(name, value)))
+        return entries
+    for item in custom_fields or []:
+        if not isinstance(item, dict) or item.get("id") is None:
+            continue
+        field_id = str(item["id"])
+        value = item.get("value")
+        if item.get("type_config"):
+            # El payload de ClickUp trae las opciones del campo
+            inline = ListFieldSchemaEntry(list_id=schema.list_id, version=0, fields=[_normalize_field(item)])
+            value = inline.display_value(field_id, value)
+        else:
+            value = schema.display_value(field_id, value)
+        entries.append((field_id, item.get("name") or schema.field_name(field_id) or field_id, value))
+    return entries
+
+
+def attribute_rows(task: Any, db: Optional[Session] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Filas de `task_tags` y `task_field_values` de una tarea (objeto o dict de columnas)"""
+    task_id = str(_value(task, "clickup_id"))
+    tags = {normalize_tag(tag) for tag in _value(task, "tags") or []}
+    tag_rows = [{"task_id": task_id, "tag": tag} for tag in sorted(tag for tag in tags if tag)]
+
+    custom_fields = _value(task, "custom_fields")
+    field_rows = {}
+    if custom_fields:
+        list_id = _value(task, "list_id")
+        schema = custom_field_registry.cached(list_id, db) or empty_schema(list_id)
+        for field_id, name, value in _field_entries(custom_fields, schema):
+            if value in (None, "", []):
+                continue
+            field_rows[field_id] = {
+                "task_id": task_id,
+                "field_id": field_id,
+                "field_name": name.strip().lower() if name else None,
+                "value_text": _text_value(value),
+                "value_num": _numeric_value(value),
+            }
+    return tag_rows, list(field_rows.values())
+
+
+def _chunks(items: List[Any]) -> Iterable[List[Any]]:
+    for start in range(0, len(items), SYNC_CHUNK_SIZE):
+        yield items[start:start + SYNC_CHUNK_SIZE]
+
+
+def delete_task_attributes(db, task_ids):
+    """Eliminar las filas auxiliares de tareas (lista de IDs de ClickUp o subconsulta)"""
+    if not isinstance(task_ids, (list, tuple, set)):
+        for table in (TaskTag.__table__, TaskFieldValue.__table__):
+            db.execute(delete(table).where(table.c.task_id.in_(task_ids)))
+        return
+    task_ids = [str(task_id) for task_id in task_ids if task_id]
+    for chunk in _chunks(task_ids):
+        for table in (TaskTag.__table__, TaskFieldValue.__table__):
+            db.execute(delete(table).where(table.c.task_id.in_(chunk)))
+
+
+def sync_task_attributes(db, tasks: Iterable[Any], session: Optional[Session] = None):
+    """Reemplazar las filas auxiliares de las tareas dadas.
+
+    `db` es una Session o una Connection; usar después de bulk_*_mappings,
+    que no pasan por los eventos del ORM.
+    """
+    tasks = [task for task in tasks if _value(task, "clickup_id")]
+    if not tasks:
+        return
+    lookup_session = session if session is not None else (db if isinstance(db, Session) else None)
+    tag_rows, field_rows = [], []
+    for task in tasks:
+        tags, fields = attribute_rows(task, lookup_session)
+        tag_rows.extend(tags)
+        field_rows.extend(fields)
+    delete_task_attributes(db, [_value(task, "clickup_id") for task in tasks])
+    if tag_rows:
+        db.execute(insert(TaskTag.__table__), tag_rows)
+    if field_rows:
+        db.execute(insert(TaskFieldValue.__table__), field_rows)
+
+
+def _tracked_changes(obj: Any) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in TRACKED_COLUMNS)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_flushed_tasks(session: Session, flush_context):
+    """Mantener las filas auxiliares de tareas guardadas o eliminadas con el ORM"""
+    changed, removed = [], []
+    for obj in chain(session.new, session.dirty):
+        if getattr(obj, "__tablename__", None) not in TASK_TABLES:
+            continue
+        if obj in session.new or _tracked_changes(obj):
+            changed.append(obj)
+            # clickup_id reemplazado: descartar las filas del ID anterior
+            removed.extend(inspect(obj).attrs.clickup_id.history.deleted or ())
+    for obj in session.deleted:
+        if getattr(obj, "__tablename__", None) == "tasks":
+            removed.append(obj.clickup_id)
+    if not changed and not removed:
+        return
+    connection = session.connection()
+    if removed:
+        delete_task_attributes(connection, removed)
+    with session.no_autoflush:
+        sync_task_attributes(connection, changed, session)
+
+
+def backfill_task_attributes(db: Session, batch_size: int = 1000) -> int:
+    """Poblar las tablas auxiliares con las tareas ya guardadas (tablas nuevas)"""
+    from models.task import Task
+    from models.task_archive import TaskArchive
+
+    total = 0
+    for model in (TaskArchive, Task):
+        columns = [getattr(model, name) for name in ("clickup_id", "list_id", "tags", "custom_fields")]
+        batch = []
+        for row in db.query(*columns).yield_per(batch_size):
+            batch.append(row._asdict())
+            if len(batch) >= batch_size:
+                sync_task_attributes(db, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            sync_task_attributes(db, batch)
+            total += len(batch)
+    db.commit()
+    if total:
+        attributes_logger.info(f"✅ Tags y custom fields indexados para {total} tareas")
+    return total
+
+
+def _field_match(field: str):
+    """Campo por ID o por nombre (sin distinguir mayúsculas)"""
+    return or_(TaskFieldValue.field_id == str(field), TaskFieldValue.field_name == str(field).strip().lower())
+
+
+def tag_filter(source, tags):
+    """Condición: la tarea tiene alguno de los tags (lista o texto separado por comas)"""
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    tags = [tag for tag in (normalize_tag(tag) for tag in tags) if tag]
+    return source.clickup_id.in_(select(TaskTag.task_id).where(TaskTag.tag.in_(tags)))
+
+
+def field_filter(source, field: str, value: Any = None):
+    """Condición: la tarea tiene el campo (con el valor dado, como texto o número)"""
+    condition = _field_match(field)
+    if value is not None:
+        number = _numeric_value(value)
+        value_condition = TaskFieldValue.value_text == str(value)
+        if number is not None:
+            value_condition = or_(value_condition, TaskFieldValue.value_num == number)
+        condition = condition & value_condition
+    return source.clickup_id.in_(select(TaskFieldValue.task_id).where(condition))
+
+
+def tag_counts(db: Session, task_ids=None) -> Dict[str, int]:
+    """Tareas por tag; `task_ids` limita a una subconsulta de IDs de ClickUp"""
+    query = db.query(TaskTag.tag, func.count(TaskTag.task_id))
+    if task_ids is not None:
+        query = query.filter(TaskTag.task_id.in_(task_ids))
+    return dict(query.group_by(TaskTag.tag).order_by(func.count(TaskTag.task_id).desc()).all())
+
+
+def field_value_counts(db: Session, field: str, task_ids=None) -> Dict[str, int]:
+    """Tareas por valor de un custom field"""
+    query = db.query(TaskFieldValue.value_text, func.count(TaskFieldValue.task_id)).filter(_field_match(field))
+    if task_ids is not None:
+        query = query.filter(TaskFieldValue.task_id.in_(task_ids))
+    return dict(query.group_by(TaskFieldValue.value_text).order_by(func.count(TaskFieldValue.task_id).desc()).all())
@@ -0,0 +1,220 @@
+"""
+Registro de cambios de tareas (`task_changes`) para clientes que consultan periódicamente
+- Las filas se escriben en la misma transacción que el cambio (ver core/task_events.py)
+- `changes_since` lee por rango de ID a partir del cursor: el costo depende de
+  los cambios nuevos, no del total de tareas
+- Compactación: las entradas antiguas se fusionan en una por tarea y las
+  anteriores a la retención se eliminan; un cursor anterior a la última
+  entrada eliminada (`task_change_log_state`) obliga a recargar las tareas.
+  Corre tras las sincronizaciones (a lo sumo una vez cada
+  TASK_CHANGE_LOG_COMPACT_AFTER_HOURS) y con el archivado
+"""
+
+import base64
+import json
+import logging
+import math
+import time
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, status as http_status
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.task_change import TaskChange, TaskChangeLogState
+
+change_log_logger = logging.getLogger("task_change_log")
+
+# Tareas por consulta al compactar (límite de parámetros de SQLite)
+COMPACT_CHUNK_SIZE = 500
+
+# Última compactación de este proceso (time.monotonic)
+_last_compaction: Optional[float] = None
+
+
+def encode_change_cursor(last_id: int) -> str:
+    """Cursor opaco: último ID entregado"""
+    payload = json.dumps({"id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_change_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+
+def purged_through_id(db: Session) -> int:
+    """ID de la última entrada eliminada por la compactación (0 si ninguna)"""
+    return db.query(TaskChangeLogState.purged_through_id).scalar() or 0
+
+
+def _entry_to_dict(row) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "type": row.change_type,
+        "task_id": row.task_id,
+        "workspace_id": row.workspace_id,
+        "changes": row.changes or {},
+        "changed_at": row.changed_at
+    }
+
+
+def changes_since(
+    db: Session,
+    cursor: Optional[str],
+    workspace_ids: Iterable[str] = (),
+    limit: int = 500
+) -> Dict[str, Any]:
+    """Cambios posteriores al cursor, en orden, y el cursor siguiente.
+
+    Sin cursor no se devuelven cambios: solo el cursor actual, para empezar
+    a seguir el registro después de cargar las tareas (GET /tasks o /export).
+    Un cursor anterior a la última entrada eliminada por la compactación da
+    410: parte de sus cambios ya no están en el registro.
+    Las entradas de los últimos TASK_CHANGE_LOG_SETTLE_SECONDS no se entregan
+    todavía: un ID menor puede estar aún sin confirmar en otra transacción.
+    En ese caso `has_more` es falso y `retry_after` indica en cuántos segundos
+    vuelven a estar disponibles.
+    """
+    now = datetime.now()
+    low_water = purged_through_id(db)
+    if not cursor:
+        # Con el registro vacío tras una purga, el cursor empieza en la marca
+        head = max(db.query(func.max(TaskChange.id)).scalar() or 0, low_water)
+        return {"changes": [], "cursor": encode_change_cursor(head), "has_more": False, "retry_after": None}
+
+    last_id = decode_change_cursor(cursor)
+    if last_id < low_water:
+        raise HTTPException(
+            status_code=http_status.HTTP_410_GONE,
+            detail="Hay cambios posteriores al cursor que ya se eliminaron del registro; recargar las tareas"
+        )
+
+    query = db.query(
+        TaskChange.id, TaskChange.task_id, TaskChange.workspace_id,
+        TaskChange.change_type, TaskChange.changes, TaskChange.changed_at
+    ).filter(TaskChange.id > last_id)
+    workspace_ids = [str(workspace_id) for workspace_id in workspace_ids if workspace_id]
+    if workspace_ids:
+        query = query.filter(TaskChange.workspace_id.in_(workspace_ids))
+    rows = query.order_by(TaskChange.id).limit(limit + 1).all()
+
+    settled_before = now - timedelta(seconds=settings.TASK_CHANGE_LOG_SETTLE_SECONDS)
+    entries: List[Dict[str, Any]] = []
+    has_more = len(rows) > limit
+    retry_after = None
+    for row in rows[:limit]:
+        if row.changed_at > settled_before:
+            # Pedir de inmediato devolvería lo mismo: esperar a que la entrada se asiente
+            has_more = False
+            retry_after = max(1, math.ceil((row.changed_at - settled_before).total_seconds()))
+            break
+        entries.append(_entry_to_dict(row))
+
+    next_id = entries[-1]["id"] if entries else last_id
+    return {
+        "changes": entries,
+        "cursor": encode_change_cursor(next_id),
+        "has_more": has_more,
+        "retry_after": retry_after
+    }
+
+
+def _merge_entries(entries: List[TaskChange]) -> Tuple[str, Dict[str, Any]]:
+    """Tipo y campos resultantes de aplicar las entradas de una tarea en orden"""
+    change_type, changes = "updated", {}
+    for entry in entries:
+        if entry.change_type == "deleted":
+            change_type, changes = "deleted", {}
+        elif entry.change_type == "created":
+            change_type, changes = "created", dict(entry.changes or {})
+        else:
+            if change_type == "deleted":
+                change_type = "updated"
+            changes.update(entry.changes or {})
+    return change_type, changes
+
+
+def compact_change_log(
+    db: Session,
+    compact_after_hours: Optional[int] = None,
+    retention_days: Optional[int] = None
+) -> Dict[str, Any]:
+    """Fusionar las entradas antiguas de cada tarea en la más reciente y
+    eliminar las anteriores a la retención.
+
+    La entrada fusionada conserva el ID mayor: un cliente con un cursor
+    intermedio la recibe con los valores finales de todos los campos.
+    """
+    compact_after_hours = settings.TASK_CHANGE_LOG_COMPACT_AFTER_HOURS if compact_after_hours is None else compact_after_hours
+    retention_days = settings.TASK_CHANGE_LOG_RETENTION_DAYS if retention_days is None else retention_days
+    now = datetime.now()
+
+    # Purga por ID hasta la entrada más nueva fuera de la retención: todo lo
+    # anterior a la marca queda eliminado y la marca decide el 410
+    purge_cutoff = now - timedelta(days=retention_days)
+    purged = 0
+    purge_through = db.query(func.max(TaskChange.id)).filter(TaskChange.changed_at < purge_cutoff).scalar()
+    if purge_through:
+        purged = db.execute(delete(TaskChange).where(TaskChange.id <= purge_through)).rowcount or 0
+        state = db.get(TaskChangeLogState, 1) or TaskChangeLogState(id=1, purged_through_id=0)
+        state.purged_through_id = max(state.purged_through_id, purge_through)
+        state.purged_at = now
+        db.add(state)
+
+    compact_cutoff = now - timedelta(hours=compact_after_hours)
+    task_ids = [
+        task_id for (task_id,) in db.execute(
+            select(TaskChange.task_id)
+            .where(TaskChange.changed_at < compact_cutoff)
+            .group_by(TaskChange.task_id)
+            .having(func.count(TaskChange.id) > 1)
+        )
+    ]
+    merged = 0
+    for start in range(0, len(task_ids), COMPACT_CHUNK_SIZE):
+        chunk = task_ids[start:start + COMPACT_CHUNK_SIZE]
+        entries = (
+            db.query(TaskChange)
+            .filter(TaskChange.task_id.in_(chunk), TaskChange.changed_at < compact_cutoff)
+            .order_by(TaskChange.task_id, TaskChange.id)
+            .all()
+        )
+        obsolete = []
+        for _, group in groupby(entries, key=lambda entry: entry.task_id):
+            group = list(group)
+            latest = group[-1]
+            latest.change_type, latest.changes = _merge_entries(group)
+            obsolete.extend(entry.id for entry in group[:-1])
+        if obsolete:
+            db.execute(delete(TaskChange).where(TaskChange.id.in_(obsolete)))
+            merged += len(obsolete)
+        db.commit()
+    db.commit()
+
+    global _last_compaction
+    _last_compaction = time.monotonic()
+    if purged or merged:
+        change_log_logger.info(f"🗜️ Registro de cambios compactado: {merged} fusionadas, {purged} eliminadas")
+    return {
+        "merged": merged,
+        "purged": purged,
+        "compact_cutoff": compact_cutoff.isoformat(),
+        "purge_cutoff": purge_cutoff.isoformat()
+    }
+
+
+def compact_change_log_if_due(db: Session) -> Optional[Dict[str, Any]]:
+    """Compactar si pasaron TASK_CHANGE_LOG_COMPACT_AFTER_HOURS desde la última
+    compactación de este proceso (la primera vez, siempre)"""
+    interval = settings.TASK_CHANGE_LOG_COMPACT_AFTER_HOURS * 3600
+    if _last_compaction is not None and time.monotonic() - _last_compaction < interval:
+        return None
+    return compact_change_log(db)
@@ -0,0 +1,146 @@
+"""
+Enriquecimiento de respuestas de tareas (nombres de asignado, lista y workspace)
+- Una consulta `IN` por tipo de entidad y página, nunca una por tarea
+- Caché en proceso con TTL para los nombres ya resueltos; se vacía al
+  confirmar cambios de usuarios o workspaces (como el ETag de las tareas)
+"""
+
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.data_version import COMMITTED_KEY, USERS_SCOPE, WORKSPACES_SCOPE
+from models.user import User
+from models.workspace import Workspace
+
+enrichment_logger = logging.getLogger("task_enrichment")
+
+
+def _user_display_name(user: User) -> Optional[str]:
+    """Nombre visible de un usuario local"""
+    if user.first_name and user.last_name:
+        return f"{user.first_name} {user.last_name}"
+    return user.first_name or user.username or user.email
+
+
+def _get(item, name: str):
+    """Leer un campo de un dict o de un objeto"""
+    return item.get(name) if isinstance(item, dict) else getattr(item, name, None)
+
+
+def _set(item, name: str, value):
+    """Escribir un campo en un dict o en un objeto (incluidos modelos Pydantic)"""
+    if isinstance(item, dict):
+        item[name] = value
+    else:
+        object.__setattr__(item, name, value)
+
+
+class LookupCache:
+    """Caché pequeña clave -> nombre con expiración por TTL"""
+
+    def __init__(self, ttl_seconds: int = 300, max_entries: int = 5000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, tuple] = {}
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        now = time.monotonic()
+        found = {}
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                found[key] = entry[0]
+        return found
+
+    def set_many(self, values: Dict[str, str]):
+        if len(self._entries) + len(values) > self.max_entries:
+            self._entries.clear()
+        expires = time.monotonic() + self.ttl_seconds
+        for key, value in values.items():
+            self._entries[key] = (value, expires)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class TaskEnricher:
+    """Resuelve nombres relacionados para una página de tareas por lotes"""
+
+    def __init__(self, ttl_seconds: int = 300):
+        self.users = LookupCache(ttl_seconds)
+        self.workspaces = LookupCache(ttl_seconds)
+
+    def _resolve(
+        self,
+        cache: LookupCache,
+        ids: Iterable[str],
+        loader: Callable[[List[str]], Dict[str, str]]
+    ) -> Dict[str, str]:
+        """Resolver IDs desde la caché y cargar los que falten con una sola consulta"""
+        ids = {str(i) for i in ids if i}
+        names = cache.get_many(ids)
+        missing = [i for i in ids if i not in names]
+        if missing:
+            loaded = loader(missing)
+            cache.set_many(loaded)
+            names.update(loaded)
+        return names
+
+    def enrich(self, db: Session, responses: List) -> List:
+        """Rellenar assignee_name, list_name y workspace_name en las respuestas"""
+        if not responses:
+            return responses
+
+        def load_users(ids: List[str]) -> Dict[str, str]:
+            users = db.query(User).filter(User.clickup_id.in_(ids)).all()
+            return {user.clickup_id: _user_display_name(user) for user in users if _user_display_name(user)}
+
+        def load_workspaces(ids: List[str]) -> Dict[str, str]:
+            rows = db.query(Workspace.clickup_id, Workspace.name).filter(Workspace.clickup_id.in_(ids)).all()
+            return {clickup_id: name for clickup_id, name in rows if name}
+
+        try:
+            user_names = self._resolve(
+                self.users,
+                (_get(r, "assignee_id") for r in responses if not _get(r, "assignee_name")),
+                load_users
+            )
+            workspace_names = self._resolve(
+                self.workspaces,
+                (_get(r, "workspace_id") for r in responses if not _get(r, "workspace_name")),
+                load_workspaces
+            )
+        except Exception as e:
+            enrichment_logger.error(f"❌ Error resolviendo nombres de tareas: {e}")
+            user_names, workspace_names = {}, {}
+
+        for r in responses:
+            assignee_id = _get(r, "assignee_id")
+            if assignee_id and not _get(r, "assignee_name"):
+                _set(r, "assignee_name", user_names.get(str(assignee_id), f"Usuario {assignee_id}"))
+            # Los nombres de lista no se guardan localmente: usar el ID como fallback
+            list_id = _get(r, "list_id")
+            if list_id and not _get(r, "list_name"):
+                _set(r, "list_name", f"Lista {list_id}")
+            workspace_id = _get(r, "workspace_id")
+            if workspace_id and not _get(r, "workspace_name"):
+                _set(r, "workspace_name", workspace_names.get(str(workspace_id), f"Workspace {workspace_id}"))
+        return responses
+
+
+# Instancia global del enriquecedor
+task_enricher = TaskEnricher()
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_names_after_commit(session: Session):
+    """Olvidar los nombres en caché cuando cambian usuarios o workspaces"""
+    scopes = session.info.pop(COMMITTED_KEY, None) or ()
+    if USERS_SCOPE in scopes:
+        task_enricher.users.clear()
+    if WORKSPACES_SCOPE in scopes:
+        task_enricher.workspaces.clear()
@@ -0,0 +1,291 @@
+"""
+Eventos de cambio de tareas (created / updated / deleted) y pub/sub en proceso
+- Se recogen en la Session (after_flush); antes del commit se agregan al
+  registro `task_changes` (misma transacción) y tras el commit se publican
+- Los caminos sin ORM (bulk insert/update, DELETE masivos) los registran con
+  `record_task_events`
+- `task_event_broker` reparte los eventos a los clientes del stream SSE, cada
+  uno con un buffer acotado, y guarda un historial corto para reanudar con
+  `Last-Event-ID`
+- Alcance: un proceso (cada worker de uvicorn tiene su propio broker)
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.task_ingest import HASHED_FIELDS
+from models.task_change import TaskChange
+
+events_logger = logging.getLogger("task_events")
+
+EVENT_TYPES = ("created", "updated", "deleted")
+# Campos que viajan en los eventos: los del hash de contenido (sin metadatos de sync)
+EVENT_FIELDS = HASHED_FIELDS
+PENDING_KEY = "task_events_pending"
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _value(task: Any, name: str) -> Any:
+    return task.get(name) if isinstance(task, dict) else getattr(task, name, None)
+
+
+@dataclass
+class TaskEvent:
+    """Cambio de una tarea ya confirmado en la BD"""
+    id: str
+    type: str
+    task_id: str
+    workspace_id: Optional[str]
+    changes: Dict[str, Any] = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=datetime.now)
+    seq: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": self.type,
+            "task_id": self.task_id,
+            "workspace_id": self.workspace_id,
+            "changes": self.changes,
+            "timestamp": self.timestamp.isoformat()
+        }
+
+    def to_sse(self) -> str:
+        """Mensaje SSE (id, event, data en una línea)"""
+        data = json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"), default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {data}\n\n"
+
+
+def _pending(session: Session) -> list:
+    return session.info.setdefault(PENDING_KEY, [])
+
+
+def record_task_events(session: Session, event_type: str, tasks: Iterable[Any], fields: Iterable[str] = EVENT_FIELDS):
+    """Registrar eventos de tareas escritas fuera del ORM (objetos o dicts de columnas).
+
+    Para bulk_update_mappings no hay diff por campo: `changes` lleva los
+    valores actuales de `fields`.
+    """
+    fields = () if event_type == "deleted" else tuple(fields)
+    pending = _pending(session)
+    for task in tasks:
+        task_id = _value(task, "clickup_id")
+        if not task_id:
+            continue
+        pending.append({
+            "type": event_type,
+            "task_id": str(task_id),
+            "workspace_id": _value(task, "workspace_id"),
+            "changes": {name: _json_value(_value(task, name)) for name in fields}
+        })
+
+
+def _changed_fields(obj: Any) -> Dict[str, Any]:
+    """Campos de EVENT_FIELDS con valor nuevo distinto del anterior"""
+    state = inspect(obj)
+    changes = {}
+    for name in EVENT_FIELDS:
+        history = state.attrs[name].history
+        if not history.added:
+            continue
+        if history.deleted and history.deleted[0] == history.added[0]:
+            continue
+        changes[name] = _json_value(history.added[0])
+    return changes
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_task_events(session: Session, flush_context):
+    """Eventos de tareas creadas, modificadas o eliminadas con el ORM"""
+    pending = None
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if getattr(obj, "__tablename__", None) != "tasks":
+            continue
+        if obj in session.new:
+            event_type, changes = "created", {name: _json_value(getattr(obj, name)) for name in EVENT_FIELDS}
+        elif obj in session.deleted:
+            event_type, changes = "deleted", {}
+        else:
+            event_type, changes = "updated", _changed_fields(obj)
+            if not changes:
+                continue
+        if pending is None:
+            pending = _pending(session)
+        pending.append({
+            "type": event_type,
+            "task_id": str(obj.clickup_id),
+            "workspace_id": obj.workspace_id,
+            "changes": changes
+        })
+
+
+@event.listens_for(Session, "before_commit")
+def _log_before_commit(session: Session):
+    """Escribir los eventos pendientes en `task_changes` dentro de la transacción"""
+    session.flush()
+    events = session.info.get(PENDING_KEY)
+    if events:
+        changed_at = datetime.now()
+        session.execute(insert(TaskChange), [
+            {
+                "task_id": data["task_id"],
+                "workspace_id": data["workspace_id"],
+                "change_type": data["type"],
+                "changes": data["changes"],
+                "changed_at": changed_at
+            }
+            for data in events
+        ])
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session):
+    events = session.info.pop(PENDING_KEY, None)
+    if events:
+        task_event_broker.publish(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session):
+    session.info.pop(PENDING_KEY, None)
+
+
+class Subscription:
+    """Cliente del stream: workspaces suscritos y cola acotada en su event loop"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, workspace_ids: Set[str], max_buffer: int):
+        self.loop = loop
+        self.workspace_ids = workspace_ids
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_buffer))
+        self.dropped = 0
+
+    def matches(self, task_event: TaskEvent) -> bool:
+        return not self.workspace_ids or str(task_event.workspace_id) in self.workspace_ids
+
+    def offer(self, task_event: TaskEvent):
+        """Encolar (en el loop del cliente); si el buffer está lleno se vacía y
+        se encola un reset (`None`) en lugar del evento: el cliente recarga y
+        la recarga ya incluye este cambio"""
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait(None)
+            self.dropped += 1
+            events_logger.warning(f"⚠️ Cliente del stream lento: {self.dropped} eventos descartados")
+            return
+        self.queue.put_nowait(task_event)
+
+
+class TaskEventBroker:
+    """Pub/sub en proceso de eventos de tareas con historial acotado"""
+
+    def __init__(self, history_size: int, client_buffer: int):
+        # Los IDs de evento llevan la época del proceso: tras un reinicio no se reanuda
+        self.epoch = uuid.uuid4().hex[:8]
+        self.client_buffer = client_buffer
+        self._seq = 0
+        self._history: deque = deque(maxlen=max(1, history_size))
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def _event_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def parse_event_id(self, value: Optional[str]) -> Optional[int]:
+        """Secuencia de un ID de evento de esta época (None si no aplica)"""
+        epoch, _, seq = (value or "").strip().rpartition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def publish(self, events: Iterable[Dict[str, Any]]) -> List[TaskEvent]:
+        """Numerar, guardar en el historial y repartir a los suscriptores"""
+        published = []
+        with self._lock:
+            for data in events:
+                self._seq += 1
+                task_event = TaskEvent(id=self._event_id(self._seq), seq=self._seq, **data)
+                self._history.append(task_event)
+                published.append(task_event)
+            for subscription in list(self._subscribers):
+                matching = [task_event for task_event in published if subscription.matches(task_event)]
+                if not matching:
+                    continue
+                try:
+                    for task_event in matching:
+                        subscription.loop.call_soon_threadsafe(subscription.offer, task_event)
+                except RuntimeError:
+                    # Event loop cerrado: el cliente ya no existe
+                    self._subscribers.discard(subscription)
+        return published
+
+    def subscribe(
+        self,
+        workspace_ids: Iterable[str] = (),
+        last_event_id: Optional[str] = None
+    ) -> Tuple[Subscription, List[TaskEvent], Optional[str]]:
+        """Registrar un cliente.
+
+        Devuelve la suscripción, los eventos posteriores a `last_event_id`
+        (del historial) y, si no se puede reanudar, el ID actual para el
+        evento de reset.
+        """
+        subscription = Subscription(
+            asyncio.get_running_loop(),
+            {str(workspace_id) for workspace_id in workspace_ids if workspace_id},
+            self.client_buffer
+        )
+        with self._lock:
+            self._subscribers.add(subscription)
+            if not last_event_id:
+                return subscription, [], None
+            seq = self.parse_event_id(last_event_id)
+            oldest = self._history[0].seq if self._history else self._seq + 1
+            if seq is None or seq > self._seq or seq < oldest - 1:
+                return subscription, [], self._event_id(self._seq)
+            backlog = [
+                task_event for task_event in self._history
+                if task_event.seq > seq and subscription.matches(task_event)
+            ]
+        return subscription, backlog, None
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def reset_message(self, event_id: Optional[str] = None, reason: str = "") -> str:
+        """Evento SSE `reset`: el cliente debe recargar las tareas"""
+        data = json.dumps({"reason": reason}, ensure_ascii=False)
+        prefix = f"id: {event_id}\n" if event_id else ""
+        return f"{prefix}event: reset\ndata: {data}\n\n"
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "epoch": self.epoch,
+                "last_event_id": self._event_id(self._seq),
+                "history": len(self._history),
+                "subscribers": len(self._subscribers)
+            }
+
+
+# Instancia global del broker
+task_event_broker = TaskEventBroker(settings.TASK_STREAM_HISTORY, settings.TASK_STREAM_CLIENT_BUFFER)
@@ -0,0 +1,100 @@
+"""
+Exportación en streaming de tareas (NDJSON / CSV)
+- Lee filas con un cursor del servidor (`yield_per`), sin cargar la tabla en memoria
+- Emite bloques de bytes a medida que llegan las filas
+- CSV con escape estándar (módulo csv); listas y dicts como JSON
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from core.database import SessionLocal
+from core.task_archive import task_source
+from models.task import Task
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+EXPORT_COLUMNS = tuple(column.name for column in Task.__table__.columns)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "tasks.ndjson"),
+    "csv": ("text/csv", "tasks.csv"),
+}
+# Filas leídas por viaje al servidor de BD
+EXPORT_BATCH_SIZE = 1000
+# Filas por bloque emitido al cliente
+EXPORT_CHUNK_ROWS = 200
+
+
+def _iter_rows(filters: Dict[str, Any], include_closed: bool) -> Iterator[Dict[str, Any]]:
+    """Recorrer tareas con cursor del servidor, en una sesión propia del stream"""
+    db = SessionLocal()
+    try:
+        source = task_source(include_closed)
+        query = db.query(*[getattr(source, name).label(name) for name in EXPORT_COLUMNS])
+        for name, value in filters.items():
+            if value is not None:
+                query = query.filter(getattr(source, name) == value)
+        if not include_closed:
+            query = query.filter(source.status != "complete")
+        for row in query.order_by(source.id).yield_per(EXPORT_BATCH_SIZE):
+            yield dict(zip(EXPORT_COLUMNS, row))
+    finally:
+        db.close()
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def iter_ndjson(filters: Dict[str, Any], include_closed: bool = False) -> Iterator[bytes]:
+    """Una tarea JSON por línea"""
+    chunk = []
+    for data in _iter_rows(filters, include_closed):
+        chunk.append(_dumps(data))
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+def _csv_value(value: Any) -> Optional[str]:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def iter_csv(filters: Dict[str, Any], include_closed: bool = False) -> Iterator[bytes]:
+    """Cabecera y una fila CSV por tarea"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data
+
+    # La cabecera sale de inmediato, antes de la primera consulta
+    writer.writerow(EXPORT_COLUMNS)
+    yield flush()
+    rows = 0
+    for data in _iter_rows(filters, include_closed):
+        writer.writerow([_csv_value(data[name]) for name in EXPORT_COLUMNS])
+        rows += 1
+        if rows % EXPORT_CHUNK_ROWS == 0:
+            yield flush()
+    if buffer.tell():
+        yield flush()
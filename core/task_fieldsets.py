@@ -0,0 +1,80 @@
+"""
+Fieldsets dispersos para respuestas de tareas (`fields=`)
+- Presets con nombre (`summary`, `full`) o lista de campos separada por comas
+- Solo se seleccionan en SQL las columnas necesarias
+- Solo se serializan los campos pedidos, sin validar TaskResponse completo
+"""
+
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status as http_status
+
+from core.task_ingest import normalize_id, priority_to_int
+from models.task import Task
+
+# Campos derivados que se calculan tras la consulta -> columna de la que dependen
+ENRICHED_FIELDS = {
+    "assignee_name": "assignee_id",
+    "list_name": "list_id",
+    "workspace_name": "workspace_id",
+}
+
+TASK_COLUMN_FIELDS = tuple(column.name for column in Task.__table__.columns)
+
+FIELD_PRESETS = {
+    "summary": ("id", "clickup_id", "name", "status", "priority", "due_date", "assignee_id", "assignee_name"),
+    "full": None,
+}
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Resolver `fields=` a una tupla de campos; None significa respuesta completa"""
+    if not fields:
+        return None
+    fields = fields.strip()
+    if fields in FIELD_PRESETS:
+        return FIELD_PRESETS[fields]
+
+    requested = []
+    for name in fields.split(","):
+        name = name.strip()
+        if name in FIELD_PRESETS and FIELD_PRESETS[name]:
+            requested.extend(FIELD_PRESETS[name])
+        elif name in TASK_COLUMN_FIELDS or name in ENRICHED_FIELDS:
+            requested.append(name)
+        elif name:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail=f"Campo no soportado: {name}"
+            )
+    return tuple(dict.fromkeys(requested))
+
+
+def select_columns(source, fields: Tuple[str, ...], extra: Tuple[str, ...] = ()) -> List[Any]:
+    """Columnas SQL necesarias para servir `fields` (más las de paginación)"""
+    names = ["id"]
+    for name in fields + extra:
+        names.append(ENRICHED_FIELDS.get(name, name))
+    return [getattr(source, name).label(name) for name in dict.fromkeys(names)]
+
+
+def rows_to_items(rows) -> List[SimpleNamespace]:
+    """Filas parciales -> objetos con atributos (compatibles con el enriquecedor)"""
+    items = []
+    for row in rows:
+        values = dict(row._mapping)
+        if "priority" in values:
+            values["priority"] = priority_to_int(values["priority"])
+        for key in ("assignee_id", "creator_id"):
+            if key in values:
+                values[key] = normalize_id(values[key])
+        items.append(SimpleNamespace(**values))
+    return items
+
+
+def item_to_dict(item: Any, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Serializar solo los campos pedidos"""
+    if isinstance(item, dict):
+        return {name: item.get(name) for name in fields}
+    return {name: getattr(item, name, None) for name in fields}
@@ -0,0 +1,182 @@
+"""
+Lecturas stale-while-revalidate de tareas individuales (GET /tasks/{id})
+- Fila con `last_sync` más reciente que TASK_FRESH_SECONDS: se sirve tal cual
+- Fila más antigua: se sirve de inmediato y se programa un refresco desde
+  ClickUp en segundo plano (uno por tarea a la vez)
+- Tarea ausente: se pide a ClickUp con single-flight (peticiones simultáneas
+  por el mismo ID comparten la misma llamada) y se guarda; un fallo reciente
+  (p. ej. un ID inexistente) se recuerda y no se vuelve a pedir
+- Las tareas del archivo (cerradas hace tiempo) no se refrescan
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.database import SessionLocal
+from core.task_archive import discard_archived
+from core.task_ingest import normalize_clickup_task, task_content_hash
+from models.task import Task
+
+freshness_logger = logging.getLogger("task_freshness")
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+ARCHIVE = "archive"
+# Tareas con un refresco fallido recordadas para no reintentar en cada lectura
+MAX_FAILED_ENTRIES = 10000
+
+
+class TaskNotFound(Exception):
+    """ClickUp no tiene la tarea (404 o respuesta sin ID)"""
+
+
+def store_remote_task(clickup_task: Dict[str, Any]) -> Dict[str, Any]:
+    """Guardar una tarea leída de ClickUp en el tier caliente y devolver sus valores.
+
+    Los valores salen de `normalize_clickup_task`, como en la sincronización
+    (custom fields `{nombre: valor}`, workspace de la fila local si ClickUp
+    no envía `team_id`).
+    """
+    db = SessionLocal()
+    try:
+        local_task = db.query(Task).filter(Task.clickup_id == str(clickup_task["id"])).first()
+        values = normalize_clickup_task(clickup_task, local_task.workspace_id if local_task else None)
+        values["content_hash"] = task_content_hash(values)
+        values["is_synced"] = True
+        values["last_sync"] = datetime.now()
+
+        if local_task is None:
+            discard_archived(db, [values["clickup_id"]])
+            db.add(Task(**values))
+        elif local_task.content_hash == values["content_hash"]:
+            # Sin cambios de contenido: solo se renueva la frescura
+            local_task.is_synced = True
+            local_task.last_sync = values["last_sync"]
+        else:
+            for name, value in values.items():
+                setattr(local_task, name, value)
+        db.commit()
+    finally:
+        db.close()
+    return values
+
+
+class TaskRefresher:
+    """Política de frescura y refrescos deduplicados de tareas individuales"""
+
+    def __init__(self, fresh_seconds: int):
+        self.fresh_seconds = fresh_seconds
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._failed: Dict[str, Tuple[float, Exception]] = {}
+        self.stats = {
+            FRESH: 0, STALE: 0, MISS: 0, ARCHIVE: 0,
+            "refreshed": 0, "deduplicated": 0, "failed": 0, "failed_cached": 0
+        }
+
+    def age(self, last_sync: Optional[datetime]) -> Optional[int]:
+        """Segundos desde la última sincronización de la fila"""
+        if last_sync is None:
+            return None
+        return max(0, int((datetime.now() - last_sync).total_seconds()))
+
+    def classify(self, task_id: str, last_sync: Optional[datetime], archived: bool, client) -> Tuple[str, Optional[int]]:
+        """Estado de frescura de una fila local; programa el refresco si está vencida"""
+        age = self.age(last_sync)
+        if archived:
+            state = ARCHIVE
+        elif age is not None and age < self.fresh_seconds:
+            state = FRESH
+        else:
+            state = STALE
+            self.schedule_refresh(task_id, client)
+        self.stats[state] += 1
+        return state, age
+
+    def refresh(self, task_id: str, client) -> asyncio.Task:
+        """Refresco desde ClickUp; si ya hay uno en curso para el ID se reutiliza"""
+        pending = self._inflight.get(task_id)
+        if pending is not None:
+            self.stats["deduplicated"] += 1
+            return pending
+        pending = asyncio.create_task(self._refresh(task_id, client))
+        self._inflight[task_id] = pending
+        pending.add_done_callback(lambda done: self._finished(task_id, done))
+        return pending
+
+    def recent_failure(self, task_id: str) -> Optional[Exception]:
+        """Error del último refresco si falló hace menos de TASK_FRESH_SECONDS"""
+        failed = self._failed.get(task_id)
+        if failed is None or time.monotonic() - failed[0] >= self.fresh_seconds:
+            return None
+        return failed[1]
+
+    def schedule_refresh(self, task_id: str, client) -> bool:
+        """Programar el refresco en segundo plano (no si falló hace menos de TASK_FRESH_SECONDS)"""
+        if self.recent_failure(task_id) is not None:
+            return False
+        self.refresh(task_id, client)
+        return True
+
+    async def fetch_missing(self, task_id: str, client) -> Dict[str, Any]:
+        """Tarea ausente localmente: esperar el refresco compartido (single-flight).
+
+        Lanza TaskNotFound si ClickUp no tiene la tarea; un fallo reciente se
+        repite sin volver a llamar a ClickUp.
+        """
+        self.stats[MISS] += 1
+        error = self.recent_failure(task_id)
+        if error is not None:
+            self.stats["failed_cached"] += 1
+            if isinstance(error, TaskNotFound):
+                raise TaskNotFound(task_id)
+            raise RuntimeError(f"el refresco de la tarea {task_id} falló hace menos de {self.fresh_seconds}s: {error}")
+        # shield: si esta petición se cancela, las demás siguen esperando el mismo refresco
+        return await asyncio.shield(self.refresh(task_id, client))
+
+    async def _refresh(self, task_id: str, client) -> Dict[str, Any]:
+        from core.advanced_sync import sync_service
+
+        await sync_service.rate_limiter.acquire()
+        try:
+            clickup_task = await client.get_task(task_id)
+        except Exception as e:
+            if getattr(e, "status", None) == 404:
+                raise TaskNotFound(task_id) from e
+            raise
+        if not clickup_task or not clickup_task.get("id"):
+            raise TaskNotFound(task_id)
+        try:
+            # Escrituras síncronas en la BD fuera del event loop
+            values = await run_in_threadpool(store_remote_task, clickup_task)
+        except Exception as e:
+            # La respuesta sigue siendo válida aunque no se pueda guardar
+            freshness_logger.error(f"❌ Error guardando la tarea refrescada {task_id}: {e}")
+            values = {**normalize_clickup_task(clickup_task), "is_synced": True, "last_sync": None}
+        self.stats["refreshed"] += 1
+        freshness_logger.debug(f"Tarea {task_id} refrescada desde ClickUp")
+        return values
+
+    def _finished(self, task_id: str, done: asyncio.Task):
+        self._inflight.pop(task_id, None)
+        if done.cancelled():
+            return
+        error = done.exception()
+        if error is None:
+            self._failed.pop(task_id, None)
+            return
+        self.stats["failed"] += 1
+        if len(self._failed) >= MAX_FAILED_ENTRIES:
+            self._failed.clear()
+        self._failed[task_id] = (time.monotonic(), error)
+        freshness_logger.warning(f"⚠️ No se pudo refrescar la tarea {task_id}: {error}")
+
+
+# Instancia global del refresco de tareas
+task_refresher = TaskRefresher(settings.TASK_FRESH_SECONDS)
@@ -0,0 +1,187 @@
+"""
+Normalización de tareas de ClickUp al formato de la tabla local `tasks`
+y hash de contenido para detección de cambios
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Columnas que forman parte del hash de contenido
+HASHED_FIELDS = (
+    "name",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "start_date",
+    "list_id",
+    "assignee_id",
+    "tags",
+    "custom_fields",
+)
+
+
+def _timestamp_to_datetime(value: Any) -> Optional[datetime]:
+    """Convertir timestamp de ClickUp (ms, int o string) a datetime"""
+    if value is None or value == "":
+        return None
+    try:
+        return datetime.fromtimestamp(int(value) / 1000)
+    except (ValueError, TypeError, OverflowError, OSError):
+        return None
+
+
+def priority_to_int(priority_value) -> int:
+    """Convertir diferentes representaciones de prioridad a entero (1-4).
+    1=Urgente, 2=Alta, 3=Normal, 4=Baja. Cualquier valor inesperado -> 3.
+    """
+    # Si es dict con id
+    if isinstance(priority_value, dict):
+        try:
+            return int(priority_value.get("id", 3))
+        except (ValueError, TypeError):
+            return 3
+    # Si es entero
+    if isinstance(priority_value, int):
+        return priority_value if priority_value in {1, 2, 3, 4} else 3
+    # Si es string (id numérico o nombre)
+    if isinstance(priority_value, str):
+        # Intentar parsear como número primero
+        try:
+            num = int(priority_value)
+            return num if num in {1, 2, 3, 4} else 3
+        except (ValueError, TypeError):
+            normalized = priority_value.strip().lower()
+            name_to_id = {
+                "urgent": 1,
+                "alta": 2,
+                "high": 2,
+                "normal": 3,
+                "media": 3,
+                "low": 4,
+                "baja": 4,
+            }
+            return name_to_id.get(normalized, 3)
+    # Cualquier otro caso
+    return 3
+
+
+def normalize_id(value: Any) -> Optional[str]:
+    """IDs de ClickUp siempre como string (o None)"""
+    return str(value) if value is not None else None
+
+
+def _option_name(item: Dict[str, Any], value: Any) -> Any:
+    """Valor de un drop_down/labels de ClickUp (orderindex o ID) -> nombre de la opción"""
+    options = (item.get("type_config") or {}).get("options") or []
+    by_key = {}
+    for option in options:
+        if isinstance(option, dict):
+            name = option.get("name") or option.get("label")
+            by_key[str(option.get("id"))] = name
+            if option.get("orderindex") is not None:
+                by_key[str(option["orderindex"])] = name
+    if not by_key:
+        return value
+    if isinstance(value, list):
+        return [by_key.get(str(v), v) for v in value]
+    return by_key.get(str(value), value)
+
+
+def custom_field_values(custom_fields: Any) -> Dict[str, Any]:
+    """Custom fields en la forma local {nombre: valor}, sin campos vacíos.
+
+    Acepta la lista de ClickUp ([{id, name, value, type_config}]) o un dict ya
+    local, de modo que la fila local y la respuesta de ClickUp se comparen igual.
+    """
+    if isinstance(custom_fields, dict):
+        items = custom_fields.items()
+    else:
+        items = [
+            (item.get("name") or item.get("id"), _option_name(item, item.get("value")))
+            for item in custom_fields or []
+            if isinstance(item, dict)
+        ]
+    return {
+        str(name): value
+        for name, value in items
+        if name is not None and value not in (None, "", [])
+    }
+
+
+def normalize_clickup_task(clickup_data: Dict[str, Any], workspace_id: Optional[str] = None) -> Dict[str, Any]:
+    """Convertir payload de ClickUp a valores de columnas de `Task`"""
+    status = clickup_data.get("status")
+    if isinstance(status, dict):
+        status = status.get("status")
+
+    list_data = clickup_data.get("list")
+    list_id = list_data.get("id") if isinstance(list_data, dict) else list_data
+
+    assignees = clickup_data.get("assignees") or []
+    assignee_id = assignees[0].get("id") if assignees and isinstance(assignees[0], dict) else None
+
+    creator = clickup_data.get("creator")
+    creator_id = creator.get("id") if isinstance(creator, dict) else creator
+
+    tags = [
+        tag.get("name") if isinstance(tag, dict) else tag
+        for tag in clickup_data.get("tags") or []
+    ]
+
+    return {
+        "clickup_id": str(clickup_data["id"]),
+        "name": clickup_data.get("name", ""),
+        "description": clickup_data.get("description") or "",
+        "status": status or "open",
+        "priority": priority_to_int(clickup_data.get("priority", 3)),
+        "due_date": _timestamp_to_datetime(clickup_data.get("due_date")),
+        "start_date": _timestamp_to_datetime(clickup_data.get("start_date")),
+        "workspace_id": str(clickup_data.get("team_id") or workspace_id or ""),
+        "list_id": str(list_id) if list_id is not None else None,
+        "assignee_id": str(assignee_id) if assignee_id is not None else None,
+        "creator_id": str(creator_id) if creator_id not in (None, "") else None,
+        "tags": [tag for tag in tags if tag],
+        "custom_fields": custom_field_values(clickup_data.get("custom_fields")),
+        "date_closed": _timestamp_to_datetime(clickup_data.get("date_closed")),
+        "date_updated": _timestamp_to_datetime(clickup_data.get("date_updated")),
+    }
+
+
+def task_content_hash(values: Dict[str, Any]) -> str:
+    """Hash estable de las columnas relevantes de una tarea normalizada"""
+    relevant = {field: values.get(field) for field in HASHED_FIELDS}
+    # Custom fields como texto: ClickUp devuelve números y opciones sin tipo fijo
+    relevant["custom_fields"] = {
+        name: value if isinstance(value, (dict, list)) else str(value)
+        for name, value in custom_field_values(relevant["custom_fields"]).items()
+    }
+    data_string = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.md5(data_string.encode()).hexdigest()
+
+
+def _timestamp_ms(value: Any) -> Optional[int]:
+    """Representación en ms de un date_updated (datetime local o timestamp de ClickUp)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return int(round(value.timestamp() * 1000))
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def list_digest(pairs: Iterable[Tuple[str, Any]]) -> str:
+    """Digest independiente del orden de pares (task_id, date_updated).
+
+    XOR de los hashes de cada par: el mismo conjunto produce el mismo digest
+    sin importar el orden en que llegue.
+    """
+    accumulator = 0
+    for task_id, date_updated in pairs:
+        pair = f"{task_id}:{_timestamp_ms(date_updated)}"
+        accumulator ^= int(hashlib.md5(pair.encode()).hexdigest(), 16)
+    return f"{accumulator:032x}"
@@ -0,0 +1,232 @@
+"""
+Índice de texto completo para la búsqueda de tareas
+- SQLite: tablas FTS5 de contenido externo (sobre una vista de origen) mantenidas por triggers
+- PostgreSQL: columna tsvector generada con índice GIN
+- Texto indexado: nombre, descripción, tags y valores de texto de custom fields
+- Resultados con ranking (bm25 / ts_rank) y resaltado de coincidencias
+"""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import column, func, literal, literal_column, select, table, text, union_all
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+search_logger = logging.getLogger("task_search_index")
+
+# Tabla de tareas -> tabla FTS5 (SQLite)
+FTS_TABLES = {"tasks": "tasks_fts", "tasks_archive": "tasks_archive_fts"}
+# Pesos bm25 / setweight por columna: nombre, descripción, tags + custom fields
+BM25_WEIGHTS = (10.0, 3.0, 1.0)
+# Configuración de texto de PostgreSQL (sin stemming: contenido en varios idiomas)
+PG_TEXT_SEARCH_CONFIG = "simple"
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+SNIPPET_TOKENS = 16
+
+_available: Dict[str, bool] = {}
+
+
+def _extra_sql(alias: str) -> str:
+    """Tags y valores de texto de custom fields ({nombre: valor} o lista de ClickUp) como texto"""
+    return f"""trim(
+        coalesce((SELECT group_concat(value, ' ') FROM json_each(
+            CASE WHEN json_valid({alias}.tags) THEN {alias}.tags ELSE '[]' END
+        ) WHERE type = 'text'), '')
+        || ' ' ||
+        coalesce((SELECT group_concat(CASE
+            WHEN cf.type = 'text' THEN cf.value
+            WHEN cf.type = 'object' AND json_type(cf.value, '$.value') = 'text' THEN json_extract(cf.value, '$.value')
+        END, ' ') FROM json_each(
+            CASE WHEN json_valid({alias}.custom_fields) THEN {alias}.custom_fields ELSE '{{}}' END
+        ) AS cf), '')
+    )"""
+
+
+def _sqlite_statements(source_table: str, fts_table: str) -> List[str]:
+    view = f"{source_table}_search_source"
+    return [
+        f"""CREATE VIEW IF NOT EXISTS {view} AS
+            SELECT t.id AS id, t.name AS name, t.description AS description, {_extra_sql('t')} AS extra
+            FROM {source_table} AS t""",
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+            name, description, extra,
+            content='{view}', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source_table} BEGIN
+            INSERT INTO {fts_table}(rowid, name, description, extra)
+            VALUES (new.id, new.name, new.description, {_extra_sql('new')});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source_table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, name, description, extra)
+            VALUES ('delete', old.id, old.name, old.description, {_extra_sql('old')});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts_table}_au
+            AFTER UPDATE OF id, name, description, tags, custom_fields ON {source_table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, name, description, extra)
+            VALUES ('delete', old.id, old.name, old.description, {_extra_sql('old')});
+            INSERT INTO {fts_table}(rowid, name, description, extra)
+            VALUES (new.id, new.name, new.description, {_extra_sql('new')});
+        END""",
+    ]
+
+
+def _postgres_statements(source_table: str) -> List[str]:
+    config = PG_TEXT_SEARCH_CONFIG
+    return [
+        f"""ALTER TABLE {source_table} ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('{config}', coalesce(name, '')), 'A')
+                || setweight(to_tsvector('{config}', coalesce(description, '')), 'B')
+                || setweight(json_to_tsvector('{config}', coalesce(tags::json, '[]'::json), '["string"]'), 'C')
+                || setweight(json_to_tsvector('{config}', coalesce(custom_fields::json, '{{}}'::json), '["string"]'), 'C')
+            ) STORED""",
+        f"CREATE INDEX IF NOT EXISTS ix_{source_table}_search_vector ON {source_table} USING GIN (search_vector)",
+    ]
+
+
+def ensure_search_index(engine: Engine) -> bool:
+    """Crear (idempotente) el índice de texto completo y poblarlo si es nuevo"""
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            for source_table, fts_table in FTS_TABLES.items():
+                if dialect == "sqlite":
+                    created = not conn.execute(
+                        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                        {"name": fts_table}
+                    ).first()
+                    for statement in _sqlite_statements(source_table, fts_table):
+                        conn.execute(text(statement))
+                    if created:
+                        # Tablas existentes: indexar las filas ya guardadas. No se usa el
+                        # comando 'rebuild' de FTS5: no admite json_each en la vista de origen
+                        conn.execute(text(
+                            f"INSERT INTO {fts_table}(rowid, name, description, extra) "
+                            f"SELECT id, name, description, extra FROM {source_table}_search_source"
+                        ))
+                        search_logger.info(f"✅ Índice FTS5 creado: {fts_table}")
+                elif dialect == "postgresql":
+                    for statement in _postgres_statements(source_table):
+                        conn.execute(text(statement))
+                else:
+                    search_logger.warning(f"⚠️ Búsqueda de texto completo no soportada en {dialect}")
+                    _available[dialect] = False
+                    return False
+        _available[dialect] = True
+        return True
+    except Exception as e:
+        search_logger.error(f"❌ Error creando el índice de búsqueda: {e}")
+        _available[dialect] = False
+        return False
+
+
+def is_available(db: Session) -> bool:
+    return _available.get(db.get_bind().dialect.name, False)
+
+
+def search_terms(query: str) -> List[str]:
+    """Palabras de la consulta (sin operadores ni comillas del usuario)"""
+    return re.findall(r"\w+", query or "", re.UNICODE)
+
+
+def _fts_query(terms: List[str]) -> str:
+    # Todas las palabras, con coincidencia por prefijo
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _pg_tsquery(terms: List[str]):
+    return func.to_tsquery(PG_TEXT_SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms))
+
+
+def _tables(include_closed: bool) -> List[str]:
+    return list(FTS_TABLES) if include_closed else ["tasks"]
+
+
+def match_subquery(db: Session, query: str, include_closed: bool = False):
+    """Subconsulta (id, rank) de tareas que coinciden; menor rank = más relevante.
+
+    None si la consulta no tiene palabras buscables.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return None
+    selects = []
+    if db.get_bind().dialect.name == "sqlite":
+        weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+        for source_table in _tables(include_closed):
+            fts_table = FTS_TABLES[source_table]
+            fts = table(fts_table, column("rowid"))
+            selects.append(
+                select(fts.c.rowid.label("id"), literal_column(f"bm25({fts_table}, {weights})").label("rank"))
+                .where(literal_column(fts_table).op("MATCH")(literal(_fts_query(terms))))
+            )
+    else:
+        tsquery = _pg_tsquery(terms)
+        for source_table in _tables(include_closed):
+            source = table(source_table, column("id"), column("search_vector"))
+            selects.append(
+                select(source.c.id.label("id"), (-func.ts_rank(source.c.search_vector, tsquery)).label("rank"))
+                .where(source.c.search_vector.op("@@")(tsquery))
+            )
+    combined = selects[0] if len(selects) == 1 else union_all(*selects)
+    return combined.subquery("search_matches")
+
+
+def highlights(db: Session, ids: Iterable[Any], query: str, include_closed: bool = False) -> Dict[Any, Dict[str, str]]:
+    """Nombre resaltado y fragmento de la descripción por ID de tarea"""
+    ids = [task_id for task_id in ids if task_id is not None]
+    terms = search_terms(query)
+    if not ids or not terms:
+        return {}
+    found: Dict[Any, Dict[str, str]] = {}
+    if db.get_bind().dialect.name == "sqlite":
+        for source_table in _tables(include_closed):
+            fts_table = FTS_TABLES[source_table]
+            rows = db.execute(
+                text(
+                    f"SELECT rowid, highlight({fts_table}, 0, :open, :close), "
+                    f"snippet({fts_table}, 1, :open, :close, '…', :tokens) "
+                    f"FROM {fts_table} WHERE {fts_table} MATCH :query AND rowid IN ({', '.join(str(int(i)) for i in ids)})"
+                ),
+                {"open": HIGHLIGHT_OPEN, "close": HIGHLIGHT_CLOSE, "tokens": SNIPPET_TOKENS, "query": _fts_query(terms)}
+            )
+            for task_id, name, description in rows:
+                found.setdefault(task_id, {"name": name, "description": description})
+    else:
+        tsquery = _pg_tsquery(terms)
+        options = f"StartSel={HIGHLIGHT_OPEN}, StopSel={HIGHLIGHT_CLOSE}, HighlightAll=true"
+        snippet_options = f"StartSel={HIGHLIGHT_OPEN}, StopSel={HIGHLIGHT_CLOSE}, MaxWords={SNIPPET_TOKENS}, MinWords=5"
+        for source_table in _tables(include_closed):
+            source = table(source_table, column("id"), column("name"), column("description"))
+            rows = db.execute(
+                select(
+                    source.c.id,
+                    func.ts_headline(PG_TEXT_SEARCH_CONFIG, source.c.name, tsquery, options),
+                    func.ts_headline(PG_TEXT_SEARCH_CONFIG, func.coalesce(source.c.description, ""), tsquery, snippet_options),
+                ).where(source.c.id.in_(ids))
+            )
+            for task_id, name, description in rows:
+                found.setdefault(task_id, {"name": name, "description": description})
+    return found
+
+
+def attach_highlights(db: Session, items: List[Any], query: str, include_closed: bool = False) -> List[Any]:
+    """Agregar `highlight` a cada item (dict u objeto) de una página de resultados"""
+    if not items:
+        return items
+    get_id = (lambda item: item.get("id")) if isinstance(items[0], dict) else (lambda item: getattr(item, "id", None))
+    try:
+        found = highlights(db, [get_id(item) for item in items], query, include_closed)
+    except Exception as e:
+        search_logger.error(f"❌ Error resaltando resultados de búsqueda: {e}")
+        return items
+    for item in items:
+        value = found.get(get_id(item))
+        if isinstance(item, dict):
+            item["highlight"] = value
+        else:
+            setattr(item, "highlight", value)
+    return items
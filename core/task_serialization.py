@@ -0,0 +1,69 @@
+"""
+Serialización rápida de tareas leídas de nuestra propia BD
+- Construye dicts de respuesta directamente desde tuplas de columnas
+- Sin TaskResponse.model_validate por fila
+- Emite JSON con orjson (si está instalado) mediante una clase de respuesta propia
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from api.schemas.task import TaskResponse
+from core.task_ingest import normalize_id, priority_to_int
+from models.task import Task
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+# Columnas de `tasks` que forman parte de TaskResponse, en orden de selección
+RESPONSE_COLUMNS = tuple(
+    column.name for column in Task.__table__.columns if column.name in TaskResponse.model_fields
+)
+# Campos de TaskResponse sin columna (enriquecidos o no persistidos) -> None
+EXTRA_FIELDS = tuple(name for name in TaskResponse.model_fields if name not in RESPONSE_COLUMNS)
+REQUIRED_STRING_FIELDS = ("clickup_id", "name", "workspace_id", "list_id")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse que serializa con orjson (datetimes nativos, sin jsonable_encoder)"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+def response_columns(source) -> List[Any]:
+    """Columnas a seleccionar para el fast path"""
+    return [getattr(source, name).label(name) for name in RESPONSE_COLUMNS]
+
+
+def task_row_to_dict(row: Sequence[Any]) -> Optional[Dict[str, Any]]:
+    """Tupla de RESPONSE_COLUMNS -> dict con la forma de TaskResponse.
+
+    Las filas de la BD ya vienen normalizadas desde la ingesta; solo se
+    corrigen tipos de forma barata y se descartan las filas que la ruta
+    Pydantic también rechazaría (campos obligatorios nulos).
+    """
+    data = dict(zip(RESPONSE_COLUMNS, row))
+    for name in REQUIRED_STRING_FIELDS:
+        if not isinstance(data.get(name), str):
+            return None
+    if not isinstance(data["priority"], int) and data["priority"] is not None:
+        data["priority"] = priority_to_int(data["priority"])
+    for name in ("assignee_id", "creator_id"):
+        if data[name] is not None and not isinstance(data[name], str):
+            data[name] = normalize_id(data[name])
+    if data["is_synced"] is None:
+        return None
+    data["is_synced"] = bool(data["is_synced"])
+    for name in EXTRA_FIELDS:
+        data[name] = None
+    return data
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Importar un export offline de ClickUp (JSON/CSV) o un dump de payloads (JSONL)
+directamente en la base de datos local, sin pasar por la API con rate limit.
+
+Uso:
+    python import_clickup_export.py export.json [tareas.csv dump.jsonl ...] [--workspace-id ID]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.bulk_import import BulkImporter
+from core.database import SessionLocal, init_db
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importación masiva de exports de ClickUp")
+    parser.add_argument("files", nargs="+", help="Ficheros .json, .jsonl/.ndjson o .csv")
+    parser.add_argument("--workspace-id", help="Workspace al que pertenecen las tareas (si el export no lo indica)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Tareas por lote de inserción")
+    parser.add_argument("--skip-index", action="store_true", help="No reconstruir el índice de búsqueda")
+    args = parser.parse_args()
+
+    print("🚀 Importando export de ClickUp...")
+    print("=" * 50)
+
+    asyncio.run(init_db())
+    db = SessionLocal()
+    try:
+        importer = BulkImporter(db, workspace_id=args.workspace_id, batch_size=args.batch_size)
+        result = importer.import_files(args.files, rebuild_index=not args.skip_index)
+    finally:
+        db.close()
+
+    print(f"✅ Tareas creadas: {result.tasks_created}")
+    print(f"🔄 Tareas actualizadas: {result.tasks_updated}")
+    print(f"👤 Usuarios nuevos: {result.users_created}")
+    print(f"🏢 Workspaces nuevos: {result.workspaces_created}")
+    print(f"⏭️ Registros omitidos: {result.skipped}")
+    print(f"🔍 Índice de búsqueda reconstruido: {'sí' if result.search_indexed else 'no'}")
+    if result.watermark:
+        print(f"📌 Watermark del workspace {result.workspace_id}: {result.watermark}")
+    for error in result.errors:
+        print(f"❌ {error}")
+    print(f"⏱️ Duración: {result.duration:.2f}s")
+
+    return 0 if result.success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,10 @@ ClickUp Project Manager - Agente Inteligente
 Módulo principal de la aplicación
 """
 
+import logging
+import time
+import uuid
+
 import uvicorn
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
@@ -12,6 +16,12 @@ from fastapi.staticfiles import StaticFiles
 from api.routes import tasks, workspaces, lists, users, automation, reports, integrations, spaces, webhooks, dashboard, search
 from core.config import settings
 from core.database import init_db
+from core.logging_config import request_id_var, setup_logging
+
+# Logging por cola: los registros se escriben en un hilo aparte
+setup_logging()
+app_logger = logging.getLogger("app")
+http_logger = logging.getLogger("http")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -23,9 +33,9 @@ async def lifespan(app: FastAPI):
     try:
         from core.search_engine import search_engine
         await search_engine.initialize()
-        print("✅ Motor de búsqueda RAG inicializado")
+        app_logger.info("✅ Motor de búsqueda RAG inicializado")
     except Exception as e:
-        print(f"⚠️ Error inicializando motor de búsqueda: {e}")
+        app_logger.warning(f"⚠️ Error inicializando motor de búsqueda: {e}")
     
     yield
     # Shutdown (si es necesario)
@@ -37,6 +47,23 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# ID de petición para correlacionar los registros de cada petición
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex[:16]
+    token = request_id_var.set(request_id)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+        http_logger.info(
+            f"{request.method} {request.url.path} {response.status_code}",
+            extra={"duration_ms": round((time.perf_counter() - start) * 1000, 2), "status": response.status_code}
+        )
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        request_id_var.reset(token)
+
 # Agregar headers de seguridad HTTPS
 @app.middleware("http")
 async def add_security_headers(request: Request, call_next):
@@ -48,7 +75,7 @@ async def add_security_headers(request: Request, call_next):
         response.headers["Content-Security-Policy"] = "upgrade-insecure-requests"
         response.headers["X-Content-Type-Options"] = "nosniff"
         response.headers["X-Frame-Options"] = "DENY"
-        print("🔒 Headers de seguridad HTTPS aplicados")
+        app_logger.debug("🔒 Headers de seguridad HTTPS aplicados")
     
     return response
 
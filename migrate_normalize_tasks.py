@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Migración única: normalizar filas existentes de `tasks` y `tasks_archive`
+(prioridad entera 1-4, assignee_id/creator_id como string) por lotes.
+
+Tras esta migración las rutas GET no necesitan reescribir filas al leer;
+las escrituras nuevas se normalizan en el modelo (ver models/task.py).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select, update
+
+from core.database import SessionLocal, init_db
+from core.task_ingest import normalize_id, priority_to_int
+from models.task import Task
+from models.task_archive import TaskArchive
+
+
+def normalize_table(db, model, batch_size: int = 1000) -> int:
+    """Normalizar una tabla recorriéndola por id; devuelve filas corregidas"""
+    table = model.__table__
+    fixed = 0
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(table.c.id, table.c.priority, table.c.assignee_id, table.c.creator_id)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        for row in rows:
+            values = {
+                "priority": priority_to_int(row.priority),
+                "assignee_id": normalize_id(row.assignee_id),
+                "creator_id": normalize_id(row.creator_id),
+            }
+            current = {"priority": row.priority, "assignee_id": row.assignee_id, "creator_id": row.creator_id}
+            if any(type(values[key]) is not type(current[key]) or values[key] != current[key] for key in values):
+                db.execute(update(table).where(table.c.id == row.id).values(**values))
+                fixed += 1
+        db.commit()
+    return fixed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalizar prioridades e IDs de tareas existentes")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Filas por lote")
+    args = parser.parse_args()
+
+    print("🚀 Normalizando tareas existentes...")
+    print("=" * 50)
+
+    asyncio.run(init_db())
+    db = SessionLocal()
+    try:
+        for model in (Task, TaskArchive):
+            fixed = normalize_table(db, model, args.batch_size)
+            print(f"✅ {model.__tablename__}: {fixed} filas normalizadas")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,19 @@
 """ORM models package."""
 
 from .task import Task  # noqa: F401
+from .task_archive import TaskArchive  # noqa: F401
 from .user import User  # noqa: F401
 from .workspace import Workspace  # noqa: F401
 from .automation import Automation  # noqa: F401
 from .report import Report  # noqa: F401
 from .integration import Integration  # noqa: F401
 from .notification_log import NotificationLog  # noqa: F401
+from .list_digest import ListDigest  # noqa: F401
+from .sync_watermark import SyncWatermark  # noqa: F401
+from .data_version import DataVersion  # noqa: F401
+from .list_field_schema import ListFieldSchema  # noqa: F401
+from .task_attribute import TaskTag, TaskFieldValue  # noqa: F401
+from .task_change import TaskChange, TaskChangeLogState  # noqa: F401
 
 
 
@@ -0,0 +1,16 @@
+
+
+from sqlalchemy import Column, Integer, String, DateTime
+from core.database import Base
+
+
+class DataVersion(Base):
+    """Contador de versión de datos por workspace (`*` = cualquier workspace)"""
+
+    __tablename__ = "data_versions"
+
+    scope = Column(String, primary_key=True, index=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
+
+
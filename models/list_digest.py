@@ -0,0 +1,20 @@
+
+
+from sqlalchemy import Column, Integer, String, DateTime
+from core.database import Base
+
+
+class ListDigest(Base):
+    """Digest por lista de pares (task_id, date_updated) para reconciliación"""
+
+    __tablename__ = "list_digests"
+
+    list_id = Column(String, primary_key=True, index=True)
+    workspace_id = Column(String, index=True)
+    remote_digest = Column(String, nullable=True)
+    local_digest = Column(String, nullable=True)
+    task_count = Column(Integer, nullable=True)
+    max_date_updated = Column(DateTime, nullable=True)
+    last_checked = Column(DateTime, nullable=True)
+
+
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
+from core.database import Base
+
+
+class ListFieldSchema(Base):
+    """Esquema de custom fields de una lista (id, nombre, tipo, opciones) con versión"""
+
+    __tablename__ = "list_field_schemas"
+
+    list_id = Column(String, primary_key=True, index=True)
+    fields = Column(SQLiteJSON, default=list)
+    fields_hash = Column(String, nullable=True)
+    version = Column(Integer, nullable=False, default=0)
+    fetched_at = Column(DateTime, nullable=True)
+    # Marcada por webhooks de lista: se vuelve a pedir a ClickUp en el próximo uso
+    stale = Column(Integer, default=0)
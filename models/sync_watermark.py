@@ -0,0 +1,17 @@
+
+
+from sqlalchemy import Column, String, DateTime
+from core.database import Base
+
+
+class SyncWatermark(Base):
+    """Última fecha de actualización (date_updated) ya ingerida por workspace"""
+
+    __tablename__ = "sync_watermarks"
+
+    workspace_id = Column(String, primary_key=True, index=True)
+    last_date_updated = Column(DateTime, nullable=True)
+    source = Column(String, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+
+
@@ -1,10 +1,43 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index, text
 from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
+from sqlalchemy.orm import declared_attr, validates
 from core.database import Base
+from core.task_ingest import normalize_id, priority_to_int
 
 
-class Task(Base):
-    __tablename__ = "tasks"
+# Condición de las consultas sobre tareas abiertas (listados y vencidas)
+OPEN_TASK_CONDITION = "status != 'complete'"
+
+
+def task_indexes(table_name: str) -> tuple:
+    """Índices compuestos y parciales según las consultas de tasks, dashboard y reports"""
+    open_only = dict(
+        sqlite_where=text(OPEN_TASK_CONDITION),
+        postgresql_where=text(OPEN_TASK_CONDITION)
+    )
+    return (
+        # Listado por defecto: workspace, solo abiertas, orden por id
+        Index(f"ix_{table_name}_open_workspace_id", "workspace_id", "id", **open_only),
+        # Filtros workspace + estado y reportes por estado de un workspace
+        Index(f"ix_{table_name}_workspace_status", "workspace_id", "status"),
+        # Filtros por asignado (+ estado) y rendimiento por usuario
+        Index(f"ix_{table_name}_assignee_status", "assignee_id", "status"),
+        # Reportes por prioridad de un workspace
+        Index(f"ix_{table_name}_workspace_priority", "workspace_id", "priority"),
+        # Filtro por prioridad y conteo por prioridad del dashboard
+        Index(f"ix_{table_name}_priority_status", "priority", "status"),
+        # Conteo por estado del dashboard
+        Index(f"ix_{table_name}_status", "status"),
+        # Tareas vencidas: due_date < ahora entre las abiertas
+        # (status incluido: el conteo se resuelve solo con el índice)
+        Index(f"ix_{table_name}_open_due_date", "due_date", "status", **open_only),
+        # Actividad reciente del dashboard: last_sync >= desde
+        Index(f"ix_{table_name}_last_sync", "last_sync"),
+    )
+
+
+class TaskColumns:
+    """Columnas compartidas por `tasks` y `tasks_archive`"""
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     clickup_id = Column(String, unique=True, index=True, nullable=False)
@@ -22,5 +55,31 @@ class Task(Base):
     custom_fields = Column(SQLiteJSON, default=dict)
     is_synced = Column(Integer, default=1)
     last_sync = Column(DateTime, nullable=True)
+    content_hash = Column(String, nullable=True)
+    date_closed = Column(DateTime, nullable=True)
+    date_updated = Column(DateTime, nullable=True)
+
+    @declared_attr
+    def __table_args__(cls):
+        return task_indexes(cls.__tablename__)
+
+    # Normalización en escritura: las lecturas nunca reescriben filas
+    @validates("priority")
+    def _validate_priority(self, key, value):
+        return priority_to_int(value)
+
+    @validates("assignee_id", "creator_id")
+    def _validate_ids(self, key, value):
+        return normalize_id(value)
+
+
+class Task(TaskColumns, Base):
+    __tablename__ = "tasks"
+
+    @declared_attr
+    def __table_args__(cls):
+        # AUTOINCREMENT: el ID de una tarea archivada no se reasigna a otra del
+        # tier caliente (hot + archivo se leen unidos bajo la identidad de Task)
+        return task_indexes(cls.__tablename__) + ({"sqlite_autoincrement": True},)
 
 
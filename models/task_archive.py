@@ -0,0 +1,12 @@
+
+
+from core.database import Base
+from models.task import TaskColumns
+
+
+class TaskArchive(TaskColumns, Base):
+    """Tareas cerradas hace más de N días (tier frío), misma forma que `tasks`"""
+
+    __tablename__ = "tasks_archive"
+
+
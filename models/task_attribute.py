@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Float, Index, String
+from core.database import Base
+
+
+class TaskTag(Base):
+    """Tag de una tarea (una fila por tag), para filtrar y agrupar en SQL"""
+
+    __tablename__ = "task_tags"
+    __table_args__ = (
+        Index("ix_task_tags_tag_task_id", "tag", "task_id"),
+    )
+
+    # ID de ClickUp: la fila sigue valiendo si la tarea pasa a `tasks_archive`
+    task_id = Column(String, primary_key=True)
+    tag = Column(String, primary_key=True)
+
+
+class TaskFieldValue(Base):
+    """Valor de un custom field de una tarea como texto y, si aplica, como número"""
+
+    __tablename__ = "task_field_values"
+    __table_args__ = (
+        Index("ix_task_field_values_field_text", "field_id", "value_text"),
+        Index("ix_task_field_values_field_num", "field_id", "value_num"),
+        Index("ix_task_field_values_name_text", "field_name", "value_text"),
+    )
+
+    task_id = Column(String, primary_key=True)
+    field_id = Column(String, primary_key=True)
+    # Nombre en minúsculas: los IDs de un mismo campo cambian entre listas
+    field_name = Column(String, nullable=True)
+    value_text = Column(String, nullable=True)
+    value_num = Column(Float, nullable=True)
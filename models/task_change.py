@@ -0,0 +1,38 @@
+from sqlalchemy import Column, DateTime, Index, Integer, JSON, String
+from core.database import Base
+
+
+class TaskChange(Base):
+    """Entrada del registro de cambios de tareas (solo se agregan filas).
+
+    El ID es el cursor de GET /tasks/changes; AUTOINCREMENT en SQLite para
+    no reutilizar IDs después de compactar.
+    """
+
+    __tablename__ = "task_changes"
+    __table_args__ = (
+        Index("ix_task_changes_workspace_id_id", "workspace_id", "id"),
+        Index("ix_task_changes_task_id_id", "task_id", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(String, nullable=False)
+    workspace_id = Column(String, nullable=True)
+    change_type = Column(String, nullable=False)  # created, updated, deleted
+    changes = Column(JSON, nullable=True)
+    changed_at = Column(DateTime, nullable=False, index=True)
+
+
+class TaskChangeLogState(Base):
+    """Marca de la compactación del registro de cambios (una sola fila).
+
+    Todas las entradas con ID <= `purged_through_id` se eliminaron: un
+    cursor anterior ya no puede recibir todos sus cambios.
+    """
+
+    __tablename__ = "task_change_log_state"
+
+    id = Column(Integer, primary_key=True)
+    purged_through_id = Column(Integer, nullable=False, default=0)
+    purged_at = Column(DateTime, nullable=True)
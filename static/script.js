@@ -50,6 +50,32 @@ if (window.location.hostname.includes('railway.app')) {
 // Variables globales para reportes
 let reportCharts = {};
 
+// Tareas del dashboard por clickup_id (se mantienen al día con el stream SSE)
+const dashboardTasks = new Map();
+let taskStream = null;
+
+// Validadores (ETag) de GET condicionales: url -> { etag, data }
+const etagCache = new Map();
+
+// GET con If-None-Match: ante un 304 se reutiliza la última respuesta recibida
+async function fetchWithETag(url) {
+    const cached = etagCache.get(url);
+    const headers = cached ? { 'If-None-Match': cached.etag } : {};
+    const response = await fetch(url, { headers, cache: 'no-store' });
+    if (response.status === 304 && cached) {
+        return { ok: true, status: 304, data: cached.data };
+    }
+    if (!response.ok) {
+        return { ok: false, status: response.status, data: null };
+    }
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+    if (etag) {
+        etagCache.set(url, { etag, data });
+    }
+    return { ok: true, status: response.status, data };
+}
+
 // Función simple para reconstruir índice de búsqueda
 window.rebuildSearchIndex = function() {
     console.log('INFO: Reconstruyendo índice de búsqueda...');
@@ -77,6 +103,9 @@ async function initializeApp() {
     
     // Configurar eventos
     setupEventListeners();
+    
+    // Cambios en vivo en lugar de recargar listas completas
+    connectTaskStream();
 }
 
 // Configurar navegación por tabs
@@ -207,7 +236,9 @@ async function loadInitialData() {
 async function loadDashboardData() {
     try {
         // Cargar TODAS las tareas (incluidas completadas), paginando hasta 100 por página
-        const allTasks = await fetchAllTasksForDashboard();
+        const allTasks = await fetchAllTasksForDashboard('summary');
+        dashboardTasks.clear();
+        allTasks.forEach(task => dashboardTasks.set(task.clickup_id, task));
         updateDashboardStats(allTasks);
     } catch (error) {
         console.error('Error cargando datos del dashboard:', error);
@@ -267,22 +298,62 @@ async function refreshDashboardCounters() {
 }
 
 // Obtener todas las tareas para el dashboard (incluye completadas)
-async function fetchAllTasksForDashboard() {
+// `fields` opcional: preset o lista de campos para reducir el payload
+async function fetchAllTasksForDashboard(fields) {
     const all = [];
-    let page = 0;
+    let cursor = '';
     const limit = 100; // máximo permitido por el backend
     while (true) {
-        const resp = await fetch(`/api/v1/tasks/?include_closed=true&page=${page}&limit=${limit}`);
+        // Paginación por cursor (keyset) sin conteo total
+        const params = new URLSearchParams({ include_closed: 'true', sort_by: 'id', count: 'none', limit: String(limit) });
+        if (cursor) params.set('cursor', cursor);
+        if (fields) params.set('fields', fields);
+        const resp = await fetchWithETag(`/api/v1/tasks/?${params.toString()}`);
         if (!resp.ok) break;
-        const data = await resp.json();
+        const data = resp.data;
         const batch = data.tasks || [];
         all.push(...batch);
-        if (!data.has_more) break;
-        page += 1;
+        if (!data.has_more || !data.next_cursor) break;
+        cursor = data.next_cursor;
     }
     return all;
 }
 
+// Stream SSE de cambios de tareas (EventSource reconecta solo y envía Last-Event-ID)
+function connectTaskStream() {
+    if (!window.EventSource || taskStream) return;
+    taskStream = new EventSource('/api/v1/tasks/stream');
+    ['created', 'updated', 'deleted'].forEach(type => {
+        taskStream.addEventListener(type, event => applyTaskEvent(JSON.parse(event.data)));
+    });
+    // Eventos perdidos (reinicio del servidor o cliente lento): recargar una vez
+    taskStream.addEventListener('reset', async () => {
+        console.log('🔄 Stream de tareas reiniciado, recargando datos...');
+        await loadDashboardData();
+        if (currentTab === 'tasks') await loadTasks();
+    });
+}
+
+// Aplicar un evento de cambio a las tareas en memoria y repintar
+function applyTaskEvent(change) {
+    const index = tasks.findIndex(task => task.clickup_id === change.task_id);
+    if (change.type === 'deleted') {
+        dashboardTasks.delete(change.task_id);
+        if (index !== -1) tasks.splice(index, 1);
+    } else {
+        const base = { clickup_id: change.task_id, workspace_id: change.workspace_id };
+        const current = dashboardTasks.get(change.task_id) || base;
+        dashboardTasks.set(change.task_id, { ...current, ...change.changes });
+        if (index !== -1) {
+            tasks[index] = { ...tasks[index], ...change.changes };
+        } else if (change.type === 'created') {
+            tasks.unshift({ ...base, ...change.changes });
+        }
+    }
+    updateDashboardStats([...dashboardTasks.values()]);
+    if (currentTab === 'tasks') displayTasks(tasks);
+}
+
 // Cargar tareas
 async function loadTasks() {
     console.log('📋 Cargando tareas...');
@@ -291,9 +362,9 @@ async function loadTasks() {
     tasksList.innerHTML = '<div class="loading">Cargando tareas...</div>';
     
     try {
-        const response = await fetch('/api/v1/tasks/');
+        const response = await fetchWithETag('/api/v1/tasks/');
         if (response.ok) {
-            const data = await response.json();
+            const data = response.data;
             tasks = data.tasks || [];
             console.log(`OK: Tareas cargadas: ${tasks.length} tareas`);
             displayTasks(tasks);
@@ -1171,12 +1242,12 @@ function showNotification(message, type = 'info') {
 async function editTask(taskId) {
     try {
         // Obtener datos de la tarea
-        const response = await fetch(`/api/v1/tasks/${taskId}`);
+        const response = await fetchWithETag(`/api/v1/tasks/${taskId}`);
         if (!response.ok) {
             throw new Error('Error al obtener datos de la tarea');
         }
         
-        const task = await response.json();
+        const task = response.data;
         
         // Llenar el formulario de edición
         document.getElementById('edit-task-id').value = task.clickup_id || task.id;
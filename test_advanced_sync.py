@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+AdvancedSyncService contra un cliente de ClickUp en memoria: conteos del
+dry-run (crear, actualizar, eliminar) con filas locales sin content_hash,
+tareas archivadas que la sincronización vuelve a recibir y listas sin
+cambios que la reconciliación salta.
+"""
+
+import asyncio
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.pool import StaticPool
+
+import models  # noqa: F401  (registra las tablas en Base.metadata)
+from core.advanced_sync import AdvancedSyncService
+from core.database import Base, SessionLocal
+from core.task_archive import archive_closed_tasks, task_source
+from core.task_search_index import ensure_search_index
+from models.task import Task
+from models.task_archive import TaskArchive
+
+WORKSPACE_ID = "ws"
+
+
+@contextmanager
+def _fresh_database():
+    """Base en memoria nueva para este test; get_db()/SessionLocal apuntan a ella"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
+    previous = SessionLocal.kw.get("bind")
+    SessionLocal.configure(bind=engine)
+    try:
+        yield SessionLocal
+    finally:
+        SessionLocal.configure(bind=previous)
+
+
+class FakeClickUp:
+    """Workspace de ClickUp en memoria: un space y listas con tareas"""
+
+    def __init__(self, lists: dict):
+        self.lists = lists
+        self.task_requests = []
+
+    async def get_spaces(self, workspace_id):
+        return [{"id": "space-1"}]
+
+    async def get_lists(self, space_id):
+        return [{"id": list_id, "task_count": len(tasks)} for list_id, tasks in self.lists.items()]
+
+    async def get_tasks(self, list_id, include_closed=False, page=0):
+        self.task_requests.append(list_id)
+        tasks = self.lists.get(list_id, [])
+        if not include_closed:
+            tasks = [t for t in tasks if t["status"]["status"] not in ("complete", "closed")]
+        return tasks[page * 100:(page + 1) * 100]
+
+    async def get_workspace_tasks(self, workspace_id, date_updated_gt=None, include_closed=False, page=0):
+        tasks = [
+            t for tasks in self.lists.values() for t in tasks
+            if date_updated_gt is None or int(t["date_updated"]) > date_updated_gt
+        ]
+        return {"tasks": tasks if page == 0 else [], "last_page": True}
+
+
+def _remote_task(task_id: str, name: str, list_id: str = "l1", status: str = "open", **values) -> dict:
+    task = {
+        "id": task_id, "name": name, "description": "", "status": {"status": status},
+        "priority": {"id": "3", "priority": "normal"}, "team_id": WORKSPACE_ID,
+        "list": {"id": list_id}, "assignees": [], "tags": [], "custom_fields": [],
+        "date_updated": "1700000000000",
+    }
+    task.update(values)
+    return task
+
+
+def _local_task(clickup_id: str, name: str, **values) -> Task:
+    values.setdefault("custom_fields", {})
+    values.setdefault("status", "open")
+    return Task(clickup_id=clickup_id, name=name, description="", priority=3,
+                workspace_id=WORKSPACE_ID, list_id="l1", tags=[], **values)
+
+
+def _service(client: FakeClickUp) -> AdvancedSyncService:
+    service = AdvancedSyncService()
+    service.clickup_client = client
+    return service
+
+
+def test_dry_run_counts_creates_updates_and_deletes():
+    with _fresh_database() as session_factory:
+        db = session_factory()
+        # Guardadas sin content_hash, con custom fields locales {nombre: valor}
+        db.add(_local_task("same", "Sin cambios", custom_fields={"Email": "cliente@example.com", "Prioridad": "Alta"}))
+        db.add(_local_task("changed", "Nombre viejo"))
+        db.add(_local_task("gone", "Borrada en ClickUp"))
+        db.commit()
+        db.close()
+
+        client = FakeClickUp({"l1": [
+            _remote_task("same", "Sin cambios", custom_fields=[
+                {"id": "cf-email", "name": "Email", "type": "email", "value": "cliente@example.com"},
+                {"id": "cf-prio", "name": "Prioridad", "type": "drop_down", "value": 0,
+                 "type_config": {"options": [{"id": "o1", "name": "Alta", "orderindex": 0}]}},
+                {"id": "cf-note", "name": "Nota", "type": "text"},
+            ]),
+            _remote_task("changed", "Nombre nuevo"),
+            _remote_task("new", "Creada en ClickUp"),
+        ]})
+        result = asyncio.run(_service(client).dry_run_workspace(WORKSPACE_ID))
+
+        assert result.success, result.errors
+        assert result.to_create == ["new"]
+        assert result.to_update == ["changed"]
+        assert result.to_delete == ["gone"]
+        assert result.unchanged == 1
+        assert result.field_diffs["changed"] == {"name": {"local": "Nombre viejo", "remote": "Nombre nuevo"}}
+
+
+def test_sync_of_archived_task_leaves_one_copy():
+    closed_at = datetime.now() - timedelta(days=400)
+    with _fresh_database() as session_factory:
+        db = session_factory()
+        db.add(_local_task("old", "Cerrada hace mucho", status="complete", date_closed=closed_at))
+        db.commit()
+        assert archive_closed_tasks(db)["archived"] == 1
+
+        client = FakeClickUp({"l1": [_remote_task(
+            "old", "Cerrada hace mucho", status="complete",
+            date_closed=str(int(closed_at.timestamp() * 1000)),
+            custom_fields=[{"id": "cf-email", "name": "Email", "type": "email", "value": "a@b.c"}]
+        )]})
+        result = asyncio.run(_service(client).sync_since_watermark(WORKSPACE_ID))
+        assert result.success, result.errors
+
+        db.expire_all()
+        source = task_source(include_closed=True)
+        copies = db.query(func.count()).select_from(source).filter(source.clickup_id == "old").scalar()
+        assert copies == 1
+        assert db.query(TaskArchive).count() == 0
+        # Custom fields en la forma local, como los guarda el refresco de GET /tasks/{id}
+        assert db.query(Task.custom_fields).filter(Task.clickup_id == "old").scalar() == {"Email": "a@b.c"}
+        db.close()
+
+
+def test_reconcile_skips_unchanged_list_after_archiving():
+    closed_at = datetime.now() - timedelta(days=400)
+    with _fresh_database() as session_factory:
+        client = FakeClickUp({"l1": [
+            _remote_task("open-1", "Abierta"),
+            _remote_task("old", "Cerrada hace mucho", status="complete",
+                         date_closed=str(int(closed_at.timestamp() * 1000))),
+        ]})
+        service = _service(client)
+        first = asyncio.run(service.reconcile_workspace(WORKSPACE_ID))
+        assert first.success, first.errors
+        assert (first.lists_total, first.lists_skipped) == (1, 0)
+
+        db = session_factory()
+        assert archive_closed_tasks(db)["archived"] == 1
+        db.close()
+
+        client.task_requests.clear()
+        second = asyncio.run(service.reconcile_workspace(WORKSPACE_ID))
+        assert second.success, second.errors
+        assert (second.lists_total, second.lists_skipped) == (1, 1)
+        assert client.task_requests == []
+
+
+if __name__ == "__main__":
+    test_dry_run_counts_creates_updates_and_deletes()
+    test_sync_of_archived_task_leaves_one_copy()
+    test_reconcile_skips_unchanged_list_after_archiving()
+    print("✅ Sincronización avanzada correcta")
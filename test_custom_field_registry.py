@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Registro de esquemas de custom fields por lista: resolución nombre/ID y de
+opciones, carga memoria -> BD -> ClickUp, versión que solo sube si el
+esquema cambia e invalidación (webhooks de lista).
+"""
+
+import asyncio
+import os
+import sys
+from contextlib import contextmanager
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+import models  # noqa: F401  (registra las tablas en Base.metadata)
+from core.config import settings
+from core.custom_field_registry import CustomFieldRegistry
+from core.database import Base, SessionLocal
+from utils.notifications import extract_contacts_from_custom_fields
+
+LIST_ID = "l1"
+
+
+@contextmanager
+def _fresh_database():
+    """Base en memoria nueva para este test; SessionLocal apunta a ella"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    previous = SessionLocal.kw.get("bind")
+    SessionLocal.configure(bind=engine)
+    try:
+        yield SessionLocal
+    finally:
+        SessionLocal.configure(bind=previous)
+
+
+class FakeClickUp:
+    """Campos de una lista como los devuelve GET /list/{id}/field"""
+
+    def __init__(self, fields: list):
+        self.fields = fields
+        self.requests = 0
+
+    async def get_list_custom_fields(self, list_id):
+        self.requests += 1
+        return self.fields
+
+
+def _fields(*extra: dict) -> list:
+    return [
+        {"id": "cf-email", "name": "Email", "type": "email"},
+        {"id": "cf-prio", "name": "Prioridad cliente", "type": "drop_down", "type_config": {"options": [
+            {"id": "opt-a", "name": "Alta", "orderindex": 0},
+            {"id": "opt-b", "name": "Baja", "orderindex": 1},
+        ]}},
+        *extra,
+    ]
+
+
+def test_name_and_option_resolution():
+    with _fresh_database():
+        client = FakeClickUp(_fields())
+        schema = asyncio.run(CustomFieldRegistry(ttl_seconds=60).get_schema(LIST_ID, client))
+
+        assert schema.version == 1
+        assert schema.field_id("email") == schema.field_id(" EMAIL ") == "cf-email"
+        assert schema.field_name("cf-prio") == "Prioridad cliente"
+        assert schema.get("cf-prio") is schema.get("prioridad cliente")
+        assert schema.field_id("Desconocido") is None
+
+        # Opciones por orderindex o por ID
+        assert schema.display_value("Prioridad cliente", 1) == "Baja"
+        assert schema.display_value("cf-prio", "opt-a") == "Alta"
+        assert schema.display_value("cf-prio", [0, 1]) == ["Alta", "Baja"]
+        assert schema.display_value("Email", "a@b.c") == "a@b.c"
+
+        assert schema.to_clickup_payload({"email": "a@b.c", "Nota": "x", "Prioridad cliente": ""}) == [
+            {"id": "cf-email", "value": "a@b.c"}
+        ]
+        assert schema.named_values([{"id": "cf-email", "value": "a@b.c"}, {"id": "cf-x", "value": 3}]) == {
+            "Email": "a@b.c", "cf-x": 3
+        }
+        # Contactos desde la forma de lista de ClickUp; Telegram sigue deshabilitado
+        previous = settings.TASK_TELEGRAM_FIELDS
+        settings.TASK_TELEGRAM_FIELDS = "Celular"
+        try:
+            emails, telegrams, _ = extract_contacts_from_custom_fields(
+                [{"id": "cf-email", "value": "a@b.c"}, {"id": "cf-cel", "name": "Celular", "value": "12345"}], LIST_ID
+            )
+        finally:
+            settings.TASK_TELEGRAM_FIELDS = previous
+        assert (emails, telegrams) == (["a@b.c"], [])
+
+        # Lista vacía o sin ID: esquema vacío sin llamar a ClickUp
+        assert asyncio.run(CustomFieldRegistry().get_schema(None, client)).fields == []
+        assert client.requests == 1
+
+
+def test_cache_layers_and_invalidation():
+    with _fresh_database():
+        client = FakeClickUp(_fields())
+        registry = CustomFieldRegistry(ttl_seconds=60)
+        asyncio.run(registry.get_schema(LIST_ID, client))
+        asyncio.run(registry.get_schema(LIST_ID, client))
+        assert client.requests == 1
+
+        # Otro proceso (memoria vacía) lee el esquema guardado en la BD
+        cold = CustomFieldRegistry(ttl_seconds=60)
+        assert cold.cached(LIST_ID).version == 1
+        assert asyncio.run(cold.get_schema(LIST_ID, client)).version == 1
+        assert client.requests == 1
+
+        # Invalidado sin cambios en ClickUp: se vuelve a pedir y la versión no sube
+        registry.invalidate(LIST_ID)
+        assert asyncio.run(registry.get_schema(LIST_ID, client)).version == 1
+        assert client.requests == 2
+
+        # Invalidado con un campo nuevo: la versión sube y el campo se resuelve
+        client.fields = _fields({"id": "cf-cel", "name": "Celular", "type": "phone"})
+        registry.invalidate(LIST_ID)
+        schema = asyncio.run(registry.get_schema(LIST_ID, client))
+        assert (schema.version, schema.field_id("celular")) == (2, "cf-cel")
+        assert client.requests == 3
+
+        # Esquema invalidado: `cached` lo sigue sirviendo hasta el refresco
+        registry.invalidate(LIST_ID)
+        stale = CustomFieldRegistry(ttl_seconds=60).cached(LIST_ID)
+        assert stale is not None and stale.field_id("celular") == "cf-cel"
+
+
+if __name__ == "__main__":
+    test_name_and_option_resolution()
+    test_cache_layers_and_invalidation()
+    print("✅ Registro de custom fields correcto")
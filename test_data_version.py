@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+GET condicionales con ETag / If-None-Match: 304 en el listado, el detalle y
+el dashboard mientras no cambian los datos; el ETag cambia con las tareas
+del workspace y con los nombres de usuarios y workspaces, y un cambio en un
+workspace no invalida los listados de los demás.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+import models  # noqa: F401  (registra las tablas en Base.metadata)
+from core.data_version import GLOBAL_SCOPE
+from core.database import Base, SessionLocal
+from core.task_search_index import ensure_search_index
+from main import app
+from models.data_version import DataVersion
+from models.task import Task
+from models.user import User
+from models.workspace import Workspace
+
+
+@contextmanager
+def _fresh_database():
+    """Base en memoria nueva para este test; get_db()/SessionLocal apuntan a ella"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
+    previous = SessionLocal.kw.get("bind")
+    SessionLocal.configure(bind=engine)
+    try:
+        yield SessionLocal
+    finally:
+        SessionLocal.configure(bind=previous)
+
+
+def _seed(session_factory):
+    db = session_factory()
+    try:
+        db.add(User(clickup_id="u1", first_name="Ana", last_name="Pérez"))
+        db.add(Workspace(clickup_id="ws1", name="Ventas"))
+        for clickup_id, workspace_id in (("t1", "ws1"), ("t2", "ws2")):
+            db.add(Task(clickup_id=clickup_id, name=f"Tarea {clickup_id}", status="open", workspace_id=workspace_id,
+                        list_id="l1", assignee_id="u1", tags=[], custom_fields={}, last_sync=datetime.now()))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _update(session_factory, model, clickup_id: str, **values):
+    db = session_factory()
+    try:
+        row = db.query(model).filter(model.clickup_id == clickup_id).one()
+        for name, value in values.items():
+            setattr(row, name, value)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _revalidate(client: TestClient, url: str, etag: str):
+    return client.get(url, headers={"If-None-Match": etag})
+
+
+def test_task_list_etag():
+    with _fresh_database() as session_factory:
+        _seed(session_factory)
+        client = TestClient(app)
+
+        first = client.get("/api/v1/tasks/")
+        etag = first.headers["ETag"]
+        assert first.status_code == 200 and first.json()["tasks"][0]["assignee_name"] == "Ana Pérez"
+        cached = _revalidate(client, "/api/v1/tasks/", etag)
+        assert (cached.status_code, cached.content, cached.headers["ETag"]) == (304, b"", etag)
+
+        # Cambio en ws1: el listado global y el de ws1 cambian; el de ws2 no
+        ws2_etag = client.get("/api/v1/tasks/?workspace_id=ws2").headers["ETag"]
+        _update(session_factory, Task, "t1", name="Renombrada")
+        assert _revalidate(client, "/api/v1/tasks/", etag).status_code == 200
+        assert _revalidate(client, "/api/v1/tasks/?workspace_id=ws2", ws2_etag).status_code == 304
+
+        # Sin fila `*`: cada escritura solo incrementa el contador de su workspace
+        db = session_factory()
+        try:
+            versions = dict(db.query(DataVersion.scope, DataVersion.version))
+        finally:
+            db.close()
+        assert GLOBAL_SCOPE not in versions and versions["ws1"] == 2 and versions["ws2"] == 1
+
+        # Renombrar al asignado invalida el ETag y la respuesta trae el nombre nuevo
+        etag = client.get("/api/v1/tasks/").headers["ETag"]
+        _update(session_factory, User, "u1", first_name="Eva")
+        renamed = _revalidate(client, "/api/v1/tasks/", etag)
+        assert renamed.status_code == 200
+        assert {task["assignee_name"] for task in renamed.json()["tasks"]} == {"Eva Pérez"}
+
+
+def test_task_detail_etag():
+    with _fresh_database() as session_factory:
+        _seed(session_factory)
+        client = TestClient(app)
+
+        first = client.get("/api/v1/tasks/t1")
+        etag = first.headers["ETag"]
+        assert first.status_code == 200
+        cached = _revalidate(client, "/api/v1/tasks/t1", etag)
+        assert cached.status_code == 304 and cached.headers["X-Task-Freshness"] == "fresh"
+
+        # Renombrar el workspace cambia el ETag del detalle
+        _update(session_factory, Workspace, "ws1", name="Marketing")
+        renamed = _revalidate(client, "/api/v1/tasks/t1", etag)
+        assert renamed.status_code == 200 and renamed.headers["ETag"] != etag
+        sparse = client.get("/api/v1/tasks/t1?fields=workspace_name")
+        assert sparse.json()["workspace_name"] == "Marketing"
+
+        # Cambio de la tarea: ETag nuevo
+        etag = renamed.headers["ETag"]
+        _update(session_factory, Task, "t1", description="Nueva")
+        assert _revalidate(client, "/api/v1/tasks/t1", etag).status_code == 200
+
+
+def test_dashboard_etag():
+    with _fresh_database() as session_factory:
+        _seed(session_factory)
+        client = TestClient(app)
+
+        first = client.get("/api/v1/dashboard/stats")
+        etag = first.headers["ETag"]
+        assert first.status_code == 200
+        assert _revalidate(client, "/api/v1/dashboard/stats", etag).status_code == 304
+
+        # Las estadísticas de usuarios forman parte del dashboard
+        db = session_factory()
+        try:
+            db.add(User(clickup_id="u2", username="luis", email="luis@example.com"))
+            db.commit()
+        finally:
+            db.close()
+        changed = _revalidate(client, "/api/v1/dashboard/stats", etag)
+        assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+
+if __name__ == "__main__":
+    test_task_list_etag()
+    test_task_detail_etag()
+    test_dashboard_etag()
+    print("✅ ETags y respuestas 304 correctos")
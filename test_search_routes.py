@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Las rutas de búsqueda devuelven las tareas de los resultados del índice:
+el índice guarda IDs de ClickUp y la hidratación busca por ese mismo ID.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models  # noqa: F401  (registra las tablas en Base.metadata)
+from api.routes.search import search_tasks
+from core.database import Base
+from core.search_engine import search_engine
+from core.task_search_index import ensure_search_index
+from models.task import Task
+
+
+def _fresh_session():
+    """Sesión sobre una base en memoria nueva para este test"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def test_search_route_hydrates_index_results():
+    db = _fresh_session()
+    try:
+        # IDs locales distintos de los de ClickUp: la hidratación no debe confundirlos
+        for i, name in enumerate(["Preparar informe", "Revisar contrato", "Llamar proveedor"]):
+            db.add(Task(id=100 + i, clickup_id=f"cu-{i}", name=name, status="open", priority=3,
+                        workspace_id="ws", list_id="l1", tags=[], custom_fields={}))
+        db.commit()
+
+        tasks = [{c.name: getattr(t, c.name) for c in Task.__table__.columns} for t in db.query(Task)]
+        search_engine.index_texts(tasks)
+        assert search_engine.task_ids == ["cu-0", "cu-1", "cu-2"]
+
+        # Sin modelo de embeddings: `search_tasks` solo necesita los textos indexados
+        search_engine.is_initialized = True
+        search_engine.index = object()
+        result = asyncio.run(search_tasks(query="informe", top_k=10, threshold=0.3, db=db))
+
+        assert result["total_results"] == 3, result
+        assert [task["clickup_id"] for task in result["tasks"]] == ["cu-0", "cu-1", "cu-2"]
+        assert result["tasks"][0]["name"] == "Preparar informe"
+        assert all("search_score" in task and "search_text" in task for task in result["tasks"])
+    finally:
+        search_engine.index = None
+        search_engine.is_initialized = False
+        db.close()
+
+
+if __name__ == "__main__":
+    test_search_route_hydrates_index_results()
+    print("✅ Las rutas de búsqueda devuelven las tareas indexadas")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Reparto del presupuesto de rate limit entre workspaces (FairRateScheduler):
+cuota proporcional al peso, un workspace que llega tarde no espera detrás
+del backlog de otro, nunca se conceden más permisos que los del rate
+limiter y la sincronización multi-workspace pide cada llamada a ClickUp al
+scheduler, respetando la concurrencia por workspace.
+"""
+
+import asyncio
+import os
+import sys
+from contextlib import contextmanager
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+import models  # noqa: F401  (registra las tablas en Base.metadata)
+from core.advanced_sync import AdvancedSyncService
+from core.database import Base, SessionLocal
+from core.sync_orchestrator import FairRateScheduler, MultiWorkspaceSyncOrchestrator
+from core.task_search_index import ensure_search_index
+
+
+@contextmanager
+def _fresh_database():
+    """Base en memoria nueva para este test; get_db()/SessionLocal apuntan a ella"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
+    previous = SessionLocal.kw.get("bind")
+    SessionLocal.configure(bind=engine)
+    try:
+        yield SessionLocal
+    finally:
+        SessionLocal.configure(bind=previous)
+
+
+class TickLimiter:
+    """Rate limiter determinista: cada permiso espera un tick que libera el test"""
+
+    def __init__(self, ticks: int = 0):
+        self.permits = 0
+        self._ticks = asyncio.Semaphore(ticks)
+
+    async def acquire(self):
+        await self._ticks.acquire()
+        self.permits += 1
+
+    def release(self, ticks: int):
+        for _ in range(ticks):
+            self._ticks.release()
+
+
+async def _settle():
+    # Dejar avanzar al despachador y a los que esperan turno
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+def _requests(scheduler: FairRateScheduler, workspace_id: str, count: int, order: list) -> list:
+    async def request():
+        await scheduler.acquire(workspace_id)
+        order.append(workspace_id)
+
+    return [asyncio.create_task(request()) for _ in range(count)]
+
+
+def test_weighted_fair_share_and_budget():
+    async def run():
+        limiter = TickLimiter()
+        scheduler = FairRateScheduler(limiter, {"big": 3, "small": 1})
+        order = []
+        pending = _requests(scheduler, "big", 12, order) + _requests(scheduler, "small", 4, order)
+        await _settle()
+        assert order == [] and limiter.permits == 0
+
+        # 8 permisos: 3 a 1 según el peso
+        limiter.release(8)
+        await _settle()
+        assert order == ["big", "big", "big", "small", "big", "big", "big", "small"]
+        # Nunca más concesiones que permisos del rate limiter
+        assert scheduler.granted == {"big": 6, "small": 2} and limiter.permits == 8
+
+        limiter.release(8)
+        await asyncio.gather(*pending)
+        assert scheduler.granted == {"big": 12, "small": 4} and limiter.permits == 16
+        assert scheduler.get_stats()["pending"] == 0
+
+    asyncio.run(run())
+
+
+def test_late_workspace_is_not_starved():
+    async def run():
+        limiter = TickLimiter()
+        scheduler = FairRateScheduler(limiter)
+        order = []
+        pending = _requests(scheduler, "big", 20, order)
+        limiter.release(10)
+        await _settle()
+        assert order == ["big"] * 10
+
+        # Llega tarde: su etiqueta empieza en el tiempo virtual actual, no en 0
+        pending += _requests(scheduler, "small", 3, order)
+        await _settle()
+        limiter.release(6)
+        await _settle()
+        assert order[10:] == ["big", "small", "big", "small", "big", "small"]
+
+        limiter.release(7)
+        await asyncio.gather(*pending)
+        assert scheduler.granted == {"big": 20, "small": 3}
+
+    asyncio.run(run())
+
+
+class WorkspaceClickUp:
+    """ClickUp en memoria con varios workspaces; registra llamadas y concurrencia"""
+
+    def __init__(self, lists_per_workspace: dict):
+        self.lists_per_workspace = lists_per_workspace
+        self.calls = {workspace_id: 0 for workspace_id in lists_per_workspace}
+        self.in_flight = {workspace_id: 0 for workspace_id in lists_per_workspace}
+        self.max_in_flight = {workspace_id: 0 for workspace_id in lists_per_workspace}
+
+    async def _call(self, workspace_id: str):
+        self.calls[workspace_id] += 1
+        self.in_flight[workspace_id] += 1
+        self.max_in_flight[workspace_id] = max(self.max_in_flight[workspace_id], self.in_flight[workspace_id])
+        await asyncio.sleep(0)
+        self.in_flight[workspace_id] -= 1
+
+    async def get_spaces(self, workspace_id):
+        await self._call(workspace_id)
+        return [{"id": f"{workspace_id}/space"}]
+
+    async def get_lists(self, space_id):
+        workspace_id = space_id.split("/")[0]
+        await self._call(workspace_id)
+        return [{"id": f"{workspace_id}/l{i}"} for i in range(self.lists_per_workspace[workspace_id])]
+
+    async def get_tasks(self, list_id, include_closed=False, page=0):
+        workspace_id = list_id.split("/")[0]
+        await self._call(workspace_id)
+        return [{
+            "id": f"{list_id}/t", "name": "Tarea", "status": {"status": "open"}, "team_id": workspace_id,
+            "list": {"id": list_id}, "assignees": [], "tags": [], "custom_fields": [],
+        }]
+
+
+def test_multi_workspace_sync_uses_shared_budget():
+    async def run():
+        client = WorkspaceClickUp({"ws-a": 6, "ws-b": 2})
+        service = AdvancedSyncService()
+        service.clickup_client = client
+        service.rate_limiter = TickLimiter(ticks=1000)
+        orchestrator = MultiWorkspaceSyncOrchestrator(
+            service, weights={"ws-a": 2}, concurrency={"ws-a": 2}, default_concurrency=1
+        )
+        return client, service.rate_limiter, await orchestrator.sync_workspaces(["ws-a", "ws-b"])
+
+    with _fresh_database():
+        client, limiter, result = asyncio.run(run())
+
+    assert result.success, result.workspaces
+    # Cada llamada a ClickUp pasó por el scheduler y por el rate limiter compartido
+    assert client.calls == {"ws-a": 8, "ws-b": 4}
+    assert result.scheduler["granted"] == client.calls
+    assert limiter.permits == sum(client.calls.values())
+    assert result.workspaces["ws-a"]["items_created"] == 6
+    # Concurrencia por workspace: override para ws-a, valor por defecto para ws-b
+    assert client.max_in_flight == {"ws-a": 2, "ws-b": 1}
+
+
+if __name__ == "__main__":
+    test_weighted_fair_share_and_budget()
+    test_late_workspace_is_not_starved()
+    test_multi_workspace_sync_uses_shared_budget()
+    print("✅ Reparto del rate limit entre workspaces correcto")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tablas auxiliares de tags y custom fields: filtros y conteos por tag y por
+campo (texto o número), y limpieza de las filas de tareas que se descartan
+del archivo.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models  # noqa: F401  (registra las tablas en Base.metadata)
+from core.database import Base
+from core.task_archive import archive_closed_tasks, discard_archived
+from core.task_attributes import field_filter, field_value_counts, tag_counts, tag_filter
+from core.task_search_index import ensure_search_index
+from models.task import Task
+from models.task_attribute import TaskFieldValue, TaskTag
+
+
+def _fresh_session():
+    """Sesión sobre una base en memoria nueva para este test"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def _task(clickup_id: str, tags: list, custom_fields: dict, **values) -> Task:
+    values.setdefault("status", "open")
+    return Task(clickup_id=clickup_id, name=f"Tarea {clickup_id}", workspace_id="ws", list_id="l1",
+                tags=tags, custom_fields=custom_fields, **values)
+
+
+def _ids(db, condition) -> list:
+    return sorted(task_id for (task_id,) in db.query(Task.clickup_id).filter(condition))
+
+
+def test_tag_and_custom_field_filters():
+    db = _fresh_session()
+    try:
+        db.add(_task("a", ["Urgente", "cliente"], {"Empresa": "Acme", "Horas": "5"}))
+        db.add(_task("b", ["cliente"], {"Empresa": "Globex", "Horas": 5.0}))
+        db.add(_task("c", [], {}))
+        db.commit()
+
+        assert _ids(db, tag_filter(Task, "urgente")) == ["a"]
+        assert _ids(db, tag_filter(Task, "URGENTE, cliente")) == ["a", "b"]
+        assert _ids(db, field_filter(Task, "empresa", "Acme")) == ["a"]
+        assert _ids(db, field_filter(Task, "Horas", 5)) == ["a", "b"]
+        assert _ids(db, field_filter(Task, "Empresa")) == ["a", "b"]
+        assert tag_counts(db) == {"cliente": 2, "urgente": 1}
+        assert field_value_counts(db, "empresa") == {"Acme": 1, "Globex": 1}
+
+        # Las filas auxiliares siguen a la tarea al modificarla
+        task = db.query(Task).filter(Task.clickup_id == "b").one()
+        task.tags = ["urgente"]
+        db.commit()
+        assert _ids(db, tag_filter(Task, "urgente")) == ["a", "b"]
+        assert tag_counts(db) == {"urgente": 2, "cliente": 1}
+    finally:
+        db.close()
+
+
+def test_discarded_archive_rows_leave_no_attributes():
+    db = _fresh_session()
+    try:
+        db.add(_task("old", ["Archivada"], {"Empresa": "Acme"}, status="complete",
+                     date_closed=datetime.now() - timedelta(days=400)))
+        db.commit()
+        assert archive_closed_tasks(db)["archived"] == 1
+        # Las filas auxiliares siguen valiendo para la tarea archivada
+        assert tag_counts(db) == {"archivada": 1}
+
+        # Tarea borrada en ClickUp: el archivo la descarta sin volver al tier caliente
+        discard_archived(db, ["old"])
+        db.commit()
+        assert tag_counts(db) == {}
+        assert db.query(TaskTag).count() == 0
+        assert db.query(TaskFieldValue).count() == 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_tag_and_custom_field_filters()
+    test_discarded_archive_rows_leave_no_attributes()
+    print("✅ Tags y custom fields en tablas auxiliares correctos")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Registro de cambios de tareas (GET /tasks/changes): ventana de asentamiento
+con `retry_after`, compactación de las entradas antiguas de cada tarea y 410
+solo cuando la compactación eliminó cambios posteriores al cursor.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models  # noqa: F401  (registra las tablas en Base.metadata)
+from core.config import settings
+from core.database import Base
+from core.task_change_log import changes_since, compact_change_log, encode_change_cursor, purged_through_id
+from models.task_change import TaskChange
+
+
+def _fresh_session():
+    """Sesión sobre una base en memoria nueva para este test"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def _log(db, task_id: str, change_type: str, age: timedelta, **changes) -> int:
+    entry = TaskChange(task_id=task_id, workspace_id="ws", change_type=change_type, changes=changes,
+                       changed_at=datetime.now() - age)
+    db.add(entry)
+    db.commit()
+    return entry.id
+
+
+def _status(call) -> int:
+    try:
+        call()
+    except HTTPException as e:
+        return e.status_code
+    return 200
+
+
+def test_settle_window_and_retry_after():
+    db = _fresh_session()
+    previous = settings.TASK_CHANGE_LOG_SETTLE_SECONDS
+    settings.TASK_CHANGE_LOG_SETTLE_SECONDS = 10
+    try:
+        start = changes_since(db, None)["cursor"]
+        first = _log(db, "a", "created", timedelta(minutes=1), name="A")
+        second = _log(db, "b", "created", timedelta(minutes=1), name="B")
+        _log(db, "c", "created", timedelta(seconds=3), name="C")
+
+        # Página llena con entradas asentadas: has_more y sin espera
+        page = changes_since(db, start, limit=1)
+        assert [c["id"] for c in page["changes"]] == [first]
+        assert (page["has_more"], page["retry_after"]) == (True, None)
+
+        # La entrada reciente no se entrega todavía: faltan ~7 s para asentarse
+        page = changes_since(db, page["cursor"])
+        assert [c["id"] for c in page["changes"]] == [second]
+        assert (page["has_more"], page["retry_after"]) == (False, 7)
+
+        # Repetir de inmediato no avanza el cursor
+        again = changes_since(db, page["cursor"])
+        assert again["changes"] == [] and again["cursor"] == page["cursor"]
+    finally:
+        settings.TASK_CHANGE_LOG_SETTLE_SECONDS = previous
+        db.close()
+
+
+def test_compaction_merges_old_entries():
+    db = _fresh_session()
+    try:
+        created = _log(db, "a", "created", timedelta(days=3), name="A", status="open")
+        _log(db, "a", "updated", timedelta(days=2), name="A2")
+        renamed = _log(db, "a", "updated", timedelta(days=2), priority=1)
+        recent = _log(db, "a", "updated", timedelta(hours=1), status="done")
+        _log(db, "b", "updated", timedelta(days=3), name="B")
+        removed = _log(db, "b", "deleted", timedelta(days=2))
+
+        result = compact_change_log(db, compact_after_hours=24, retention_days=30)
+        assert (result["merged"], result["purged"]) == (3, 0)
+
+        rows = {row.id: row for row in db.query(TaskChange)}
+        assert sorted(rows) == [renamed, recent, removed]
+        # La entrada fusionada conserva el ID mayor y los valores finales
+        assert rows[renamed].change_type == "created"
+        assert rows[renamed].changes == {"name": "A2", "status": "open", "priority": 1}
+        assert (rows[removed].change_type, rows[removed].changes) == ("deleted", {})
+
+        # Un cursor intermedio recibe la entrada fusionada: sin 410 (nada se purgó)
+        page = changes_since(db, encode_change_cursor(created))
+        assert [c["id"] for c in page["changes"]] == [renamed, recent, removed]
+    finally:
+        db.close()
+
+
+def test_gone_only_after_purge():
+    db = _fresh_session()
+    try:
+        oldest = _log(db, "a", "created", timedelta(days=40), name="A")
+        purged = _log(db, "b", "created", timedelta(days=40), name="B")
+        kept = _log(db, "c", "created", timedelta(days=1), name="C")
+
+        # Antes de compactar, un cursor de hace tiempo sigue siendo válido
+        assert _status(lambda: changes_since(db, encode_change_cursor(oldest))) == 200
+
+        assert compact_change_log(db, compact_after_hours=24, retention_days=30)["purged"] == 2
+        assert purged_through_id(db) == purged
+
+        # Cambios posteriores al cursor ya eliminados: 410
+        assert _status(lambda: changes_since(db, encode_change_cursor(oldest))) == 410
+        # El cursor que ya entregó todo lo purgado continúa
+        page = changes_since(db, encode_change_cursor(purged))
+        assert [c["id"] for c in page["changes"]] == [kept]
+
+        # Registro vacío tras purgar todo: un cliente nuevo empieza en la marca, sin 410
+        compact_change_log(db, compact_after_hours=24, retention_days=1)
+        start = changes_since(db, None)["cursor"]
+        assert start == encode_change_cursor(kept)
+        assert changes_since(db, start)["changes"] == []
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_settle_window_and_retry_after()
+    test_compaction_merges_old_entries()
+    test_gone_only_after_purge()
+    print("✅ Registro de cambios correcto")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Llamadas a ClickUp por cada POST /api/v1/tasks/, contra un servidor local que
+imita la API de ClickUp (sin red ni token real).
+
+Uso:
+    python test_task_creation_roundtrips.py
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+from aiohttp import web
+
+LIST_ID = "901411770471"
+LIST_FIELDS = [
+    {"id": "cf-email", "name": "email", "type": "email"},
+    {"id": "cf-celular", "name": "Celular", "type": "phone"},
+]
+
+
+class StandInClickUp:
+    """Servidor mínimo con las rutas de ClickUp que usa la creación de tareas"""
+
+    def __init__(self):
+        self.calls = []
+        self.reject_custom_fields = False
+        self.on_created = None
+        self._next_id = 0
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/api/v2/list/{list_id}/task", self.create_task)
+        app.router.add_get("/api/v2/list/{list_id}/field", self.list_fields)
+        app.router.add_get("/api/v2/task/{task_id}", self.get_task)
+        app.router.add_put("/api/v2/task/{task_id}", self.update_task)
+        app.router.add_post("/api/v2/task/{task_id}/field/{field_id}", self.set_field)
+        return app
+
+    async def create_task(self, request):
+        data = await request.json()
+        self.calls.append(("POST", request.path))
+        if self.reject_custom_fields and data.get("custom_fields"):
+            return web.json_response({"err": "Custom field invalid"}, status=400)
+        self._next_id += 1
+        if self.on_created:
+            self.on_created(f"standin{self._next_id}")
+        return web.json_response({
+            "id": f"standin{self._next_id}",
+            "name": data["name"],
+            "description": data.get("description", ""),
+            "status": {"status": data.get("status", "to do")},
+            "priority": {"id": str(data["priority"])} if data.get("priority") else None,
+            "due_date": str(data["due_date"]) if data.get("due_date") else None,
+            "creator": {"id": 42},
+            "list": {"id": request.match_info["list_id"]},
+            "assignees": [],
+            "tags": [],
+            "custom_fields": [
+                {"id": f["id"], "name": next(x["name"] for x in LIST_FIELDS if x["id"] == f["id"]), "value": f["value"]}
+                for f in data.get("custom_fields") or []
+            ],
+        })
+
+    async def list_fields(self, request):
+        self.calls.append(("GET", request.path))
+        return web.json_response({"fields": LIST_FIELDS})
+
+    async def get_task(self, request):
+        self.calls.append(("GET", request.path))
+        return web.json_response({"id": request.match_info["task_id"], "custom_fields": []})
+
+    async def update_task(self, request):
+        data = await request.json()
+        self.calls.append(("PUT", request.path))
+        if self.reject_custom_fields and data.get("custom_fields"):
+            return web.json_response({"err": "Custom field invalid"}, status=400)
+        return web.json_response({"id": request.match_info["task_id"], **data})
+
+    async def set_field(self, request):
+        self.calls.append(("POST", request.path))
+        return web.json_response({})
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(stand_in: StandInClickUp, port: int):
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+
+    async def run():
+        runner = web.AppRunner(stand_in.app())
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+
+    loop.run_until_complete(run())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+
+def main() -> int:
+    port = _free_port()
+    stand_in = StandInClickUp()
+    _start_server(stand_in, port)
+
+    os.environ["CLICKUP_API_BASE_URL"] = f"http://127.0.0.1:{port}/api/v2"
+    os.environ["CLICKUP_API_TOKEN"] = "pk_standin"
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mktemp(suffix='.db')}"
+    os.environ.setdefault("TASK_CREATE_VERIFY", "False")
+
+    import asyncio
+    from fastapi.testclient import TestClient
+    from core.database import init_db
+    from main import app
+
+    asyncio.run(init_db())
+    client = TestClient(app)
+
+    def create(custom_fields=None) -> tuple:
+        stand_in.calls.clear()
+        body = {
+            "name": "Tarea de prueba",
+            "description": "Descripción de prueba",
+            "workspace_id": "9014943317",
+            "list_id": LIST_ID,
+            "priority": 2,
+            "due_date": int(time.time() * 1000) + 86400000,
+            "custom_fields": custom_fields or {},
+        }
+        response = client.post("/api/v1/tasks/", json=body)
+        return response, list(stand_in.calls)
+
+    fields = {"email": "cliente@example.com", "Celular": "+5491100000000"}
+    failures = []
+
+    def check(label: str, response, calls, expected_calls: int):
+        ok = response.status_code == 201 and len(calls) == expected_calls
+        print(f"{'✅' if ok else '❌'} {label}: HTTP {response.status_code}, {len(calls)} llamadas a ClickUp")
+        for method, path in calls:
+            print(f"     {method} {path}")
+        if not ok:
+            failures.append(label)
+        return response.json() if response.status_code == 201 else {}
+
+    response, calls = create()
+    check("Sin custom fields", response, calls, 1)
+
+    response, calls = create(fields)
+    check("Con custom fields, esquema de la lista sin cargar", response, calls, 2)
+
+    response, calls = create(fields)
+    task = check("Con custom fields, esquema ya registrado (caso común)", response, calls, 1)
+    if task.get("custom_fields") != fields or task.get("priority") != 2 or not task.get("due_date"):
+        failures.append("Fila local desde la respuesta del POST")
+        print(f"❌ Fila local inesperada: {json.dumps(task, default=str)}")
+
+    # ClickUp rechaza los custom fields: un solo POST sin ellos y envío campo por campo
+    stand_in.reject_custom_fields = True
+    response, calls = create(fields)
+    check("400 por custom fields -> envío campo por campo", response, calls, 1 + 1 + len(fields))
+
+    # Un webhook `taskCreated` guarda la tarea antes que la creación por lotes
+    stand_in.reject_custom_fields = False
+    from core.database import SessionLocal
+    from models.task import Task
+
+    def webhook_insert(clickup_id: str):
+        db = SessionLocal()
+        try:
+            db.add(Task(clickup_id=clickup_id, name="Desde webhook", status="to do",
+                        workspace_id="9014943317", list_id=LIST_ID))
+            db.commit()
+        finally:
+            db.close()
+
+    stand_in.on_created = webhook_insert
+    item = {"name": "Tarea por lote", "workspace_id": "9014943317", "list_id": LIST_ID}
+    response = client.post("/api/v1/tasks/batch", json={"items": [item, item]})
+    stand_in.on_created = None
+    results = response.json().get("results", []) if response.status_code == 201 else []
+    ok = len(results) == 2 and all(result["success"] and result["task"] for result in results)
+    print(f"{'✅' if ok else '❌'} Lote con tareas ya guardadas por webhook: HTTP {response.status_code}")
+    if not ok:
+        failures.append("Lote con tareas ya guardadas por webhook")
+        print(f"     {response.text}")
+
+    print("\n✅ Todo correcto" if not failures else f"\n❌ Fallos: {', '.join(failures)}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Verifica que GET /api/v1/tasks no haga consultas N+1 al enriquecer tareas:
+el número de consultas por página debe ser constante, no proporcional a las tareas.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+import models  # noqa: F401  (registra las tablas en Base.metadata)
+from api.routes.tasks import get_tasks
+from core.database import Base
+from core.task_enrichment import task_enricher
+from core.task_search_index import ensure_search_index
+from models.task import Task
+from models.user import User
+from models.workspace import Workspace
+
+# versión de datos (ETag) + count + página + usuarios IN + workspaces IN
+MAX_QUERIES_PER_PAGE = 5
+
+
+def _fresh_engine():
+    """Base en memoria nueva para este test"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
+    return engine
+
+
+def _seed(db, total: int):
+    db.add(Workspace(clickup_id="ws-1", name="Workspace Uno"))
+    for i in range(total):
+        db.add(User(clickup_id=f"user-{i}", username=f"usuario{i}"))
+        db.add(Task(
+            clickup_id=f"task-{i}",
+            name=f"Tarea {i}",
+            status="open",
+            priority=3,
+            workspace_id="ws-1",
+            list_id="list-1",
+            assignee_id=f"user-{i}",
+            tags=[],
+            custom_fields={}
+        ))
+    db.commit()
+
+
+def _count_queries(engine, page_size: int) -> tuple:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    task_enricher.users.clear()
+    task_enricher.workspaces.clear()
+    db = sessionmaker(bind=engine, autoflush=False)()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = asyncio.run(get_tasks(
+            request=Request({"type": "http", "query_string": b"", "headers": []}),
+            workspace_id=None, list_id=None, status=None, assignee_id=None, priority=None,
+            search=None, include_closed=False, page=0, limit=page_size,
+            cursor=None, sort_by=None, count=None, fields=None,
+            tag=None, custom_field=None, custom_value=None, db=db
+        ))
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        db.close()
+    return len(statements), result
+
+
+def test_get_tasks_query_count_is_constant():
+    engine = _fresh_engine()
+    db = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        _seed(db, 100)
+    finally:
+        db.close()
+
+    small_count, _ = _count_queries(engine, 10)
+    large_count, result = _count_queries(engine, 100)
+
+    print(f"🔍 Consultas para 10 tareas: {small_count}, para 100 tareas: {large_count}")
+    assert large_count == small_count, "El número de consultas crece con el tamaño de página (N+1)"
+    assert large_count <= MAX_QUERIES_PER_PAGE, f"Demasiadas consultas por página: {large_count}"
+    tasks = json.loads(result.body)["tasks"]
+    assert all(task["assignee_name"].startswith("usuario") for task in tasks)
+    assert all(task["workspace_name"] == "Workspace Uno" for task in tasks)
+
+
+if __name__ == "__main__":
+    test_get_tasks_query_count_is_constant()
+    print("✅ Sin consultas N+1 en el enriquecimiento de tareas")
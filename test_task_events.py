@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Broker de eventos de tareas del stream SSE: reanudación con Last-Event-ID
+desde el historial (con filtro por workspace), reset cuando el ID no está
+disponible y desborde del buffer de un cliente lento.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.task_events import TaskEventBroker
+
+
+def _events(*workspace_ids: str) -> list:
+    return [
+        {"type": "updated", "task_id": f"t{i}", "workspace_id": workspace_id, "changes": {"name": f"Tarea {i}"}}
+        for i, workspace_id in enumerate(workspace_ids)
+    ]
+
+
+async def _drain(queue: asyncio.Queue) -> list:
+    # Los eventos llegan al loop del cliente con call_soon_threadsafe
+    await asyncio.sleep(0)
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def test_resume_from_last_event_id():
+    async def run():
+        broker = TaskEventBroker(history_size=10, client_buffer=10)
+        published = broker.publish(_events("ws1", "ws2", "ws1"))
+
+        subscription, backlog, reset_id = broker.subscribe(last_event_id=published[0].id)
+        assert reset_id is None
+        assert [e.task_id for e in backlog] == ["t1", "t2"]
+
+        # Solo los eventos de los workspaces suscritos
+        _, backlog, _ = broker.subscribe(["ws1"], last_event_id=published[0].id)
+        assert [e.task_id for e in backlog] == ["t2"]
+
+        # Al día: sin backlog ni reset; los nuevos eventos llegan por la cola
+        live, backlog, reset_id = broker.subscribe(last_event_id=published[-1].id)
+        assert (backlog, reset_id) == ([], None)
+        broker.publish(_events("ws3"))
+        assert [e.task_id for e in await _drain(live.queue)] == ["t0"]
+
+        # ID de otra época (reinicio del proceso): reset con el ID actual
+        _, backlog, reset_id = broker.subscribe(last_event_id="otraepoca-2")
+        assert backlog == [] and reset_id == broker.stats()["last_event_id"]
+
+    asyncio.run(run())
+
+
+def test_resume_outside_history_resets():
+    async def run():
+        broker = TaskEventBroker(history_size=2, client_buffer=10)
+        published = broker.publish(_events("ws", "ws", "ws", "ws"))
+
+        _, backlog, reset_id = broker.subscribe(last_event_id=published[0].id)
+        assert backlog == [] and reset_id == published[-1].id
+        # El evento anterior al más antiguo guardado todavía se puede reanudar
+        _, backlog, reset_id = broker.subscribe(last_event_id=published[1].id)
+        assert reset_id is None and [e.id for e in backlog] == [e.id for e in published[2:]]
+
+    asyncio.run(run())
+
+
+def test_slow_client_overflow_sends_reset():
+    async def run():
+        # Errores de los callbacks del loop (p. ej. QueueFull en `offer`)
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        for buffer in (1, 3):
+            broker = TaskEventBroker(history_size=10, client_buffer=buffer)
+            subscription, _, _ = broker.subscribe()
+            # Un evento más que el buffer: se vacía la cola y queda solo el reset
+            broker.publish(_events(*["ws"] * (buffer + 1)))
+            assert await _drain(subscription.queue) == [None]
+            assert errors == []
+            assert subscription.dropped == buffer + 1
+
+            # Tras el reset el cliente sigue recibiendo eventos
+            broker.publish(_events("ws"))
+            assert [e.task_id for e in await _drain(subscription.queue)] == ["t0"]
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_resume_from_last_event_id()
+    test_resume_outside_history_resets()
+    test_slow_client_overflow_sends_reset()
+    print("✅ Broker de eventos correcto")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Paridad del fast path de serialización de tareas (tuplas + orjson)
+con la ruta Pydantic (TaskResponse.model_validate + jsonable_encoder).
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models  # noqa: F401  (registra las tablas en Base.metadata)
+from api.routes.tasks import _task_response
+from core.database import Base
+from core.task_serialization import FastJSONResponse, response_columns, task_row_to_dict
+from models.task import Task
+
+SAMPLE_TASKS = [
+    dict(clickup_id="a1", name="Tarea con ñ y emoji ✅", description="Descripción", status="open",
+         priority=1, due_date=datetime(2025, 3, 1, 10, 30, 15, 123456), start_date=datetime(2025, 2, 1),
+         workspace_id="ws", list_id="l1", assignee_id="42", creator_id="7", tags=["a", "b"],
+         custom_fields=[{"id": "cf", "name": "Email", "value": "x@y.z"}], is_synced=1,
+         last_sync=datetime(2025, 3, 2, 8, 0, 0)),
+    dict(clickup_id="a2", name="Sin fechas", description=None, status="complete", priority=4,
+         workspace_id="ws", list_id="l2", tags=[], custom_fields={}, is_synced=0),
+    dict(clickup_id="a3", name="Prioridad heredada", status="open", priority=None, workspace_id="ws",
+         list_id="l1", tags=None, custom_fields={"k": {"anidado": [1, 2, 3]}}, is_synced=1),
+]
+
+
+def _fresh_session():
+    """Sesión sobre una base en memoria nueva para este test"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def _pydantic_payload(task) -> dict:
+    response = _task_response(task)
+    return json.loads(JSONResponse(content=jsonable_encoder(response)).body)
+
+
+def _fast_payload(row) -> dict:
+    return json.loads(FastJSONResponse(content=task_row_to_dict(row)).body)
+
+
+def test_fast_path_matches_pydantic_path():
+    db = _fresh_session()
+    try:
+        for values in SAMPLE_TASKS:
+            db.add(Task(**values))
+        db.commit()
+
+        tasks = db.query(Task).order_by(Task.id).all()
+        rows = db.query(Task).with_entities(*response_columns(Task)).order_by(Task.id).all()
+        assert len(tasks) == len(rows) == len(SAMPLE_TASKS)
+        for task, row in zip(tasks, rows):
+            expected = _pydantic_payload(task)
+            actual = _fast_payload(row)
+            assert actual == expected, f"Diferencia en {task.clickup_id}:\n{expected}\n{actual}"
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_fast_path_matches_pydantic_path()
+    print("✅ Fast path idéntico a la ruta Pydantic")
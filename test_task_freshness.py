@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Lecturas stale-while-revalidate de GET /tasks/{id}: fila fresca sin llamar
+a ClickUp, fila vencida servida con refresco en segundo plano, single-flight
+para tareas ausentes y caché de fallos. La tarea refrescada se guarda con
+custom fields `{nombre: valor}`, como en la sincronización.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+import models  # noqa: F401  (registra las tablas en Base.metadata)
+from core.database import Base, SessionLocal
+from core.task_freshness import ARCHIVE, FRESH, STALE, TaskNotFound, TaskRefresher
+from core.task_ingest import normalize_clickup_task, task_content_hash
+from core.task_search_index import ensure_search_index
+from models.task import Task
+
+
+@contextmanager
+def _fresh_database():
+    """Base en memoria nueva para este test; SessionLocal apunta a ella"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
+    previous = SessionLocal.kw.get("bind")
+    SessionLocal.configure(bind=engine)
+    try:
+        yield SessionLocal
+    finally:
+        SessionLocal.configure(bind=previous)
+
+
+class NotFoundError(Exception):
+    status = 404
+
+
+class FakeClickUp:
+    """GET /task/{id}: tareas conocidas; el resto da 404. `gate` retiene las respuestas"""
+
+    def __init__(self, tasks: dict):
+        self.tasks = tasks
+        self.requests = []
+        self.gate = None
+
+    async def get_task(self, task_id):
+        self.requests.append(task_id)
+        if self.gate is not None:
+            await self.gate.wait()
+        if task_id not in self.tasks:
+            raise NotFoundError(f"tarea {task_id} no encontrada")
+        return self.tasks[task_id]
+
+
+def _remote_task(task_id: str, name: str) -> dict:
+    return {
+        "id": task_id, "name": name, "description": "", "status": {"status": "open"}, "priority": None,
+        "team_id": "ws", "list": {"id": "l1"}, "assignees": [], "tags": [],
+        "custom_fields": [
+            {"id": "cf-email", "name": "Email", "type": "email", "value": "a@b.c"},
+            {"id": "cf-prio", "name": "Prioridad cliente", "type": "drop_down", "value": 1,
+             "type_config": {"options": [{"id": "o0", "name": "Alta", "orderindex": 0},
+                                         {"id": "o1", "name": "Baja", "orderindex": 1}]}},
+            {"id": "cf-vacio", "name": "Nota", "type": "text"},
+        ],
+    }
+
+
+def _local_task(session_factory, task_id: str) -> Task:
+    db = session_factory()
+    try:
+        return db.query(Task).filter(Task.clickup_id == task_id).first()
+    finally:
+        db.close()
+
+
+def test_fresh_hit_and_stale_refresh():
+    async def run(session_factory):
+        db = session_factory()
+        try:
+            db.add(Task(clickup_id="t1", name="Antes", status="open", workspace_id="ws", list_id="l1",
+                        tags=[], custom_fields={}, last_sync=datetime.now() - timedelta(hours=1)))
+            db.commit()
+        finally:
+            db.close()
+        client = FakeClickUp({"t1": _remote_task("t1", "Después")})
+        refresher = TaskRefresher(fresh_seconds=60)
+
+        # Fila fresca: se sirve sin llamar a ClickUp
+        assert refresher.classify("t1", datetime.now(), False, client)[0] == FRESH
+        assert refresher.classify("t1", None, True, client)[0] == ARCHIVE
+        assert client.requests == []
+
+        # Fila vencida: se sirve y el refresco corre en segundo plano (uno por tarea)
+        state, age = refresher.classify("t1", datetime.now() - timedelta(hours=1), False, client)
+        assert (state, age) == (STALE, 3600)
+        refresher.classify("t1", datetime.now() - timedelta(hours=1), False, client)
+        await asyncio.gather(*refresher._inflight.values())
+        assert client.requests == ["t1"]
+        assert (refresher.stats["refreshed"], refresher.stats["deduplicated"]) == (1, 1)
+
+        # Guardada como en la sincronización: custom fields `{nombre: valor}` y mismo hash
+        stored = _local_task(session_factory, "t1")
+        assert stored.name == "Después"
+        assert stored.custom_fields == {"Email": "a@b.c", "Prioridad cliente": "Baja"}
+        assert stored.content_hash == task_content_hash(normalize_clickup_task(_remote_task("t1", "Después")))
+        assert refresher.age(stored.last_sync) < 5
+
+    with _fresh_database() as session_factory:
+        asyncio.run(run(session_factory))
+
+
+def test_missing_task_single_flight():
+    async def run(session_factory):
+        client = FakeClickUp({"t2": _remote_task("t2", "Nueva")})
+        client.gate = asyncio.Event()
+        refresher = TaskRefresher(fresh_seconds=60)
+
+        # Peticiones simultáneas por el mismo ID comparten una llamada a ClickUp
+        readers = [asyncio.create_task(refresher.fetch_missing("t2", client)) for _ in range(3)]
+        await asyncio.sleep(0)
+        # Cancelar a un lector no cancela el refresco compartido
+        readers[0].cancel()
+        client.gate.set()
+        results = await asyncio.gather(*readers[1:])
+        assert client.requests == ["t2"]
+        assert all(values["name"] == "Nueva" for values in results)
+        assert refresher.stats["deduplicated"] == 2
+        assert _local_task(session_factory, "t2").custom_fields["Prioridad cliente"] == "Baja"
+
+    with _fresh_database() as session_factory:
+        asyncio.run(run(session_factory))
+
+
+def test_failure_cache():
+    async def run():
+        client = FakeClickUp({})
+        refresher = TaskRefresher(fresh_seconds=60)
+
+        for _ in range(2):
+            try:
+                await refresher.fetch_missing("ausente", client)
+                raise AssertionError("se esperaba TaskNotFound")
+            except TaskNotFound:
+                pass
+        # El segundo intento y los refrescos en segundo plano usan el fallo recordado
+        assert client.requests == ["ausente"]
+        assert refresher.stats["failed_cached"] == 1
+        assert refresher.schedule_refresh("ausente", client) is False
+
+        # Pasado TASK_FRESH_SECONDS se vuelve a pedir
+        _, error = refresher._failed["ausente"]
+        refresher._failed["ausente"] = (time.monotonic() - 61, error)
+        assert refresher.schedule_refresh("ausente", client) is True
+        await asyncio.gather(*refresher._inflight.values(), return_exceptions=True)
+        assert client.requests == ["ausente", "ausente"]
+
+    with _fresh_database():
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_fresh_hit_and_stale_refresh()
+    test_missing_task_single_flight()
+    test_failure_cache()
+    print("✅ Lecturas stale-while-revalidate correctas")
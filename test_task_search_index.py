@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Índice de texto completo de tareas (FTS5): triggers de alta, modificación y
+baja, tabla del archivo, ranking por columna, resaltado y búsquedas sin
+palabras indexables en GET /api/v1/tasks.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+import models  # noqa: F401  (registra las tablas en Base.metadata)
+from api.routes.tasks import get_tasks
+from core.database import Base
+from core.task_archive import archive_closed_tasks
+from core.task_search_index import HIGHLIGHT_CLOSE, HIGHLIGHT_OPEN, ensure_search_index, highlights, match_subquery
+from models.task import Task
+
+
+def _fresh_session():
+    """Sesión sobre una base en memoria nueva para este test"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    assert ensure_search_index(engine), "FTS5 no disponible en este SQLite"
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def _task(clickup_id: str, name: str, description: str = "", **values) -> Task:
+    values.setdefault("status", "open")
+    return Task(clickup_id=clickup_id, name=name, description=description, workspace_id="ws",
+                list_id="l1", tags=values.pop("tags", []), custom_fields=values.pop("custom_fields", {}), **values)
+
+
+def _matching_ids(db, query: str, include_closed: bool = False) -> list:
+    matches = match_subquery(db, query, include_closed)
+    return [row.id for row in db.execute(select(matches.c.id, matches.c.rank).order_by(matches.c.rank))]
+
+
+def _search_route(db, search: str, include_closed: bool = False) -> list:
+    result = asyncio.run(get_tasks(
+        request=Request({"type": "http", "query_string": b"", "headers": []}),
+        workspace_id=None, list_id=None, status=None, assignee_id=None, priority=None,
+        search=search, include_closed=include_closed, page=0, limit=50,
+        cursor=None, sort_by=None, count=None, fields=None,
+        tag=None, custom_field=None, custom_value=None, db=db
+    ))
+    return [task["clickup_id"] for task in json.loads(result.body)["tasks"]]
+
+
+def test_triggers_follow_insert_update_and_delete():
+    db = _fresh_session()
+    try:
+        task = _task("t1", "Preparar presupuesto", tags=["urgente"], custom_fields={"Cliente": "Acme"})
+        db.add(task)
+        db.commit()
+        assert _matching_ids(db, "presupuesto") == [task.id]
+        assert _matching_ids(db, "urgente") == [task.id]
+        assert _matching_ids(db, "acme") == [task.id]
+
+        task.name = "Enviar factura"
+        db.commit()
+        assert _matching_ids(db, "presupuesto") == []
+        assert _matching_ids(db, "factura") == [task.id]
+
+        db.delete(task)
+        db.commit()
+        assert _matching_ids(db, "factura") == []
+    finally:
+        db.close()
+
+
+def test_archive_is_searched_only_with_include_closed():
+    db = _fresh_session()
+    try:
+        db.add(_task("open", "Revisar contrato abierto"))
+        db.add(_task("closed", "Revisar contrato cerrado", status="complete", date_closed=datetime(2020, 1, 1)))
+        db.commit()
+        result = archive_closed_tasks(db, older_than_days=30)
+        assert result["archived"] == 1
+
+        assert _search_route(db, "contrato") == ["open"]
+        assert sorted(_search_route(db, "contrato", include_closed=True)) == ["closed", "open"]
+    finally:
+        db.close()
+
+
+def test_name_matches_rank_above_description_matches():
+    db = _fresh_session()
+    try:
+        in_description = _task("d", "Llamar proveedor", "Consultar el inventario del depósito")
+        in_name = _task("n", "Inventario anual", "Contar existencias")
+        db.add_all([in_description, in_name])
+        db.commit()
+        assert _matching_ids(db, "inventario") == [in_name.id, in_description.id]
+        assert _search_route(db, "inventario") == ["n", "d"]
+    finally:
+        db.close()
+
+
+def test_highlight_marks_matching_terms():
+    db = _fresh_session()
+    try:
+        task = _task("h", "Reunión de planificación", "Definir la planificación del trimestre")
+        db.add(task)
+        db.commit()
+        found = highlights(db, [task.id], "planificacion")
+        assert found[task.id]["name"] == f"Reunión de {HIGHLIGHT_OPEN}planificación{HIGHLIGHT_CLOSE}"
+        assert f"{HIGHLIGHT_OPEN}planificación{HIGHLIGHT_CLOSE}" in found[task.id]["description"]
+    finally:
+        db.close()
+
+
+def test_search_without_words_falls_back_to_like():
+    db = _fresh_session()
+    try:
+        db.add(_task("a", "Tarea normal"))
+        db.add(_task("b", "Urgente!!!"))
+        db.commit()
+        assert match_subquery(db, "!!!") is None
+        assert _search_route(db, "!!!") == ["b"]
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_triggers_follow_insert_update_and_delete()
+    test_archive_is_searched_only_with_include_closed()
+    test_name_matches_rank_above_description_matches()
+    test_highlight_marks_matching_terms()
+    test_search_without_words_falls_back_to_like()
+    print("✅ Índice de texto completo correcto")
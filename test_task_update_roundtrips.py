@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+PUT /api/v1/tasks/{id}: diff contra la fila local, sin llamadas a ClickUp
+cuando nada cambia, y cada cambio por su endpoint (PUT de la tarea para
+los campos, un POST por custom field). POST /api/v1/tasks/bulk-update: un
+permiso del rate limiter por PUT (reintentos incluidos) y custom fields
+fusionados con los guardados. Usa el mismo servidor local que imita la API
+de ClickUp que test_task_creation_roundtrips.py.
+
+Uso:
+    python test_task_update_roundtrips.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from test_task_creation_roundtrips import LIST_ID, StandInClickUp, _free_port, _start_server
+
+
+def main() -> int:
+    port = _free_port()
+    stand_in = StandInClickUp()
+    _start_server(stand_in, port)
+
+    os.environ["CLICKUP_API_BASE_URL"] = f"http://127.0.0.1:{port}/api/v2"
+    os.environ["CLICKUP_API_TOKEN"] = "pk_standin"
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mktemp(suffix='.db')}"
+    os.environ.setdefault("TASK_CREATE_VERIFY", "False")
+
+    import asyncio
+    from fastapi.testclient import TestClient
+    from api.routes.tasks import _task_update_diff
+    from api.schemas.task import TaskUpdate
+    from core.advanced_sync import sync_service
+    from core.database import SessionLocal, init_db
+    from core.task_ingest import normalize_clickup_task, task_content_hash
+    from main import app
+    from models.task import Task
+
+    asyncio.run(init_db())
+    client = TestClient(app)
+    failures = []
+
+    def check(label: str, ok: bool, detail=""):
+        print(f"{'✅' if ok else '❌'} {label}{f': {detail}' if detail else ''}")
+        if not ok:
+            failures.append(label)
+
+    def local_task(clickup_id: str) -> Task:
+        db = SessionLocal()
+        try:
+            return db.query(Task).filter(Task.clickup_id == clickup_id).one()
+        finally:
+            db.close()
+
+    fields = {"email": "cliente@example.com", "Celular": "+5491100000000"}
+    due_date = int(time.time() * 1000) + 86400000
+    created = client.post("/api/v1/tasks/", json={
+        "name": "Tarea a actualizar", "description": "Original", "workspace_id": "9014943317",
+        "list_id": LIST_ID, "priority": 2, "due_date": due_date, "custom_fields": fields,
+    }).json()
+    task_id = created["clickup_id"]
+
+    # El hash de la fila creada es el que calcula la sincronización sobre ClickUp
+    remote = {"id": task_id, "name": "Tarea a actualizar", "description": "Original", "priority": {"id": "2"},
+              "due_date": str(due_date), "status": {"status": "to do"}, "creator": {"id": 42},
+              "list": {"id": LIST_ID}, "assignees": [], "tags": [],
+              "custom_fields": [{"id": "cf-email", "name": "email", "value": fields["email"]},
+                                {"id": "cf-celular", "name": "Celular", "value": fields["Celular"]}]}
+    check("Hash de creación igual al de la sincronización",
+          local_task(task_id).content_hash == task_content_hash(normalize_clickup_task(remote)))
+
+    # Diff: solo los campos (y custom fields) que cambian
+    row = local_task(task_id)
+    same = TaskUpdate(name="Tarea a actualizar", description="Original", priority=2, custom_fields=dict(fields))
+    diff = _task_update_diff(row, same)
+    check("Diff vacío con los mismos valores", diff == {}, diff)
+    diff = _task_update_diff(row, TaskUpdate(name="Nuevo nombre", priority=2,
+                                              custom_fields={**fields, "email": "otro@example.com"}))
+    check("Diff con nombre y un custom field", diff == {"name": "Nuevo nombre", "custom_fields": {"email": "otro@example.com"}}, diff)
+
+    # Sin cambios: ni ClickUp ni la BD
+    stand_in.calls.clear()
+    response = client.put(f"/api/v1/tasks/{task_id}", json={"name": "Tarea a actualizar", "custom_fields": fields})
+    check("Actualización sin cambios", response.status_code == 200 and stand_in.calls == [],
+          f"HTTP {response.status_code}, {len(stand_in.calls)} llamadas a ClickUp")
+
+    # Campo de la tarea por PUT, custom field por su endpoint
+    stand_in.calls.clear()
+    response = client.put(f"/api/v1/tasks/{task_id}", json={
+        "name": "Nuevo nombre", "custom_fields": {"email": "otro@example.com", "Celular": fields["Celular"]}
+    })
+    expected = [("PUT", f"/api/v2/task/{task_id}"), ("POST", f"/api/v2/task/{task_id}/field/cf-email")]
+    check("Un PUT y un POST por custom field modificado", response.status_code == 200 and stand_in.calls == expected,
+          f"HTTP {response.status_code}, {stand_in.calls}")
+    row = local_task(task_id)
+    check("Fila local actualizada",
+          row.name == "Nuevo nombre" and row.custom_fields == {**fields, "email": "otro@example.com"}, row.custom_fields)
+    updated_remote = {**remote, "name": "Nuevo nombre", "custom_fields": [
+        {"id": "cf-email", "name": "email", "value": "otro@example.com"},
+        {"id": "cf-celular", "name": "Celular", "value": fields["Celular"]},
+    ]}
+    check("Hash igual al que calculará la sincronización",
+          row.content_hash == task_content_hash(normalize_clickup_task(updated_remote)), row.content_hash)
+
+    # El estado no se envía a ClickUp, así que tampoco cambia localmente
+    stand_in.calls.clear()
+    response = client.put(f"/api/v1/tasks/{task_id}", json={"status": "complete"})
+    check("Solo estado: sin llamadas a ClickUp ni cambios locales",
+          response.status_code == 200 and stand_in.calls == [] and local_task(task_id).status == row.status,
+          f"HTTP {response.status_code}, {stand_in.calls}, {local_task(task_id).status}")
+
+    stand_in.calls.clear()
+    response = client.put(f"/api/v1/tasks/{task_id}", json={"description": "Otra"})
+    check("Solo el PUT de la tarea sin custom fields", stand_in.calls == [("PUT", f"/api/v2/task/{task_id}")], stand_in.calls)
+
+    # Bulk: ClickUp rechaza los custom fields en el PUT y se reintenta sin ellos
+    other_id = client.post("/api/v1/tasks/", json={
+        "name": "Otra tarea", "workspace_id": "9014943317", "list_id": LIST_ID, "custom_fields": fields,
+    }).json()["clickup_id"]
+    db = SessionLocal()
+    db.query(Task).filter(Task.clickup_id == other_id).update({"custom_fields": {**fields, "Nota": "Llamar"}})
+    db.commit()
+    db.close()
+    limiter = sync_service.rate_limiter
+    acquired_before = len(limiter.requests)
+    stand_in.calls.clear()
+    stand_in.reject_custom_fields = True
+    response = client.post("/api/v1/tasks/bulk-update", json={
+        "task_ids": [task_id, other_id],
+        "updates": {"priority": 1, "custom_fields": {**fields, "Celular": "+5491199999999"}}
+    })
+    stand_in.reject_custom_fields = False
+    puts = [call for call in stand_in.calls if call[0] == "PUT"]
+    check("Bulk: un permiso del rate limiter por PUT",
+          response.status_code == 200 and len(puts) == 4 and len(limiter.requests) - acquired_before == len(puts),
+          f"HTTP {response.status_code}, {len(puts)} PUT, {len(limiter.requests) - acquired_before} permisos")
+    row = local_task(other_id)
+    check("Bulk: custom fields fusionados con los guardados",
+          row.priority == 1 and row.custom_fields == {**fields, "Celular": "+5491199999999", "Nota": "Llamar"}, row.custom_fields)
+
+    print("\n✅ Todo correcto" if not failures else f"\n❌ Fallos: {', '.join(failures)}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
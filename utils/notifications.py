@@ -1,4 +1,4 @@
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 
 
 async def send_email_async(recipients: List[str], subject: str, text_body: str, html_body: str) -> None:
@@ -9,6 +9,19 @@ async def send_telegram_async(recipients: List[str], message: str) -> None:
     return None
 
 
+def build_task_digest_email_content(action: str, tasks: List[Dict]) -> Tuple[str, str, str]:
+    subject = f"{len(tasks)} tasks {action}"
+    lines = [f"- {t.get('name')} (ID: {t.get('task_id')})" for t in tasks]
+    text_body = f"{len(tasks)} tasks {action}:\n" + "\n".join(lines)
+    html_body = "<br>".join([f"{len(tasks)} tasks {action}:"] + lines)
+    return subject, text_body, html_body
+
+
+def build_task_digest_telegram_message(action: str, tasks: List[Dict]) -> str:
+    lines = [f"- {t.get('name')} (ID: {t.get('task_id')})" for t in tasks]
+    return f"{len(tasks)} tasks {action}:\n" + "\n".join(lines)
+
+
 # SMS eliminado
 
 
@@ -26,11 +39,14 @@ def build_task_telegram_message(action: str, task_id: str, name: str, status: st
 # SMS eliminado
 
 
-def extract_contacts_from_custom_fields(custom_fields: Dict) -> Tuple[List[str], List[str], List[str]]:
+def extract_contacts_from_custom_fields(custom_fields: Any, list_id: Optional[str] = None) -> Tuple[List[str], List[str], List[str]]:
+    """Emails desde custom fields ({nombre: valor} o lista de ClickUp, nombrada con el esquema local de la lista)"""
+    from core.custom_field_registry import custom_field_registry, empty_schema
+
+    schema = custom_field_registry.cached(list_id) or empty_schema(list_id)
     emails: List[str] = []
     telegrams: List[str] = []
-    sms: List[str] = []
-    for key, value in (custom_fields or {}).items():
+    for key, value in schema.named_values(custom_fields).items():
         if isinstance(value, str) and "@" in value:
             emails.append(value)
     return emails, telegrams, []